@@ -0,0 +1,41 @@
+"""
+Корзина на тысячи позиций: добавление, изменение, чтение суммы и массовая переоценка.
+
+Запуск: python -m benchmarks.bench_cart [количество позиций]
+"""
+
+import sys
+import time
+
+from src.category import Cart, Category
+from src.pricing import AcceptAllPolicy
+from src.product import Product
+
+
+def timed(label: str, count: int, func) -> None:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {elapsed * 1000:.1f} мс ({elapsed / count * 1e6:.2f} мкс на операцию)")
+
+
+def main(lines: int) -> None:
+    products = [Product(f"Товар {i}", "Описание", 100.0 + i, 1000) for i in range(lines)]
+    category = Category("Бенчмарк", "Категория для замеров", products)
+    cart = Cart("Корзина")
+
+    print(f"Позиций в корзине: {lines}")
+    timed("добавление позиций", lines, lambda: [cart.add(product, 2) for product in products])
+    timed("изменение количества", lines, lambda: [cart.update(product, 3) for product in products])
+    timed("чтение суммы x100000", 100_000, lambda: [cart.total_price for _ in range(100_000)])
+
+    new_prices = {product.name: product.price * 0.9 for product in products}
+    timed("переоценка всех товаров", lines, lambda: category.reprice(new_prices, AcceptAllPolicy()))
+
+    expected = sum(product.price * 3 for product in products)
+    print(f"сумма корзины {cart.total_price:.2f}, пересчет с нуля {expected:.2f}")
+    timed("удаление позиций", lines, lambda: [cart.remove(product) for product in products])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
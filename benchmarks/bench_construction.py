@@ -0,0 +1,59 @@
+"""
+Скорость создания товаров и добавления в категорию в разных режимах событий.
+
+Запуск: python -m benchmarks.bench_construction [количество товаров]
+"""
+
+import contextlib
+import logging
+import os
+import sys
+import time
+
+from src import events
+from src.category import Category
+from src.product import Product
+
+
+def build_catalog(count: int) -> None:
+    category = Category("Бенчмарк", "Категория для замеров")
+    for i in range(count):
+        category.add_product(Product(f"Товар {i}", "Описание", 100.0 + i, 1 + i % 10))
+
+
+def measure(count: int, handler=None) -> float:
+    """Возвращает количество товаров в секунду"""
+
+    if handler is not None:
+        events.subscribe(handler)
+    try:
+        started = time.perf_counter()
+        build_catalog(count)
+        if hasattr(handler, "flush"):
+            handler.flush()
+        return count / (time.perf_counter() - started)
+    finally:
+        if handler is not None:
+            events.unsubscribe(handler)
+
+
+def main(count: int) -> None:
+    logger = logging.getLogger("benchmarks.events")
+    logger.propagate = False
+    with open(os.devnull, "w") as devnull:
+        logger.addHandler(logging.StreamHandler(devnull))
+        logger.setLevel(logging.INFO)
+
+        with contextlib.redirect_stdout(devnull):
+            legacy = measure(count, events.PrintHandler())
+        batched = measure(count, events.BatchedLogHandler(logger))
+    silent = measure(count)
+
+    print(f"Товаров: {count}")
+    print(f"print() в stdout (прежнее поведение): {legacy:,.0f} товаров/с")
+    print(f"пакетное структурированное логирование: {batched:,.0f} товаров/с")
+    print(f"без обработчиков (по умолчанию): {silent:,.0f} товаров/с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
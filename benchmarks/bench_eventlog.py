@@ -0,0 +1,84 @@
+"""
+Журнал изменений: скорость записи изменений остатка с журналом и без, скорость восстановления.
+Для восстановления в журнал дописываются готовые кадры изменений остатка и цены в формате src.eventlog.
+
+Запуск: python -m benchmarks.bench_eventlog [число изменений в живом замере] [число событий при восстановлении]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+
+from benchmarks.suite import build_products, make_specs
+from src.category import Category
+from src.eventlog import FIXED_FLOAT, FIXED_INT, FRAME_HEADER, PRICE_FLOAT, QUANTITY, EventLog, replay
+
+SEED = 42
+PRODUCTS = 1000
+FRAME_RECORDS = 65536
+
+
+def mutate(category: Category, count: int) -> float:
+    products = category._product_list()
+    started = time.perf_counter()
+    for position in range(count):
+        product = products[position % len(products)]
+        product.quantity = product.quantity + 1
+    return time.perf_counter() - started
+
+
+def append_frames(path: str, count: int, product_ids: int) -> None:
+    rng = random.Random(SEED)
+    with open(path, "ab") as file:
+        for start in range(0, count, FRAME_RECORDS):
+            fixed = bytearray()
+            for _ in range(min(FRAME_RECORDS, count - start)):
+                product_id = rng.randrange(product_ids)
+                if rng.random() < 0.9:
+                    fixed += FIXED_INT.pack(QUANTITY, product_id, rng.choice((-1, 1)))
+                else:
+                    fixed += FIXED_FLOAT.pack(PRICE_FLOAT, product_id, round(rng.uniform(10, 10000), 2))
+            payload = bytes(fixed)
+            file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload), len(fixed) // FIXED_INT.size, product_ids))
+            file.write(payload)
+
+
+def build_category() -> Category:
+    products = list({product.name: product for product in build_products(make_specs(PRODUCTS))}.values())
+    return Category("Бенчмарк", "Категория для замеров", products)
+
+
+def main(live_count: int, replay_count: int) -> None:
+    print(f"Изменений в живом замере: {live_count}, событий при восстановлении: {replay_count}")
+
+    seconds = mutate(build_category(), live_count)
+    print(f"без журнала: {seconds:.2f} с ({live_count / seconds:,.0f} изменений/с)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.log")
+        with EventLog(path) as log:
+            category = build_category()
+            started = time.perf_counter()
+            mutate(category, live_count)
+            log.flush()
+            seconds = time.perf_counter() - started
+        print(f"с журналом (включая fsync): {seconds:.2f} с ({live_count / seconds:,.0f} изменений/с)")
+
+        append_frames(path, replay_count, len(category))
+        print(f"размер журнала: {os.path.getsize(path) / 2**20:.1f} МБ")
+
+        _, report = replay(path)
+        print(
+            f"восстановление: {report.seconds:.2f} с, кадров {report.frames}, "
+            f"{report.records_per_second:,.0f} событий/с"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000,
+    )
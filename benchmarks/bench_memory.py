@@ -0,0 +1,41 @@
+"""
+Память на один товар для Product, Smartphone и LawnGrass.
+
+Запуск: python -m benchmarks.bench_memory [количество товаров]
+"""
+
+import sys
+import tracemalloc
+
+from src.product import LawnGrass, Product, Smartphone
+
+FACTORIES = {
+    "Product": lambda i: Product(f"Товар {i}", "Описание", 100.0, 5),
+    "Smartphone": lambda i: Smartphone(f"Смартфон {i}", "Описание", 30000.0, 3, 4.5, "Model A", 128, "Черный"),
+    "LawnGrass": lambda i: LawnGrass(f"Трава {i}", "Описание", 1000.0, 10, "Россия", "10 дней", "Зеленый"),
+}
+
+
+def bytes_per_product(factory, count: int) -> float:
+    """Средний прирост памяти на товар, включая уникальное название"""
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    products = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    list_overhead = sys.getsizeof(products)
+    return (allocated - list_overhead) / count
+
+
+def main(count: int) -> None:
+    print(f"Товаров каждого типа: {count}")
+    for name, factory in FACTORIES.items():
+        instance_size = sys.getsizeof(factory(0))
+        print(f"{name}: объект {instance_size} байт, всего {bytes_per_product(factory, count):.0f} байт на товар")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
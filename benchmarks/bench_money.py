@@ -0,0 +1,52 @@
+"""
+Итог стоимости остатков: float, Decimal на каждый товар, целые копейки и NumPy.
+
+Запуск: python -m benchmarks.bench_money [количество товаров]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from operator import mul
+
+from src.money import from_kopecks, total_kopecks
+
+SEED = 42
+
+
+def measure(name: str, function) -> None:
+    started = time.perf_counter()
+    total = function()
+    print(f"{name}: {time.perf_counter() - started:.3f} с, итог {total}")
+
+
+def main(count: int) -> None:
+    rng = random.Random(SEED)
+    prices = [round(rng.uniform(10, 10000), 2) for _ in range(count)]
+    quantities = [rng.randint(1, 20) for _ in range(count)]
+    print(f"Товаров: {count}")
+
+    measure("float", lambda: sum(map(mul, prices, quantities)))
+    measure(
+        "Decimal на товар", lambda: sum(Decimal(str(price)) * quantity for price, quantity in zip(prices, quantities))
+    )
+    measure("копейки (int)", lambda: from_kopecks(total_kopecks(prices, quantities)))
+
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    price_column = np.array(prices)
+    quantity_column = np.array(quantities, dtype=np.int64)
+    started = time.perf_counter()
+    kopecks = np.rint(price_column * 100).astype(np.int64)
+    converted = time.perf_counter() - started
+    measure(
+        f"копейки (NumPy int64, перевод столбца {converted:.3f} с)",
+        lambda: from_kopecks(int(np.dot(kopecks, quantity_column))),
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,56 @@
+"""
+Масштабирование параллельной загрузки фида на 1, 2, 4 и 8 процессов
+в сравнении с последовательной load_catalog.
+
+Запуск: python -m benchmarks.bench_parallel [количество записей]
+"""
+
+import os
+import random
+import sys
+import time
+
+from src.category import Category
+from src.loader import load_catalog
+from src.parallel import ingest_parallel
+
+SEED = 42
+
+
+def make_feed(count: int, seed: int = SEED) -> list:
+    """Синтетический фид с повторами названий (примерно каждая пятая запись - дубликат)"""
+
+    rng = random.Random(seed)
+    distinct = max(count * 4 // 5, 1)
+    records = []
+    for _ in range(count):
+        i = rng.randrange(distinct)
+        kind = i % 3
+        record = {"name": f"Товар {i}", "description": "Описание", "price": rng.uniform(10, 10000), "quantity": 1}
+        if kind == 1:
+            record.update(type="smartphone", efficiency=4.5, model=f"M{i % 50}", memory=128, color="Черный")
+        elif kind == 2:
+            record.update(type="lawn_grass", country="Россия", germination_period="7 дней", color="Зеленый")
+        records.append(record)
+    return records
+
+
+def main(count: int) -> None:
+    feed = make_feed(count)
+    print(f"Записей: {count}, ядер: {os.cpu_count()}")
+
+    started = time.perf_counter()
+    load_catalog(iter(feed), Category("Последовательно", "Описание"))
+    baseline = time.perf_counter() - started
+    print(f"load_catalog: {baseline:.2f} с ({count / baseline:,.0f} записей/с)")
+
+    for workers in (1, 2, 4, 8):
+        report = ingest_parallel(iter(feed), Category("Параллельно", "Описание"), workers=workers)
+        print(
+            f"ingest_parallel, {workers} воркер(ов): {report.seconds:.2f} с "
+            f"({report.rows_per_second:,.0f} записей/с, x{baseline / report.seconds:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,43 @@
+"""
+Скорость хранилища SQLite: пакетная запись категории, загрузка и поиск товара через кэш.
+
+Запуск: python -m benchmarks.bench_storage [количество товаров]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import build_products, make_specs
+from src.category import Category
+from src.storage import CatalogStore
+
+
+def main(count: int) -> None:
+    products = list({product.name: product for product in build_products(make_specs(count))}.values())
+    category = Category._restore("Бенчмарк", "Категория для замеров", products)
+    print(f"Товаров: {len(category)}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with CatalogStore(os.path.join(directory, "catalog.db")) as store:
+            started = time.perf_counter()
+            store.save_category(category)
+            seconds = time.perf_counter() - started
+            print(f"запись: {seconds:.2f} с ({len(category) / seconds:,.0f} строк/с)")
+
+            started = time.perf_counter()
+            store.load_category("Бенчмарк")
+            print(f"загрузка: {time.perf_counter() - started:.2f} с")
+
+            names = [product.name for product in products[:1000]]
+            for cached in (False, True):
+                started = time.perf_counter()
+                for name in names:
+                    store.find_product("Бенчмарк", name)
+                per_lookup = (time.perf_counter() - started) / len(names) * 1e6
+                print(f"поиск по названию ({'из кэша' if cached else 'с диска'}): {per_lookup:.1f} мкс")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,212 @@
+"""
+Набор бенчмарков на синтетических каталогах с фиксированным зерном (по умолчанию 1k, 100k и 1M товаров):
+создание товаров, add_product с дубликатами, new_product, get_average_price, Category.products,
+создание Order и пик памяти при сборке категории. Результаты пишутся в JSON и сравниваются с эталоном.
+
+Запуск:
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --sizes 1000,100000 --baseline bench.json --threshold 0.2
+Код возврата 1, если есть замедление относительно эталона больше порога.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from src.category import Category, Order
+from src.product import LawnGrass, Product, Smartphone
+
+SEED = 42
+SIZES = (1_000, 100_000, 1_000_000)
+# Операции, которые дороги сами по себе, меряются на выборке, а не на всем каталоге
+SAMPLE = 10_000
+AVERAGE_PRICE_CALLS = 1_000
+
+Spec = Tuple[type, tuple]
+
+
+def make_specs(count: int, seed: int = SEED) -> List[Spec]:
+    """Аргументы конструкторов для каталога из count строк; примерно каждая пятая - дубликат названия"""
+
+    rng = random.Random(seed)
+    distinct = max(count * 4 // 5, 1)
+    specs = []
+    for _ in range(count):
+        i = rng.randrange(distinct)
+        price = round(rng.uniform(10, 10000), 2)
+        quantity = rng.randint(1, 20)
+        kind = i % 3
+        if kind == 0:
+            specs.append((Product, (f"Товар {i}", "Описание", price, quantity)))
+        elif kind == 1:
+            specs.append(
+                (Smartphone, (f"Смартфон {i}", "Описание", price, quantity, 4.5, f"M{i % 50}", 128, "Черный"))
+            )
+        else:
+            specs.append((LawnGrass, (f"Трава {i}", "Описание", price, quantity, "Россия", "7 дней", "Зеленый")))
+    return specs
+
+
+def build_products(specs: List[Spec]) -> List[Product]:
+    return [product_class(*args) for product_class, args in specs]
+
+
+def build_category(products: List[Product]) -> Category:
+    category = Category("Бенчмарк", "Категория для замеров")
+    for product in products:
+        category.add_product(product)
+    return category
+
+
+def timed(function: Callable, operations: int) -> Dict:
+    gc.collect()
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": seconds,
+        "operations": operations,
+        "per_second": operations / seconds if seconds else 0.0,
+    }, result
+
+
+def run_size(count: int, seed: int = SEED) -> Dict:
+    """Прогоняет все замеры для одного размера каталога"""
+
+    specs = make_specs(count, seed)
+    rng = random.Random(seed + 1)
+    results = {}
+
+    results["construction"], products = timed(lambda: build_products(specs), count)
+    results["add_product"], category = timed(lambda: build_category(products), count)
+
+    sample = min(count, SAMPLE)
+    new_data = []
+    for position in range(sample):
+        # Половина выборки - существующие названия (слияние), половина - новые товары
+        name = rng.choice(specs)[1][0] if position % 2 else f"Новый товар {position}"
+        new_data.append({"name": name, "description": "Описание", "price": 50.0, "quantity": 1})
+    results["new_product"], _ = timed(lambda: [Product.new_product(data, category) for data in new_data], sample)
+
+    results["get_average_price"], _ = timed(
+        lambda: [category.get_average_price() for _ in range(AVERAGE_PRICE_CALLS)], AVERAGE_PRICE_CALLS
+    )
+    results["products"], _ = timed(lambda: category.products, len(category))
+
+    ordered = rng.sample(products, sample)
+    results["order"], _ = timed(
+        lambda: [Order(f"Заказ {position}", "", product, 1) for position, product in enumerate(ordered)], sample
+    )
+
+    results["memory"] = measure_memory(specs)
+    return results
+
+
+def measure_memory(specs: List[Spec]) -> Dict:
+    """Пик памяти при создании товаров и сборке категории"""
+
+    gc.collect()
+    tracemalloc.start()
+    category = build_category(build_products(specs))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_bytes": peak,
+        "retained_bytes": current,
+        "bytes_per_product": current / len(category) if len(category) else 0.0,
+    }
+
+
+def run(sizes, seed: int = SEED) -> Dict:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {str(count): run_size(count, seed) for count in sizes},
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Сравнивает замеры с эталоном по общим размерам и метрикам.
+    Возвращает строки сравнения; regression=True, если время или пик памяти выросли больше чем на threshold.
+    """
+
+    rows = []
+    for size, metrics in current["results"].items():
+        base_metrics = baseline.get("results", {}).get(size)
+        if base_metrics is None:
+            continue
+        for metric, values in metrics.items():
+            base_values = base_metrics.get(metric)
+            if base_values is None:
+                continue
+            field = "peak_bytes" if metric == "memory" else "seconds"
+            if not base_values.get(field):
+                continue
+            ratio = values[field] / base_values[field]
+            rows.append(
+                {
+                    "size": size,
+                    "metric": metric,
+                    "baseline": base_values[field],
+                    "current": values[field],
+                    "ratio": ratio,
+                    "regression": ratio > 1 + threshold,
+                }
+            )
+    return rows
+
+
+def print_results(report: Dict) -> None:
+    for size, metrics in report["results"].items():
+        print(f"Каталог: {int(size):,} товаров")
+        for metric, values in metrics.items():
+            if metric == "memory":
+                print(
+                    f"  память: пик {values['peak_bytes'] / 2**20:,.1f} МБ, "
+                    f"{values['bytes_per_product']:,.0f} байт на товар"
+                )
+            else:
+                print(f"  {metric}: {values['seconds']:.4f} с ({values['per_second']:,.0f} оп/с)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки товаров, категорий и заказов")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="размеры каталогов через запятую")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="куда сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON с эталонными результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое замедление, доля (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run([int(size) for size in args.sizes.split(",")], args.seed)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        rows = compare(report, json.load(file), args.threshold)
+    print("Сравнение с эталоном:")
+    for row in rows:
+        mark = "ЗАМЕДЛЕНИЕ" if row["regression"] else "ok"
+        print(f"  {int(row['size']):,} {row['metric']}: x{row['ratio']:.2f} {mark}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
+from src import events
 from src.category import Category, Order
 from src.product import Product, ZeroQuantityError
 
 if __name__ == "__main__":
+    events.subscribe(events.PrintHandler())
+
     try:
         product_invalid = Product("Бракованный товар", "Неверное количество", 1000.0, 0)
     except ZeroQuantityError as e:
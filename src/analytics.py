@@ -0,0 +1,138 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.money import SCALE, from_kopecks
+
+
+class CategoryAnalytics:
+    """
+    Векторная аналитика по товарам категории.
+    Хранит цены, цены в копейках, остатки и коды классов в массивах NumPy: новые товары дописываются,
+    измененные строки обновляются точечно перед следующим запросом.
+    Стоимости считаются в целых копейках (int64), поэтому суммы точные.
+    lock - замок категории: под ним категория отмечает измененные строки, а запросы их синхронизируют.
+    """
+
+    def __init__(self, products: List, lock=None):
+        self._products = products
+        self._lock = lock or threading.RLock()
+        self._rows: Dict = {}
+        self._dirty = set()
+        self._size = 0
+        self._prices = np.empty(0, dtype=np.float64)
+        self._kopecks = np.empty(0, dtype=np.int64)
+        self._quantities = np.empty(0, dtype=np.int64)
+        self._type_codes = np.empty(0, dtype=np.int32)
+        self._type_names: List[str] = []
+        self._type_index: Dict[type, int] = {}
+
+    def _product_changed(self, product, field: str, old_value, new_value) -> None:
+        """Вызывается категорией под ее замком"""
+
+        if field in ("price", "quantity") and product in self._rows:
+            self._dirty.add(product)
+
+    def _type_code(self, product_class: type) -> int:
+        code = self._type_index.get(product_class)
+        if code is None:
+            code = self._type_index[product_class] = len(self._type_names)
+            self._type_names.append(product_class.__name__)
+        return code
+
+    def _sync(self) -> None:
+        """Дописывает новые товары и обновляет измененные строки. Вызывается под замком"""
+
+        count = len(self._products)
+        if count > self._size:
+            new_products = self._products[self._size : count]
+            added = len(new_products)
+            prices = np.fromiter((product.price for product in new_products), dtype=np.float64, count=added)
+            quantities = np.fromiter((product.quantity for product in new_products), dtype=np.int64, count=added)
+            codes = np.fromiter(
+                (self._type_code(type(product)) for product in new_products), dtype=np.int32, count=added
+            )
+            self._prices = np.concatenate((self._prices, prices))
+            self._kopecks = np.concatenate((self._kopecks, np.rint(prices * SCALE).astype(np.int64)))
+            self._quantities = np.concatenate((self._quantities, quantities))
+            self._type_codes = np.concatenate((self._type_codes, codes))
+            for row, product in enumerate(new_products, start=self._size):
+                self._rows[product] = row
+            self._size = count
+
+        if self._dirty:
+            for product in self._dirty:
+                row = self._rows[product]
+                self._prices[row] = product.price
+                self._kopecks[row] = round(product.price * SCALE)
+                self._quantities[row] = product.quantity
+            self._dirty.clear()
+
+    def total_kopecks(self) -> int:
+        """Точная общая стоимость остатков в копейках"""
+
+        with self._lock:
+            self._sync()
+            return int(np.dot(self._kopecks, self._quantities))
+
+    def total_value(self) -> float:
+        """Общая стоимость остатков"""
+
+        return from_kopecks(self.total_kopecks())
+
+    def weighted_average_price(self) -> float:
+        """Средняя цена единицы товара, взвешенная по остаткам"""
+
+        with self._lock:
+            self._sync()
+            total_quantity = int(self._quantities.sum())
+            if not total_quantity:
+                return 0.0
+            return from_kopecks(int(np.dot(self._kopecks, self._quantities))) / total_quantity
+
+    def price_histogram(self, bins=10, weighted: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Гистограмма цен: (количества, границы корзин). weighted=True считает единицы товара, а не позиции"""
+
+        with self._lock:
+            self._sync()
+            weights = self._quantities if weighted else None
+            return np.histogram(self._prices, bins=bins, weights=weights)
+
+    def breakdown_by_type(self) -> pd.DataFrame:
+        """Сводка по классам товаров: число позиций, остаток, стоимость и средняя цена"""
+
+        with self._lock:
+            self._sync()
+            size = len(self._type_names)
+            type_names = list(self._type_names)
+            products = np.bincount(self._type_codes, minlength=size)
+            quantity = np.bincount(self._type_codes, weights=self._quantities, minlength=size)
+            kopecks = np.zeros(size, dtype=np.int64)
+            np.add.at(kopecks, self._type_codes, self._kopecks * self._quantities)
+
+        value = kopecks / SCALE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            average = np.where(quantity > 0, value / quantity, 0.0)
+
+        return pd.DataFrame(
+            {
+                "products": products,
+                "quantity": quantity.astype(np.int64),
+                "total_value": value,
+                "average_price": average,
+            },
+            index=pd.Index(type_names, name="type"),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Таблица цен и остатков по всем товарам категории"""
+
+        # Под замком только копии столбцов: DataFrame собирается без него
+        with self._lock:
+            self._sync()
+            codes, prices, quantities = self._type_codes.copy(), self._prices.copy(), self._quantities.copy()
+            type_names = list(self._type_names)
+        types = pd.Categorical.from_codes(codes, categories=type_names)
+        return pd.DataFrame({"type": types, "price": prices, "quantity": quantities})
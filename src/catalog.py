@@ -0,0 +1,151 @@
+import threading
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.category import Category
+from src.money import average_kopecks, from_kopecks
+from src.product import Product, product_key
+
+
+class Catalog:
+    """
+    Реестр категорий каталога.
+    Категория ищется по названию за O(1). Глобальный индекс {ключ названия товара: категории}
+    и общие итоги обновляются инкрементально: реестр слушает свои категории
+    и на каждое изменение получает только разницу, без обхода каталога.
+    Замки берутся в порядке: замок категории -> замок реестра.
+    """
+
+    def __init__(self, categories: Iterable[Category] = ()):
+        self.__lock = threading.RLock()
+        self.__categories: Dict[str, Category] = {}
+        self.__index: Dict[str, Dict[Category, None]] = {}
+        self.__totals: Dict[Category, Tuple[int, int]] = {}
+        self.__total_quantity = 0
+        self.__total_kopecks = 0
+        self.__positions = 0
+        for category in categories:
+            self.add_category(category)
+
+    def add_category(self, category: Category) -> None:
+        """Добавляет категорию в реестр. Названия категорий в реестре уникальны"""
+
+        if not isinstance(category, Category):
+            raise ValueError("В каталог можно добавлять только объекты класса Category")
+
+        with self.__lock:
+            if category.name in self.__categories:
+                raise ValueError(f"Категория уже есть в каталоге: {category.name}")
+            self.__categories[category.name] = category
+        # Текущие ключи и итоги придут первым вызовом _category_changed
+        category._listen(self)
+
+    def remove_category(self, name: str) -> Category:
+        """Убирает категорию из реестра и из общих индексов и итогов"""
+
+        with self.__lock:
+            category = self.__categories.get(name)
+            if category is None:
+                raise KeyError(f"Категория не найдена: {name}")
+
+        keys = category._unlisten(self)
+        with self.__lock:
+            del self.__categories[name]
+            self.__remove_keys(category, keys)
+            quantity, kopecks = self.__totals.pop(category, (0, 0))
+            self.__total_quantity -= quantity
+            self.__total_kopecks -= kopecks
+        return category
+
+    def _category_changed(self, category: Category, added_keys, removed_keys) -> None:
+        """Вызывается категорией под ее замком: переносит в реестр разницу итогов и ключей"""
+
+        with self.__lock:
+            quantity, kopecks = category.total_quantity, category.total_kopecks
+            old_quantity, old_kopecks = self.__totals.get(category, (0, 0))
+            self.__totals[category] = (quantity, kopecks)
+            self.__total_quantity += quantity - old_quantity
+            self.__total_kopecks += kopecks - old_kopecks
+
+            for key in added_keys:
+                categories = self.__index.get(key)
+                if categories is None:
+                    categories = self.__index[key] = {}
+                if category not in categories:
+                    categories[category] = None
+                    self.__positions += 1
+            self.__remove_keys(category, removed_keys)
+
+    def __remove_keys(self, category: Category, keys) -> None:
+        for key in keys:
+            categories = self.__index.get(key)
+            if categories is not None and category in categories:
+                del categories[category]
+                self.__positions -= 1
+                if not categories:
+                    del self.__index[key]
+
+    def __len__(self):
+        return len(self.__categories)
+
+    def __contains__(self, name: str):
+        return name in self.__categories
+
+    def __iter__(self) -> Iterator[Category]:
+        with self.__lock:
+            return iter(list(self.__categories.values()))
+
+    def __getitem__(self, name: str) -> Category:
+        category = self.__categories.get(name)
+        if category is None:
+            raise KeyError(f"Категория не найдена: {name}")
+        return category
+
+    def get(self, name: str, default=None):
+        """Категория по названию за O(1) или default"""
+
+        return self.__categories.get(name, default)
+
+    def categories_with(self, name: str) -> List[Category]:
+        """Категории, в которых есть товар с таким названием (без учета регистра и пробелов)"""
+
+        with self.__lock:
+            return list(self.__index.get(product_key(name), ()))
+
+    def find_products(self, name: str) -> List[Product]:
+        """Товары с таким названием во всех категориях"""
+
+        return [category.find_product(name) for category in self.categories_with(name)]
+
+    @property
+    def total_quantity(self) -> int:
+        """Общий остаток по всем категориям, O(1)"""
+
+        return self.__total_quantity
+
+    @property
+    def total_kopecks(self) -> int:
+        """Точная общая стоимость остатков по всем категориям в копейках, O(1)"""
+
+        return self.__total_kopecks
+
+    @property
+    def total_value(self) -> float:
+        return from_kopecks(self.__total_kopecks)
+
+    @property
+    def positions(self) -> int:
+        """Число позиций товаров во всех категориях (товар в двух категориях считается дважды), O(1)"""
+
+        return self.__positions
+
+    @property
+    def distinct_products(self) -> int:
+        """Число разных названий товаров в каталоге, O(1)"""
+
+        return len(self.__index)
+
+    def get_average_price(self) -> str:
+        """Средняя цена единицы товара по всему каталогу"""
+
+        with self.__lock:
+            return f"{from_kopecks(average_kopecks(self.__total_kopecks, self.__total_quantity))} руб."
@@ -1,6 +1,18 @@
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import repeat
+from operator import attrgetter
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List
 
-from src.product import Product, ZeroQuantityError
+from src import events, metrics
+from src.money import average_kopecks, from_kopecks, to_amount, to_kopecks, total_kopecks
+from src.pricing import PriceChangePolicy, RepriceReport
+from src.product import Product, ZeroQuantityError, product_key, product_lock
+from src.query import Query
+from src.versions import CategoryView
 
 
 class BaseContainer(ABC):
@@ -16,73 +28,474 @@ class BaseContainer(ABC):
 
 
 class Category(BaseContainer):
-    """Класс для представления категории продукта"""
+    """
+    Класс для представления категории продукта.
+    Безопасен для потоков: структуру и итоги защищает замок категории,
+    слияние дубликатов - полосатые замки товаров (src.product.product_lock).
+    """
 
     category_count = 0
     product_count = 0
+    _counter_lock = threading.Lock()
 
     def __init__(self, name: str, description: str, products: list = None):
         super().__init__(name, description)
-        self.__products = []
+        self.__init_state()
 
         if products:
             for product in products:
                 self.add_product(product)
 
-        Category.category_count += 1
+        with Category._counter_lock:
+            Category.category_count += 1
+
+    def __init_state(self) -> None:
+        self.__lock = threading.RLock()
+        self.__products = []
+        self.__index = {}
+        self.__total_quantity = 0
+        self.__total_kopecks = 0
+        self.__analytics = None
+        self.__search = None
+        self.__prices = None
+        # Слушатели категории (например, реестр src.catalog.Catalog), кортеж или None:
+        # получают _category_changed(category, added_keys, removed_keys) под замком категории
+        self.__listeners = None
+        # Номер версии растет при каждом изменении; живые срезы (snapshot) создаются по требованию
+        self.__version = 0
+        self.__views = None
+
+    @classmethod
+    def _restore(cls, name: str, description: str, products: List[Product], keys: List[str] = None) -> "Category":
+        """
+        Собирает категорию из уже проверенных товаров без дубликатов (снимки, пайплайны):
+        без событий и без изменения счетчиков category_count и product_count.
+        keys - заранее посчитанные product_key(name) в том же порядке, если они есть.
+        """
+
+        category = cls.__new__(cls)
+        BaseContainer.__init__(category, name, description)
+        category.__init_state()
+        category._insert_many(products, keys, count=False)
+        return category
+
+    def _insert_many(self, products: List[Product], keys: List[str] = None, count: bool = True) -> List[Product]:
+        """
+        Массово вставляет уже проверенные товары с разными названиями.
+        Из событий при count=True отправляется только product_inserted (для журнала src.eventlog).
+        Товары, чей ключ уже есть в категории, не вставляются и возвращаются: их нужно слить через merge.
+        """
+
+        if keys is None:
+            keys = list(map(product_key, map(attrgetter("name"), products)))
+
+        with self.__lock:
+            if self.__index:
+                rejected = [product for key, product in zip(keys, products) if key in self.__index]
+                if rejected:
+                    pairs = [(key, product) for key, product in zip(keys, products) if key not in self.__index]
+                    keys = [key for key, _ in pairs]
+                    products = [product for _, product in pairs]
+            else:
+                rejected = []
+
+            self.__products.extend(products)
+            self.__index.update(zip(keys, products))
+            self.__version += 1
+            # Для журнала поля читаются один раз до подписки: из них же считаются итоги,
+            # а изменения после подписки придут отдельными событиями
+            values = list(map(Product._values, products)) if count and events.has_handlers() else None
+            if values is not None:
+                quantities = [row[3] for row in values]
+                prices = [row[2] for row in values]
+            else:
+                quantities = list(map(attrgetter("quantity"), products))
+                # _price читается напрямую: свойство price на миллионе товаров заметно медленнее
+                prices = map(attrgetter("_price"), products)
+            self.__total_quantity += sum(quantities)
+            self.__total_kopecks += total_kopecks(prices, quantities)
+            if self.__listeners is not None and products:
+                self.__notify_listeners(keys)
+            for index in (self.__search, self.__prices):
+                if index is not None:
+                    for product in products:
+                        index.add(product)
+
+            if any(map(attrgetter("_watchers"), products)):
+                for product in products:
+                    product._watch(self)
+            else:
+                deque(map(Product._watchers.__set__, products, repeat((self,))), maxlen=0)
+
+            if values is not None:
+                for product, product_values in zip(products, values):
+                    events.emit(
+                        "product_inserted",
+                        category=self.name,
+                        product=product.name,
+                        item=product,
+                        values=product_values,
+                    )
+
+        if count:
+            with Category._counter_lock:
+                Category.product_count += len(products)
+        return rejected
+
+    def _product_list(self) -> List[Product]:
+        """Согласованная копия списка товаров (для сохранения и массовой обработки)"""
+
+        with self.__lock:
+            return list(self.__products)
 
     def __str__(self):
         """Строковое представление категории: Название и Общее количество товаров"""
 
-        total_quantity = sum(product.quantity for product in self.__products)
-        return f"{self.name}, количество продуктов: {total_quantity} шт."
+        return f"{self.name}, количество продуктов: {self.total_quantity} шт."
 
     def add_product(self, product):
         """Добавляет продукт в категорию"""
 
+        started = perf_counter() if metrics.enabled else None
         try:
             if not isinstance(product, Product):
                 raise ValueError("Можно добавлять только объекты класса Product или его наследников")
 
-            if product.quantity == 0:
+            quantity = product.quantity
+            if quantity == 0:
                 raise ZeroQuantityError("Нельзя добавить товар с нулевым количеством")
 
-            existing_product = next((i for i in self.__products if i.name == product.name), None)
-            if existing_product:
-                existing_product.quantity += product.quantity
-                if product.price > existing_product.price:
-                    existing_product.price = product.price
-                    existing_product.description = product.description
+            key = product_key(product.name)
+            with self.__lock:
+                existing_product = self.__index.get(key)
+                if existing_product is None:
+                    # Итоги и событие вставки берут одни и те же значения, прочитанные до подписки на товар
+                    values = product._values()
+                    self.__version += 1
+                    self.__products.append(product)
+                    self.__index[key] = product
+                    self.__total_quantity += values[3]
+                    self.__total_kopecks += to_kopecks(values[2]) * values[3]
+                    if self.__search is not None:
+                        self.__search.add(product)
+                    if self.__prices is not None:
+                        self.__prices.add(product)
+                    product._watch(self)
+                    if self.__listeners is not None:
+                        self.__notify_listeners((key,))
+                    # Под замком категории: событие вставки идет раньше событий об изменениях этого товара
+                    events.emit(
+                        "product_inserted", category=self.name, product=product.name, item=product, values=values
+                    )
+
+            # Слияние идет вне замка категории: товар защищен своим замком,
+            # а итоги категория обновит в _product_changed
+            if existing_product is not None:
+                existing_product.merge(product.quantity, product.price, product.description)
             else:
-                self.__products.append(product)
-                Category.product_count += 1
+                with Category._counter_lock:
+                    Category.product_count += 1
 
-            print("Товар успешно добавлен")
+            if started is not None:
+                path = "add_product_insert" if existing_product is None else "add_product_merge"
+                metrics.observe(path, perf_counter() - started)
+
+            events.emit("product_added", category=self.name, product=product.name)
 
         except (ZeroQuantityError, ValueError) as e:
-            print(f"Ошибка: {e}")
+            events.emit("product_add_failed", category=self.name, error=str(e))
             raise
         finally:
-            print("Обработка добавления товара завершена")
+            events.emit("product_add_finished", category=self.name)
+
+    def _product_changed(self, product: Product, field: str, old_value, new_value) -> None:
+        """Поддерживает итоги и индекс при изменении товара (заказ, переоценка, ручная правка)"""
+
+        with self.__lock:
+            self.__apply_change(product, field, old_value, new_value)
+            if field == "quantity":
+                delta = new_value - old_value
+                self.__total_quantity += delta
+                self.__total_kopecks += to_kopecks(product.price) * delta
+            elif field == "price":
+                self.__total_kopecks += (to_kopecks(new_value) - to_kopecks(old_value)) * product.quantity
+            else:
+                return
+            if self.__listeners is not None:
+                self.__notify_listeners()
+
+    def _product_changes(self, product: Product, changes) -> None:
+        """
+        Несколько изменений одного товара [(поле, было, стало)] (слияние) применяются под одним захватом замка:
+        срез не увидит половину. Итоги пересчитываются один раз по прежним и новым остатку и цене.
+        Вызывается под замком товара.
+        """
+
+        with self.__lock:
+            old_values = {field: old_value for field, old_value, _ in changes}
+            quantity, price = product.quantity, product.price
+            old_quantity = old_values.get("quantity", quantity)
+            old_price = old_values.get("price", price)
+            for field, old_value, new_value in changes:
+                self.__apply_change(product, field, old_value, new_value)
+            if quantity != old_quantity or price != old_price:
+                self.__total_quantity += quantity - old_quantity
+                self.__total_kopecks += to_kopecks(price) * quantity - to_kopecks(old_price) * old_quantity
+                if self.__listeners is not None:
+                    self.__notify_listeners()
+
+    def __apply_change(self, product: Product, field: str, old_value, new_value) -> None:
+        """Версия, срезы, аналитика и индексы; итоги считает вызывающий. Вызывается под замком"""
+
+        self.__version += 1
+        if self.__views:
+            for view in self.__views:
+                view._record(product, field, old_value)
+        if self.__analytics is not None:
+            self.__analytics._product_changed(product, field, old_value, new_value)
+        if self.__search is not None:
+            self.__search.update(product, field, old_value, new_value)
+
+        if field == "price":
+            if self.__prices is not None:
+                self.__prices.update(product, old_value, new_value)
+        elif field == "name":
+            old_key = product_key(old_value)
+            removed = ()
+            if self.__index.get(old_key) is product:
+                del self.__index[old_key]
+                removed = (old_key,)
+            new_key = product_key(new_value)
+            added = () if new_key in self.__index else (new_key,)
+            self.__index.setdefault(new_key, product)
+            if self.__listeners is not None:
+                self.__notify_listeners(added, removed)
+
+    @property
+    def version(self) -> int:
+        """Номер версии категории: меняется при каждой вставке и каждом изменении товара"""
+
+        return self.__version
+
+    def snapshot(self) -> CategoryView:
+        """
+        Неизменяемый срез категории на текущий момент за O(1) (см. src.versions.CategoryView).
+        Отчеты по срезу видят согласованные итоги и товары, пока импорт продолжает писать в категорию.
+        """
+
+        with self.__lock:
+            view = CategoryView(self, self.__products, self.__total_quantity, self.__total_kopecks, self.__version)
+            if self.__views is None:
+                self.__views = weakref.WeakSet()
+            self.__views.add(view)
+            return view
+
+    def _listen(self, listener) -> None:
+        """
+        Подписывает слушателя на изменения итогов и ключей товаров категории.
+        Первым вызовом слушатель сразу получает все текущие ключи - под тем же замком, без пропусков.
+        """
+
+        with self.__lock:
+            if self.__listeners is None:
+                self.__listeners = (listener,)
+            elif listener not in self.__listeners:
+                self.__listeners += (listener,)
+            else:
+                return
+            listener._category_changed(self, list(self.__index), ())
+
+    def _exclusive(self) -> threading.RLock:
+        """
+        Замок категории для операций над несколькими категориями сразу (контрольная точка журнала).
+        Порядок захвата: замки товаров -> замки категорий -> прочие замки.
+        """
+
+        return self.__lock
+
+    def _unlisten(self, listener) -> List[str]:
+        """Отписывает слушателя и возвращает ключи товаров на момент отписки"""
+
+        with self.__lock:
+            if self.__listeners and listener in self.__listeners:
+                self.__listeners = tuple(other for other in self.__listeners if other is not listener) or None
+            return list(self.__index)
+
+    def __notify_listeners(self, added_keys=(), removed_keys=()) -> None:
+        for listener in self.__listeners:
+            listener._category_changed(self, added_keys, removed_keys)
+
+    @property
+    def total_quantity(self) -> int:
+        """Общее количество единиц товара в категории, O(1)"""
+
+        return self.__total_quantity
+
+    @property
+    def total_kopecks(self) -> int:
+        """Точная общая стоимость остатков в копейках, O(1)"""
+
+        return self.__total_kopecks
+
+    @property
+    def total_value(self) -> float:
+        """Общая стоимость остатков в категории, O(1)"""
+
+        return from_kopecks(self.__total_kopecks)
+
+    @property
+    def average_price(self) -> float:
+        """Средняя цена единицы товара с учетом остатков, O(1)"""
+
+        if not self.__total_quantity:
+            return 0.0
+        return from_kopecks(self.__total_kopecks) / self.__total_quantity
+
+    @property
+    def analytics(self):
+        """Векторная аналитика по товарам категории (NumPy/pandas), создается при первом обращении"""
+
+        with self.__lock:
+            if self.__analytics is None:
+                from src.analytics import CategoryAnalytics
+
+                self.__analytics = CategoryAnalytics(self.__products, self.__lock)
+            return self.__analytics
+
+    @property
+    def search_index(self):
+        """Поисковый индекс категории (src.search), строится при первом обращении и дальше обновляется сам"""
+
+        with self.__lock:
+            if self.__search is None:
+                from src.search import SearchIndex
+
+                self.__search = SearchIndex(self.__products)
+            return self.__search
+
+    def search(self, query: str = "", prefix: bool = False, limit: int = None, **filters) -> List[Product]:
+        """Ищет товары по словам в названии и описании и по атрибутам (см. SearchIndex.search)"""
+
+        index = self.search_index
+        with self.__lock:
+            return index.search(query, prefix=prefix, limit=limit, **filters)
+
+    @property
+    def price_index(self):
+        """Отсортированный индекс цен (src.price_index), строится при первом обращении и дальше обновляется сам"""
+
+        with self.__lock:
+            if self.__prices is None:
+                from src.price_index import PriceIndex
+
+                self.__prices = PriceIndex(self.__products)
+            return self.__prices
+
+    def products_by_price(
+        self, low: float = None, high: float = None, limit: int = None, descending: bool = False
+    ) -> List[Product]:
+        """Товары с ценой от low до high включительно, отсортированные по цене, за O(log n + k)"""
+
+        index = self.price_index
+        with self.__lock:
+            return index.price_range(low, high, limit=limit, descending=descending)
+
+    def cheapest(self, count: int) -> List[Product]:
+        """count самых дешевых товаров"""
+
+        return self.products_by_price(limit=count)
+
+    def most_expensive(self, count: int) -> List[Product]:
+        """count самых дорогих товаров"""
+
+        return self.products_by_price(limit=count, descending=True)
+
+    def find_product(self, name: str):
+        """Возвращает товар с таким же ключом названия или None"""
+
+        return self.__index.get(product_key(name))
+
+    def _product_by_key(self, key: str):
+        """Товар по уже нормализованному ключу (ключи приходят слушателям в _category_changed)"""
+
+        return self.__index.get(key)
+
+    def reprice(self, prices: Dict[str, float], policy: PriceChangePolicy = None) -> RepriceReport:
+        """
+        Массово меняет цены товаров по словарю {название: новая цена} за один проход.
+        Снижения цен решает policy (по умолчанию - политика класса товара), без запросов пользователю.
+        """
+
+        report = RepriceReport()
+        for name, new_price in prices.items():
+            product = self.__index.get(product_key(name))
+            if product is None:
+                report.missing.append(name)
+            elif product.set_price(new_price, policy):
+                report.applied += 1
+            else:
+                report.rejected += 1
+        return report
 
     @property
     def products(self):
         """Возвращает список строк с информацией о продуктах"""
 
-        return [str(product) for product in self.__products]
+        if metrics.enabled:
+            started = perf_counter()
+            rendered = [product.render() for product in self.__products]
+            metrics.observe("category_products", perf_counter() - started)
+            return rendered
+        return [product.render() for product in self.__products]
+
+    def products_page(self, offset: int = 0, limit: int = 20) -> List[str]:
+        """Возвращает одну страницу строк о продуктах, не собирая весь список"""
+
+        if offset < 0 or limit < 0:
+            raise ValueError("offset и limit не могут быть отрицательными")
+        return [product.render() for product in self.__products[offset : offset + limit]]
+
+    def iter_products(self) -> Iterator[str]:
+        """Лениво отдает строки о продуктах по одной"""
+
+        for product in self.__products:
+            yield product.render()
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Лениво обходит товары без копирования списка и без отрисовки строк.
+        Товары в категории только добавляются, поэтому обход безопасен при параллельных вставках
+        (добавленные во время обхода товары могут попасть в него).
+        """
+
+        return iter(self.__products)
+
+    def query(self) -> Query:
+        """Ленивый запрос по товарам категории (см. src.query.Query)"""
+
+        return Query(self)
+
+    def filter(self, predicate: Callable) -> Query:
+        return Query(self).where(predicate)
+
+    def where(self, predicate: Callable = None, **conditions) -> Query:
+        """Например: category.where(memory__gte=256).limit(20)"""
+
+        return Query(self).where(predicate, **conditions)
+
+    def order_by(self, *fields: str) -> Query:
+        return Query(self).order_by(*fields)
+
+    def limit(self, count: int, offset: int = 0) -> Query:
+        return Query(self).limit(count, offset)
 
     def __len__(self):
         return len(self.__products)
 
-    def get_average_price(self) -> float:
-        """Подсчитывает средний ценник всех товаров в категории"""
+    def get_average_price(self) -> str:
+        """Средний ценник всех товаров в категории в виде строки"""
 
-        try:
-            total_price = sum(product.price * product.quantity for product in self.__products)
-            total_quantity = sum(product.quantity for product in self.__products)
-            return f"{round(total_price / total_quantity, 2)} руб."
-        except ZeroDivisionError:
-            return "0.0 руб."
+        return f"{from_kopecks(average_kopecks(self.__total_kopecks, self.__total_quantity))} руб."
 
 
 class Order(BaseContainer):
@@ -92,21 +505,127 @@ class Order(BaseContainer):
         if quantity == 0:
             raise ZeroQuantityError("Количество товара в заказе не может быть нулевым")
 
+        started = perf_counter() if metrics.enabled else None
         try:
             super().__init__(name, description)
             self.product = product
             self.quantity = quantity
-            self.total_price = product.price * quantity
+            self.total_kopecks = to_kopecks(product.price) * quantity
+            self.total_price = to_amount(self.total_kopecks, product.price)
 
-            print("Заказ успешно создан")
+            events.emit(
+                "order_created",
+                order=self.name,
+                product=product.name,
+                quantity=quantity,
+                total_price=self.total_price,
+            )
 
         except ZeroQuantityError as e:
-            print(f"Ошибка: {e}")
+            events.emit("order_failed", order=name, error=str(e))
         finally:
-            print("Обработка создания заказа завершена")
+            events.emit("order_finished", order=name)
+            if started is not None:
+                metrics.observe("order", perf_counter() - started)
 
     def __str__(self):
         return (
             f"Заказ: {self.name}, Товар: {self.product.name}, "
             f"Количество: {self.quantity}, Итого: {self.total_price} руб. "
         )
+
+
+class Cart(BaseContainer):
+    """
+    Корзина из нескольких позиций с поддерживаемой суммой.
+    Добавление, изменение и удаление позиции - O(1); при смене цены товара
+    корзина получает уведомление и пересчитывает сумму только по этой позиции.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        super().__init__(name, description)
+        self.__lock = threading.Lock()
+        self.__lines: Dict[Product, int] = {}
+        self.__total_kopecks = 0
+
+    def __str__(self):
+        return f"Корзина: {self.name}, Позиций: {len(self.__lines)}, Итого: {from_kopecks(self.__total_kopecks)} руб."
+
+    def __len__(self):
+        return len(self.__lines)
+
+    def __contains__(self, product):
+        return product in self.__lines
+
+    @property
+    def total_price(self) -> float:
+        """Сумма корзины, O(1)"""
+
+        return from_kopecks(self.__total_kopecks)
+
+    @property
+    def lines(self) -> Dict[Product, int]:
+        """Копия позиций корзины: {товар: количество}"""
+
+        with self.__lock:
+            return dict(self.__lines)
+
+    def quantity_of(self, product: Product) -> int:
+        return self.__lines.get(product, 0)
+
+    def add(self, product: Product, quantity: int = 1) -> None:
+        """Добавляет товар в корзину или увеличивает количество в существующей позиции"""
+
+        if not isinstance(product, Product):
+            raise ValueError("В корзину можно добавлять только объекты класса Product или его наследников")
+        if quantity == 0:
+            raise ZeroQuantityError("Количество товара в корзине не может быть нулевым")
+
+        with product_lock(product), self.__lock:
+            old_quantity = self.__lines.get(product, 0)
+            self.__set_line(product, old_quantity, max(old_quantity + quantity, 0))
+
+    def update(self, product: Product, quantity: int) -> None:
+        """Задает количество товара в позиции; 0 удаляет позицию"""
+
+        if quantity < 0:
+            raise ValueError("Количество товара в корзине не может быть отрицательным")
+
+        with product_lock(product), self.__lock:
+            self.__set_line(product, self.__lines.get(product, 0), quantity)
+
+    def __set_line(self, product: Product, old_quantity: int, quantity: int) -> None:
+        """
+        Меняет позицию под замком товара и замком корзины (в этом порядке, как и уведомления о цене):
+        цена не может смениться между подпиской корзины на товар и расчетом суммы позиции.
+        """
+
+        if not old_quantity and quantity:
+            product._watch(self)
+        if quantity:
+            self.__lines[product] = quantity
+        else:
+            self.__lines.pop(product, None)
+        self.__total_kopecks += to_kopecks(product.price) * (quantity - old_quantity)
+        if old_quantity and not quantity:
+            product._unwatch(self)
+
+    def remove(self, product: Product) -> None:
+        """Удаляет позицию из корзины"""
+
+        self.update(product, 0)
+
+    def clear(self) -> None:
+        with self.__lock:
+            products = list(self.__lines)
+            self.__lines.clear()
+            self.__total_kopecks = 0
+        for product in products:
+            product._unwatch(self)
+
+    def _product_changed(self, product: Product, field: str, old_value, new_value) -> None:
+        if field == "price":
+            with self.__lock:
+                quantity = self.__lines.get(product)
+                if quantity:
+                    self.__total_kopecks += (to_kopecks(new_value) - to_kopecks(old_value)) * quantity
@@ -0,0 +1,425 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src import events
+from src.category import Category
+from src.money import to_kopecks
+from src.pricing import AcceptAllPolicy
+from src.product import Product, all_product_locks, product_key
+from src.snapshot import SNAPSHOT_CLASSES, load_snapshot, save_snapshot
+
+MAGIC = b"CCLOG003"
+
+# Кадр: длина полезной нагрузки, CRC32 нагрузки, число записей фиксированной длины, следующий номер товара.
+# Нагрузка: записи фиксированной длины (изменения остатка и цены), затем прочие записи -
+# массивы JSON в UTF-8 (строки, числа и None), каждый с длиной. Формат не зависит от версии Python.
+FRAME_HEADER = struct.Struct("<IIII")
+RECORD_LENGTH = struct.Struct("<I")
+
+# Запись фиксированной длины: тип, номер товара в журнале, значение (int64 или float64)
+FIXED_INT = struct.Struct("<BxxxIq")
+FIXED_FLOAT = struct.Struct("<BxxxId")
+QUANTITY, PRICE_INT, PRICE_FLOAT = 1, 2, 3
+
+# Готовые кодировщик и декодер: json.dumps с параметрами собирает новый кодировщик на каждый вызов
+_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+_DECODER = json.JSONDecoder()
+
+
+@dataclass
+class ReplayReport:
+    """Итог восстановления из журнала"""
+
+    frames: int = 0
+    records: int = 0
+    orders: int = 0
+    truncated: bool = False
+    seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+class EventLog:
+    """
+    Журнал упреждающей записи изменений каталога. Подписывается на события ядра (src.events)
+    и пишет в файл только добавлением:
+    - вставки товаров (product_inserted) с полями товара;
+    - изменения товаров (product_changed): остаток пишется приращением (так пишутся слияния и заказы),
+      цена - новым значением, прочие поля - новым значением;
+    - созданные заказы (order_created), для аудита.
+    Записи копятся в памяти и пишутся кадрами с CRC; один fsync подтверждает целую группу (group commit).
+    Кадр пишет фоновый поток: когда набралось group_size записей или прошло interval секунд.
+    Запись и fsync идут вне замка буфера, поэтому изменения каталога не ждут диска.
+    Восстановление (recover) нужно выполнять до создания журнала: иначе журнал запишет и сами повторы.
+    """
+
+    def __init__(self, path, group_size: int = 4096, interval: float = 0.05):
+        self.path = str(path)
+        self.group_size = group_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        # Порядок кадров в файле: забор буфера и запись идут под этим замком одним шагом
+        self._io_lock = threading.Lock()
+        self._fixed = bytearray()
+        self._blobs = bytearray()
+        self._pending = 0
+        self._ids: Dict[Tuple[str, Product], int] = {}
+        self._categories = set()
+
+        length, self._next_id = _valid_length(self.path)
+        self._file = open(self.path, "r+b" if length else "w+b")
+        if length:
+            self._file.truncate(length)
+            self._file.seek(length)
+        else:
+            self._file.write(MAGIC)
+            self._sync_file()
+
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, name="eventlog-flusher", daemon=True)
+        self._flusher.start()
+        events.subscribe(self)
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __call__(self, event: str, fields: Dict) -> None:
+        if event == "product_changed":
+            self._on_changed(fields["item"], fields["field"], fields["old_value"], fields["new_value"])
+        elif event == "product_inserted":
+            self._on_inserted(fields["category"], fields["item"], fields["values"])
+        elif event == "order_created":
+            total_price = fields["total_price"]
+            with self._lock:
+                self._append_blob(
+                    ("order", fields["order"], fields["product"], fields["quantity"], to_kopecks(total_price))
+                )
+
+    def _category_record(self, category: Category) -> None:
+        if category.name not in self._categories:
+            self._categories.add(category.name)
+            self._blobs += _encode(("category", category.name, category.description))
+
+    def _on_inserted(self, category_name: str, product: Product, values: tuple) -> None:
+        """
+        values - поля, по которым категория посчитала итоги. Повторное чтение товара могло бы захватить
+        изменение, которое придет и отдельным событием, и при восстановлении оно учлось бы дважды.
+        """
+
+        with self._lock:
+            for watcher in product._watchers or ():
+                if isinstance(watcher, Category) and watcher.name == category_name:
+                    self._category_record(watcher)
+            self._append_blob(("insert", category_name, type(product).__name__, values))
+
+    def _on_changed(self, product: Product, field: str, old_value, new_value) -> None:
+        categories = [watcher for watcher in product._watchers or () if isinstance(watcher, Category)]
+        if not categories:
+            return
+        # Название до этого изменения: по нему товар найдется при восстановлении
+        name = old_value if field == "name" else product.name
+        with self._lock:
+            for category in categories:
+                product_id = self._product_id(category, product, name)
+                if field == "quantity":
+                    self._fixed += FIXED_INT.pack(QUANTITY, product_id, new_value - old_value)
+                elif field == "price" and type(new_value) is int:
+                    self._fixed += FIXED_INT.pack(PRICE_INT, product_id, new_value)
+                elif field == "price":
+                    self._fixed += FIXED_FLOAT.pack(PRICE_FLOAT, product_id, float(new_value))
+                else:
+                    self._blobs += _encode(("field", product_id, field, new_value))
+                self._pending += 1
+            self._wake()
+
+    def _product_id(self, category: Category, product: Product, name: str) -> int:
+        product_id = self._ids.get((category.name, product))
+        if product_id is None:
+            product_id = self._ids[(category.name, product)] = self._next_id
+            self._next_id += 1
+            self._category_record(category)
+            self._blobs += _encode(("define", product_id, category.name, product_key(name)))
+        return product_id
+
+    def _append_blob(self, record: tuple) -> None:
+        self._blobs += _encode(record)
+        self._pending += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._pending >= self.group_size:
+            self._ready.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._closed and self._pending < self.group_size:
+                    self._ready.wait(self.interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def _take(self) -> Optional[Tuple[bytes, bytes, int]]:
+        """Забирает накопленные записи из буфера. Вызывается под замком"""
+
+        if not self._pending:
+            return None
+        taken = (bytes(self._fixed), bytes(self._blobs), self._next_id)
+        self._fixed.clear()
+        self._blobs.clear()
+        self._pending = 0
+        return taken
+
+    def _write_frame(self, fixed: bytes, blobs: bytes, next_id: int) -> None:
+        payload = fixed + blobs
+        self._file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload), len(fixed) // FIXED_INT.size, next_id))
+        self._file.write(payload)
+        self._sync_file()
+
+    def _sync_file(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def flush(self) -> None:
+        """Записывает и подтверждает на диске все накопленные записи"""
+
+        with self._io_lock:
+            with self._lock:
+                taken = self._take()
+            if taken is not None:
+                self._write_frame(*taken)
+
+    def checkpoint(self, snapshot_path, categories: List[Category]) -> None:
+        """
+        Сохраняет снимок категорий и начинает журнал заново: восстановление пойдет от этого снимка.
+        categories - все категории, изменения которых пишутся в журнал.
+        На время снимка берутся замки всех товаров, затем замки категорий, затем замки журнала -
+        в том же порядке, что и у пишущих потоков. Запись в каталог ждет конца снимка, зато ни одно
+        изменение не попадает одновременно в снимок и в новый журнал и ни одно не теряется.
+        """
+
+        categories = list(categories)
+        with ExitStack() as stack:
+            stack.enter_context(all_product_locks())
+            for category in categories:
+                stack.enter_context(category._exclusive())
+            stack.enter_context(self._io_lock)
+            stack.enter_context(self._lock)
+
+            save_snapshot(snapshot_path, categories)
+            self._take()
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(MAGIC)
+            self._sync_file()
+            self._ids.clear()
+            self._categories.clear()
+            self._next_id = 0
+
+    def close(self) -> None:
+        """Отписывается от событий, дописывает остаток и закрывает файл"""
+
+        events.unsubscribe(self)
+        with self._lock:
+            self._closed = True
+            self._ready.notify()
+        self._flusher.join()
+        self.flush()
+        self._file.close()
+
+
+def _iter_frames(data) -> Iterator[Tuple[int, int, int, int]]:
+    """Отдает (начало нагрузки, длина, число записей фиксированной длины, следующий номер) целых кадров"""
+
+    position = len(MAGIC)
+    while position + FRAME_HEADER.size <= len(data):
+        length, crc, fixed_count, next_id = FRAME_HEADER.unpack_from(data, position)
+        start = position + FRAME_HEADER.size
+        if start + length > len(data) or zlib.crc32(data[start : start + length]) != crc:
+            return
+        yield start, length, fixed_count, next_id
+        position = start + length
+
+
+def _valid_length(path) -> Tuple[int, int]:
+    """Длина целой части журнала (без оборванного хвоста) и следующий номер товара; (0, 0) для нового файла"""
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return 0, 0
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Файл не является журналом каталога")
+
+    length, next_id = len(MAGIC), 0
+    for start, frame_length, _, frame_next_id in _iter_frames(data):
+        length, next_id = start + frame_length, frame_next_id
+    return length, next_id
+
+
+def replay(path, categories: List[Category] = ()) -> Tuple[List[Category], ReplayReport]:
+    """
+    Применяет журнал к категориям (обычно только что загруженным из снимка) и возвращает
+    категории вместе с отчетом. Прочие записи применяются по порядку, а приращения остатка
+    и новые цены сначала сворачиваются по товарам и применяются по одному разу.
+    Оборванный последний кадр (сбой во время записи) отбрасывается.
+    """
+
+    started = time.perf_counter()
+    report = ReplayReport()
+    by_name: Dict[str, Category] = {category.name: category for category in categories}
+    products: Dict[int, Product] = {}
+    fixed_chunks = []
+
+    with open(path, "rb") as file:
+        data = file.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Файл не является журналом каталога")
+
+    view = memoryview(data)
+    end = len(MAGIC)
+    # CRC кадров сошелся, значит ошибка в записях - порча самого файла, а не обрыв: восстановление останавливается
+    try:
+        for start, length, fixed_count, _ in _iter_frames(data):
+            fixed_size = fixed_count * FIXED_INT.size
+            fixed_chunks.append(view[start : start + fixed_size])
+            report.frames += 1
+            report.records += fixed_count
+            for record in _iter_records(view[start + fixed_size : start + length]):
+                report.records += 1
+                _apply_blob(record, by_name, products, report)
+            end = start + length
+        report.truncated = end < len(data)
+
+        quantities, prices = _fold_fixed(b"".join(fixed_chunks))
+        for product_id, delta in quantities.items():
+            if delta:
+                product = products[product_id]
+                product.quantity = product.quantity + delta
+        # Цены одного товара могли прийти под разными номерами (разные сессии журнала): побеждает последняя
+        for product_id, (_, price) in sorted(prices.items(), key=lambda item: item[1][0]):
+            product = products[product_id]
+            if product.price != price:
+                product.set_price(price, AcceptAllPolicy())
+    except (struct.error, AttributeError, KeyError, IndexError, TypeError, ValueError):
+        raise ValueError("Журнал каталога поврежден") from None
+
+    report.seconds = time.perf_counter() - started
+    return list(by_name.values()), report
+
+
+def _encode(record: tuple) -> bytes:
+    try:
+        data = _ENCODER.encode(record).encode()
+    except (TypeError, ValueError):
+        raise ValueError("Поля товаров в журнале могут быть только строками, конечными числами или None") from None
+    return RECORD_LENGTH.pack(len(data)) + data
+
+
+def _iter_records(view) -> Iterator[list]:
+    position = 0
+    while position < len(view):
+        (length,) = RECORD_LENGTH.unpack_from(view, position)
+        position += RECORD_LENGTH.size
+        # raw_decode - сам разбор на C, без проверок пробелов вокруг записи (кодировщик их не пишет)
+        text = str(view[position : position + length], "utf-8")
+        record, end = _DECODER.raw_decode(text)
+        if end != len(text):
+            raise ValueError("Лишние данные после записи журнала")
+        yield record
+        position += length
+
+
+def _apply_blob(record: list, by_name: Dict[str, Category], products: Dict[int, Product], report) -> None:
+    kind = record[0]
+    if kind == "category":
+        _, name, description = record
+        if name not in by_name:
+            by_name[name] = Category._restore(name, description, [])
+    elif kind == "insert":
+        _, category_name, class_name, values = record
+        product_class = SNAPSHOT_CLASSES[class_name]
+        if len(values) != len(product_class.fields):
+            raise ValueError("Число полей не совпадает с классом товара")
+        columns = {field: [value] for field, value in zip(product_class.fields, values)}
+        by_name[category_name]._insert_many(product_class._restore_many(columns, 1), count=False)
+    elif kind == "define":
+        _, product_id, category_name, key = record
+        products[product_id] = by_name[category_name]._product_by_key(key)
+    elif kind == "field":
+        _, product_id, field, value = record
+        product = products[product_id]
+        # Имя поля приходит из файла: служебные атрибуты товара записью журнала не меняются
+        if field not in type(product).fields:
+            raise ValueError(f"Неизвестное поле товара: {field}")
+        setattr(product, field, value)
+    elif kind == "order":
+        report.orders += 1
+
+
+def _fold_fixed(fixed: bytes) -> Tuple[Dict[int, int], Dict[int, Tuple[int, object]]]:
+    """
+    Сворачивает записи фиксированной длины: {номер: сумма приращений остатка}
+    и {номер: (позиция последней цены, цена)}. С NumPy - векторно, иначе - циклом.
+    """
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is None or not fixed:
+        quantities: Dict[int, int] = {}
+        prices: Dict[int, Tuple[int, object]] = {}
+        for position, (kind, product_id, value) in enumerate(FIXED_INT.iter_unpack(fixed)):
+            if kind == QUANTITY:
+                quantities[product_id] = quantities.get(product_id, 0) + value
+            elif kind == PRICE_INT:
+                prices[product_id] = (position, value)
+            else:
+                prices[product_id] = (position, FIXED_FLOAT.unpack_from(fixed, position * FIXED_FLOAT.size)[2])
+        return quantities, prices
+
+    records = np.frombuffer(fixed, dtype=np.dtype([("kind", "u1"), ("pad", "V3"), ("id", "<u4"), ("value", "<i8")]))
+    kinds, ids, values = records["kind"], records["id"].astype(np.int64), records["value"]
+
+    is_quantity = kinds == QUANTITY
+    quantity_ids, quantity_index = np.unique(ids[is_quantity], return_inverse=True)
+    sums = np.zeros(len(quantity_ids), dtype=np.int64)
+    np.add.at(sums, quantity_index, values[is_quantity])
+
+    price_positions = np.flatnonzero(~is_quantity)
+    price_ids = ids[price_positions]
+    last = np.full(int(price_ids.max()) + 1 if len(price_ids) else 0, -1, dtype=np.int64)
+    np.maximum.at(last, price_ids, price_positions)
+    latest = last[last >= 0]
+    as_float = values[latest].view("<f8")
+
+    prices = {}
+    for position, product_id, kind, raw, real in zip(
+        latest.tolist(), ids[latest].tolist(), kinds[latest].tolist(), values[latest].tolist(), as_float.tolist()
+    ):
+        prices[product_id] = (position, raw if kind == PRICE_INT else real)
+    return dict(zip(quantity_ids.tolist(), sums.tolist())), prices
+
+
+def recover(snapshot_path, log_path) -> Tuple[List[Category], ReplayReport]:
+    """Поднимает каталог при старте: последний снимок (если есть) плюс журнал после него"""
+
+    categories = load_snapshot(snapshot_path) if os.path.exists(snapshot_path) else []
+    if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+        return categories, ReplayReport()
+    return replay(log_path, categories)
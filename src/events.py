@@ -0,0 +1,103 @@
+import atexit
+import json
+import logging
+import threading
+from typing import Callable, Dict, List
+
+EventHandler = Callable[[str, Dict], None]
+
+_handlers: List[EventHandler] = []
+
+
+def subscribe(handler: EventHandler) -> EventHandler:
+    """Подключает обработчик событий ядра. По умолчанию обработчиков нет и события не выводятся"""
+
+    if handler not in _handlers:
+        _handlers.append(handler)
+    return handler
+
+
+def unsubscribe(handler: EventHandler) -> None:
+    """Отключает обработчик событий"""
+
+    if handler in _handlers:
+        _handlers.remove(handler)
+
+
+def has_handlers() -> bool:
+    return bool(_handlers)
+
+
+def emit(event: str, **fields) -> None:
+    """Передает событие всем подключенным обработчикам"""
+
+    if not _handlers:
+        return
+    for handler in tuple(_handlers):
+        handler(event, fields)
+
+
+class PrintHandler:
+    """Обработчик, печатающий прежние сообщения ядра в stdout"""
+
+    def __call__(self, event: str, fields: Dict) -> None:
+        if event == "product_created":
+            product = fields["product"]
+            print(f"{product.__class__.__name__}{product!r}")
+        elif event == "product_added":
+            print("Товар успешно добавлен")
+        elif event in ("product_add_failed", "order_failed"):
+            print(f"Ошибка: {fields['error']}")
+        elif event == "product_add_finished":
+            print("Обработка добавления товара завершена")
+        elif event == "order_created":
+            print("Заказ успешно создан")
+        elif event == "price_rejected" and fields["reason"] == "non_positive":
+            print("Цена не должна быть нулевая или отрицательная")
+        elif event == "order_finished":
+            print("Обработка создания заказа завершена")
+
+
+class BatchedLogHandler:
+    """
+    Обработчик структурированного логирования: копит события
+    и пишет их в логгер пачками, одна JSON-строка на событие.
+    Безопасен для потоков; остаток буфера пишется при close() и при выходе из программы.
+    """
+
+    def __init__(self, logger: logging.Logger = None, batch_size: int = 1000, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("codecommerce.events")
+        self.batch_size = batch_size
+        self.level = level
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        # Пачки пишутся по одной и в порядке заполнения
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def __call__(self, event: str, fields: Dict) -> None:
+        record = {"event": event}
+        for key, value in fields.items():
+            record[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Сбрасывает накопленные события в логгер одним сообщением"""
+
+        with self._write_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, []
+            if buffer:
+                self.logger.log(self.level, "\n".join(buffer))
+
+    def close(self) -> None:
+        """Отписывается от событий и пишет остаток буфера"""
+
+        unsubscribe(self)
+        atexit.unregister(self.flush)
+        self.flush()
@@ -0,0 +1,203 @@
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.category import Category
+from src.product import LawnGrass, Product, Smartphone, ZeroQuantityError
+
+TYPE_FIELD = "type"
+
+PRODUCT_TYPES = {
+    "product": Product,
+    "smartphone": Smartphone,
+    "lawn_grass": LawnGrass,
+    "lawngrass": LawnGrass,
+}
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class LoadStats:
+    """Статистика загрузки каталога"""
+
+    rows: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def iter_jsonl(path) -> Iterator[Dict]:
+    """Построчно читает записи из файла JSON Lines"""
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_json_array(path, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict]:
+    """Потоково читает элементы JSON-массива, не загружая файл в память целиком"""
+
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as file:
+        buffer = ""
+        started = False
+        eof = False
+
+        while True:
+            position = 0
+            while True:
+                while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                    position += 1
+                if position == len(buffer):
+                    break
+                if not started:
+                    if buffer[position] != "[":
+                        raise ValueError("Файл должен содержать JSON-массив")
+                    started = True
+                    position += 1
+                    continue
+                if buffer[position] == "]":
+                    return
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break
+                # Значение, дочитанное до конца буфера, могло оборваться (число 1234 из чанков "12" и "34")
+                if end == len(buffer) and not eof:
+                    break
+                if not isinstance(record, dict):
+                    raise ValueError(f"Элемент JSON-массива должен быть объектом, а не {type(record).__name__}")
+                position = end
+                yield record
+
+            if eof:
+                raise ValueError("JSON-массив не закрыт")
+            buffer = buffer[position:]
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+
+
+def iter_xlsx(path, sheet: Optional[str] = None) -> Iterator[Dict]:
+    """Построчно читает лист Excel: первая строка - заголовки, пустые ячейки пропускаются"""
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for row in rows:
+            record = {key: value for key, value in zip(header, row) if key is not None and value is not None}
+            if record:
+                yield record
+    finally:
+        workbook.close()
+
+
+def iter_records(path, **kwargs) -> Iterator[Dict]:
+    """Выбирает способ чтения по расширению файла"""
+
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl(path)
+    if suffix == ".json":
+        return iter_json_array(path, **kwargs)
+    if suffix == ".xlsx":
+        return iter_xlsx(path, **kwargs)
+    raise ValueError(f"Неподдерживаемый формат файла: {suffix}")
+
+
+def build_product(record: Dict, type_field: str = TYPE_FIELD) -> Product:
+    """Создает объект нужного класса по полю типа записи"""
+
+    data = dict(record)
+    type_name = str(data.pop(type_field, "product")).strip().lower()
+    product_class = PRODUCT_TYPES.get(type_name)
+    if product_class is None:
+        raise ValueError(f"Неизвестный тип товара: {type_name}")
+    return product_class(**data)
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+    """Разбивает поток на пакеты фиксированного размера"""
+
+    if batch_size <= 0:
+        raise ValueError("Размер пакета должен быть положительным")
+
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_product_batches(
+    records: Iterable[Dict], batch_size: int = 1000, type_field: str = TYPE_FIELD, skip_invalid: bool = False
+) -> Iterator[List[Product]]:
+    """Превращает поток записей в пакеты товаров для поэтапной обработки"""
+
+    for batch in iter_batches(records, batch_size):
+        products = []
+        for record in batch:
+            try:
+                products.append(build_product(record, type_field))
+            except (ZeroQuantityError, ValueError, TypeError, KeyError):
+                if not skip_invalid:
+                    raise
+        yield products
+
+
+def load_catalog(
+    source,
+    category: Category,
+    batch_size: int = 1000,
+    type_field: str = TYPE_FIELD,
+    skip_invalid: bool = False,
+    on_batch: Optional[Callable[[LoadStats], None]] = None,
+) -> LoadStats:
+    """
+    Загружает товары в категорию пакетами.
+    source - путь к файлу (.jsonl, .json, .xlsx) или уже готовый поток записей.
+    """
+
+    records = iter_records(source) if isinstance(source, (str, Path)) else source
+    stats = LoadStats()
+    started = time.perf_counter()
+
+    for batch in iter_batches(records, batch_size):
+        for record in batch:
+            try:
+                product = build_product(record, type_field)
+            except (ZeroQuantityError, ValueError, TypeError, KeyError):
+                if not skip_invalid:
+                    raise
+                stats.skipped += 1
+                continue
+            category.add_product(product)
+            stats.rows += 1
+
+        stats.batches += 1
+        stats.seconds = time.perf_counter() - started
+        if on_batch is not None:
+            on_batch(stats)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,118 @@
+import threading
+from bisect import bisect_left
+from typing import Dict
+
+# Выключено по умолчанию: горячие пути проверяют только этот флаг и не трогают часы
+enabled = False
+
+PREFIX = "codecommerce"
+
+# Верхние границы корзин гистограмм задержек, в секундах (от 1 мкс до 1 с)
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 0.1, 1.0)
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Гистограмма задержек операции: число вызовов, сумма и счетчики по корзинам BUCKETS"""
+
+    __slots__ = ("counts", "count", "sum", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(BUCKETS, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self) -> Dict:
+        """Накопительные счетчики по корзинам, как в Prometheus"""
+
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, int] = {}
+
+
+def enable() -> None:
+    """Включает сбор метрик"""
+
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    """Выключает сбор метрик; накопленные значения сохраняются до reset()"""
+
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    """Сбрасывает все накопленные метрики"""
+
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def observe(operation: str, seconds: float) -> None:
+    """Записывает длительность операции в ее гистограмму"""
+
+    histogram = _histograms.get(operation)
+    if histogram is None:
+        with _lock:
+            histogram = _histograms.setdefault(operation, Histogram())
+    histogram.observe(seconds)
+
+
+def increment(counter: str, value: int = 1) -> None:
+    """Увеличивает счетчик"""
+
+    with _lock:
+        _counters[counter] = _counters.get(counter, 0) + value
+
+
+def snapshot() -> Dict:
+    """Снимок метрик: {"counters": {...}, "histograms": {операция: {count, sum, buckets}}}"""
+
+    with _lock:
+        histograms = dict(_histograms)
+        counters = dict(_counters)
+    return {
+        "counters": counters,
+        "histograms": {operation: histogram.snapshot() for operation, histogram in sorted(histograms.items())},
+    }
+
+
+def to_prometheus() -> str:
+    """Метрики в текстовом формате Prometheus"""
+
+    data = snapshot()
+    lines = []
+    for counter, value in sorted(data["counters"].items()):
+        name = f"{PREFIX}_{counter}_total"
+        lines += [f"# TYPE {name} counter", f"{name} {value}"]
+
+    name = f"{PREFIX}_operation_seconds"
+    if data["histograms"]:
+        lines.append(f"# TYPE {name} histogram")
+    for operation, histogram in data["histograms"].items():
+        for bound, count in histogram["buckets"].items():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{operation="{operation}",le="{le}"}} {count}')
+        lines.append(f'{name}_sum{{operation="{operation}"}} {histogram["sum"]!r}')
+        lines.append(f'{name}_count{{operation="{operation}"}} {histogram["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,55 @@
+from itertools import repeat
+from operator import mul
+from typing import Iterable, Iterator, Union
+
+Amount = Union[int, float]
+
+# Копеек в рубле
+SCALE = 100
+
+
+def to_kopecks(amount: Amount) -> int:
+    """
+    Переводит сумму в рублях в целые копейки.
+    Цены хранятся с точностью до копейки, поэтому округление снимает ошибку двоичного float
+    (19.99 * 100 = 1998.9999999999998 -> 1999).
+    """
+
+    return round(amount * SCALE)
+
+
+def to_kopecks_many(amounts: Iterable[Amount]) -> Iterator[int]:
+    """to_kopecks для последовательности; цепочка map работает на уровне C"""
+
+    return map(round, map(mul, amounts, repeat(SCALE)))
+
+
+def total_kopecks(prices: Iterable[Amount], quantities: Iterable[int]) -> int:
+    """Точная стоимость остатков в копейках: сумма цена * количество без накопления ошибки float"""
+
+    return sum(map(mul, to_kopecks_many(prices), quantities))
+
+
+def from_kopecks(kopecks: int) -> float:
+    """Копейки в рубли; результат - ближайший float к точной сумме"""
+
+    return kopecks / SCALE
+
+
+def to_amount(kopecks: int, *samples: Amount) -> Amount:
+    """
+    Совместимость со старыми строками: если все исходные цены были целыми,
+    а сумма без копеек, возвращает int (как давала целочисленная арифметика), иначе float.
+    """
+
+    if kopecks % SCALE == 0 and all(type(sample) is int for sample in samples):
+        return kopecks // SCALE
+    return kopecks / SCALE
+
+
+def average_kopecks(kopecks: int, quantity: int) -> int:
+    """Средняя цена единицы в копейках, округленная до копейки (половина - вверх)"""
+
+    if not quantity:
+        return 0
+    return (2 * kopecks + quantity) // (2 * quantity)
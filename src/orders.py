@@ -0,0 +1,81 @@
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from src import events
+from src.category import Order
+from src.product import Product, product_lock
+
+
+@dataclass
+class OrderRequest:
+    """Заявка на заказ: товар и желаемое количество"""
+
+    name: str
+    product: Product
+    quantity: int
+    description: str = ""
+
+
+@dataclass
+class BatchResult:
+    """Итог обработки пачки заявок"""
+
+    orders: List[Order] = field(default_factory=list)
+    rejected: List[OrderRequest] = field(default_factory=list)
+    partial: int = 0
+    seconds: float = 0.0
+
+    @property
+    def orders_per_second(self) -> float:
+        processed = len(self.orders) + len(self.rejected)
+        return processed / self.seconds if self.seconds else 0.0
+
+
+class OrderEngine:
+    """
+    Обрабатывает пачки заказов с резервированием остатка.
+    Проверка остатка, создание Order и списание идут под замком товара,
+    поэтому параллельные пачки не продают больше, чем есть на складе.
+    """
+
+    def __init__(self, allow_partial: bool = False):
+        self.allow_partial = allow_partial
+
+    def place(self, request: OrderRequest, result: BatchResult) -> None:
+        """Резервирует остаток под одну заявку и записывает итог в result"""
+
+        product = request.product
+        if request.quantity <= 0:
+            result.rejected.append(request)
+            return
+
+        with product_lock(product):
+            available = product.quantity
+            if available >= request.quantity:
+                granted = request.quantity
+            elif self.allow_partial:
+                granted = available
+            else:
+                granted = 0
+
+            if granted <= 0:
+                result.rejected.append(request)
+                events.emit("order_rejected", order=request.name, product=product.name, available=available)
+                return
+
+            result.orders.append(Order(request.name, request.description, product, granted))
+            product.quantity = available - granted
+
+        if granted < request.quantity:
+            result.partial += 1
+
+    def process(self, requests: Iterable[OrderRequest]) -> BatchResult:
+        """Обрабатывает пачку заявок по порядку"""
+
+        result = BatchResult()
+        started = time.perf_counter()
+        for request in requests:
+            self.place(request, result)
+        result.seconds = time.perf_counter() - started
+        return result
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from src.category import Category
+from src.loader import PRODUCT_TYPES, TYPE_FIELD, build_product, iter_batches, iter_records
+from src.product import ZeroQuantityError, product_key
+
+# Поля, общие для всех классов товаров, стоят в начале Product.fields
+NAME, DESCRIPTION, PRICE, QUANTITY = range(4)
+
+ValidatedRow = Tuple[str, tuple]
+
+
+@dataclass
+class IngestReport:
+    """Итог параллельной загрузки"""
+
+    rows: int = 0
+    inserted: int = 0
+    merged: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def validate_chunk(records: List[Dict], type_field: str = TYPE_FIELD) -> Tuple[List[ValidatedRow], List]:
+    """
+    Выполняется в процессе-воркере: создает товары через конструкторы классов (со всеми проверками)
+    и возвращает их поля в порядке cls.fields вместе с ошибками вида (номер записи в пачке, исключение).
+    """
+
+    rows = []
+    errors = []
+    for position, record in enumerate(records):
+        try:
+            product = build_product(record, type_field)
+        except (ZeroQuantityError, ValueError, TypeError, KeyError) as error:
+            errors.append((position, error))
+            continue
+        product_class = type(product)
+        rows.append((product_class.__name__, tuple(getattr(product, field) for field in product_class.fields)))
+    return rows, errors
+
+
+_CLASSES = {product_class.__name__: product_class for product_class in PRODUCT_TYPES.values()}
+
+
+def merge_rows(category: Category, rows: List[ValidatedRow], report: IngestReport) -> None:
+    """
+    Сливает проверенные строки в категорию в исходном порядке с правилами add_product:
+    дубликаты суммируют остаток, более высокая цена заменяет цену и описание.
+    Новые товары собираются пачкой без повторных проверок и вставляются за один раз.
+    """
+
+    pending: Dict[str, list] = {}
+    for class_name, values in rows:
+        key = product_key(values[NAME])
+        new_values = pending.get(key)
+        if new_values is not None:
+            new_values[QUANTITY] += values[QUANTITY]
+            if values[PRICE] > new_values[PRICE]:
+                new_values[PRICE] = values[PRICE]
+                new_values[DESCRIPTION] = values[DESCRIPTION]
+            report.merged += 1
+            continue
+
+        existing = category.find_product(values[NAME])
+        if existing is not None:
+            existing.merge(values[QUANTITY], values[PRICE], values[DESCRIPTION])
+            report.merged += 1
+        else:
+            new_values = list(values)
+            new_values.append(class_name)
+            pending[key] = new_values
+
+    if not pending:
+        return
+
+    groups: Dict[str, Dict[str, List]] = {}
+    codes = []
+    for new_values in pending.values():
+        product_class = _CLASSES[new_values[-1]]
+        columns = groups.get(product_class.__name__)
+        if columns is None:
+            columns = groups[product_class.__name__] = {field: [] for field in product_class.fields}
+        for field, value in zip(product_class.fields, new_values):
+            columns[field].append(value)
+        codes.append(product_class.__name__)
+
+    built = {
+        class_name: iter(_CLASSES[class_name]._restore_many(columns, len(columns["name"])))
+        for class_name, columns in groups.items()
+    }
+    products = [next(built[class_name]) for class_name in codes]
+
+    rejected = category._insert_many(products, list(pending))
+    for product in rejected:
+        # Ключ успели добавить из другого потока - сливаем, как add_product
+        category.find_product(product.name).merge(product.quantity, product.price, product.description)
+    report.merged += len(rejected)
+    report.inserted += len(products) - len(rejected)
+
+
+def ingest_parallel(
+    source,
+    category: Category,
+    workers: int = 4,
+    chunk_size: int = 5000,
+    type_field: str = TYPE_FIELD,
+    skip_invalid: bool = False,
+) -> IngestReport:
+    """
+    Параллельно проверяет записи фида в пуле процессов и сливает их в категорию в родительском процессе.
+    Результат детерминирован: пачки сливаются строго в порядке фида при любом числе воркеров.
+    В работе одновременно не больше 2 * workers пачек, поэтому память ограничена и для больших фидов.
+    source - путь к файлу (.jsonl, .json, .xlsx) или поток записей.
+    """
+
+    records: Iterable[Dict] = iter_records(source) if isinstance(source, (str, Path)) else source
+    chunks = iter_batches(records, chunk_size)
+    report = IngestReport()
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append((len(chunk), executor.submit(validate_chunk, chunk, type_field)))
+            if len(in_flight) >= 2 * workers:
+                _apply(category, *in_flight.popleft(), skip_invalid, report)
+        while in_flight:
+            _apply(category, *in_flight.popleft(), skip_invalid, report)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _apply(category: Category, size: int, future, skip_invalid: bool, report: IngestReport) -> None:
+    rows, errors = future.result()
+    if errors and not skip_invalid:
+        raise errors[0][1]
+    report.rows += size - len(errors)
+    report.skipped += len(errors)
+    merge_rows(category, rows, report)
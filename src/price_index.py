@@ -0,0 +1,72 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+
+class PriceIndex:
+    """
+    Отсортированный индекс цен товаров.
+    Ключи (цена, порядковый номер) и товары лежат в двух параллельных списках по возрастанию цены:
+    границы ищутся бинарным поиском, выдача k товаров - срез, то есть O(log n + k).
+    Вставка и перенос при смене цены - бинарный поиск плюс сдвиг хвоста списка (memmove),
+    что на практике дешевле сбалансированного дерева на чистом Python.
+    """
+
+    def __init__(self, products: Iterable = ()):
+        self._sequence: Dict = {}
+        entries = []
+        for product in products:
+            sequence = self._sequence[product] = len(self._sequence)
+            entries.append(((product.price, sequence), product))
+        entries.sort(key=lambda entry: entry[0])
+        self._keys = [key for key, _ in entries]
+        self._products = [product for _, product in entries]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _insert(self, key, product) -> None:
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._products.insert(position, product)
+
+    def add(self, product) -> None:
+        if product in self._sequence:
+            return
+        sequence = self._sequence[product] = len(self._sequence)
+        self._insert((product.price, sequence), product)
+
+    def update(self, product, old_price: float, new_price: float) -> None:
+        """Переносит товар на новую цену"""
+
+        sequence = self._sequence.get(product)
+        if sequence is None:
+            return
+        position = bisect_left(self._keys, (old_price, sequence))
+        if position < len(self._keys) and self._products[position] is product:
+            del self._keys[position]
+            del self._products[position]
+        self._insert((new_price, sequence), product)
+
+    def price_range(
+        self, low: float = None, high: float = None, limit: Optional[int] = None, descending: bool = False
+    ) -> List:
+        """Товары с ценой от low до high включительно, отсортированные по цене"""
+
+        start = 0 if low is None else bisect_left(self._keys, (low,))
+        end = len(self._keys) if high is None else bisect_right(self._keys, (high, float("inf")))
+        if limit is not None:
+            if descending:
+                start = max(start, end - limit)
+            else:
+                end = min(end, start + limit)
+
+        products = self._products[start:end]
+        if descending:
+            products.reverse()
+        return products
+
+    def cheapest(self, count: int) -> List:
+        return self.price_range(limit=max(count, 0))
+
+    def most_expensive(self, count: int) -> List:
+        return self.price_range(limit=max(count, 0), descending=True)
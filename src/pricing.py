@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+
+class PriceChangePolicy(ABC):
+    """
+    Политика снижения цены. Вызывается только когда новая цена положительна и ниже текущей:
+    повышение цены принимается всегда, нулевая и отрицательная цена отклоняется всегда.
+    """
+
+    @abstractmethod
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        pass
+
+
+class AcceptAllPolicy(PriceChangePolicy):
+    """Принимает любое снижение цены"""
+
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        return True
+
+
+class RejectDecreasePolicy(PriceChangePolicy):
+    """Отклоняет любое снижение цены (как неподтвержденный запрос)"""
+
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        return False
+
+
+class ThresholdPolicy(PriceChangePolicy):
+    """Принимает снижение цены не больше заданного процента"""
+
+    def __init__(self, max_drop_percent: float):
+        if not 0 <= max_drop_percent <= 100:
+            raise ValueError("Процент снижения должен быть от 0 до 100")
+        self.max_drop_percent = max_drop_percent
+
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        return (old_price - new_price) * 100 <= old_price * self.max_drop_percent
+
+
+class CallbackPolicy(PriceChangePolicy):
+    """Передает решение функции callback(product, old_price, new_price)"""
+
+    def __init__(self, callback: Callable[..., bool]):
+        self.callback = callback
+
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        return bool(self.callback(product, old_price, new_price))
+
+
+class InteractivePolicy(PriceChangePolicy):
+    """Прежнее поведение: запрашивает подтверждение через input(). Только для консольных сценариев"""
+
+    def approve(self, product, old_price: float, new_price: float) -> bool:
+        confirm = input(f"Цена снижается с {old_price} до {new_price}. Подтвердите (y/n): ")
+        return confirm.lower() == "y"
+
+
+@dataclass
+class RepriceReport:
+    """Результат массовой переоценки"""
+
+    applied: int = 0
+    rejected: int = 0
+    missing: List[str] = field(default_factory=list)
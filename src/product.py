@@ -1,5 +1,14 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from itertools import repeat
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List
+
+from src import events, metrics
+from src.money import to_amount, to_kopecks
+from src.pricing import PriceChangePolicy, RejectDecreasePolicy
 
 
 class ZeroQuantityError(Exception):
@@ -7,12 +16,73 @@ class ZeroQuantityError(Exception):
     pass
 
 
+def default_name_normalizer(name: str) -> str:
+    """Правило по умолчанию: без учета регистра и крайних пробелов"""
+
+    return name.strip().lower()
+
+
+_name_normalizer: Callable[[str], str] = default_name_normalizer
+
+
+def set_name_normalizer(normalizer: Callable[[str], str]) -> None:
+    """
+    Задает единое правило нормализации названий товаров.
+    Менять правило нужно до заполнения категорий: уже построенные индексы не пересчитываются.
+    """
+
+    global _name_normalizer
+    _name_normalizer = normalizer
+
+
+def get_name_normalizer() -> Callable[[str], str]:
+    return _name_normalizer
+
+
+def product_key(name: str) -> str:
+    """Возвращает ключ товара, по которому ищутся дубликаты"""
+
+    return _name_normalizer(name)
+
+
+# Полосатые блокировки товаров: вместо замка на каждый объект - фиксированный набор,
+# товар выбирает замок по id. Защищают слияние, смену цены и резервирование остатка.
+_LOCK_STRIPES = tuple(threading.RLock() for _ in range(64))
+
+
+def product_lock(product) -> threading.RLock:
+    """Возвращает замок, защищающий изменения остатка и цены товара"""
+
+    return _LOCK_STRIPES[(id(product) >> 4) % len(_LOCK_STRIPES)]
+
+
+# Замок обновления кортежа наблюдателей (_watch/_unwatch). Под ним не берутся другие замки, поэтому его можно
+# брать и под замком категории, и под замком товара. product_lock здесь не годится: категория подписывается
+# на товар под своим замком, а уведомления идут в обратном порядке (замок товара -> замок категории).
+_watchers_lock = threading.Lock()
+
+
+@contextmanager
+def all_product_locks() -> Iterator[None]:
+    """
+    Захватывает все замки товаров по порядку: пока блок выполняется, ни один товар не меняется.
+    Поток, меняющий товар, держит один замок, поэтому порядок захвата исключает взаимную блокировку.
+    """
+
+    with ExitStack() as stack:
+        for lock in _LOCK_STRIPES:
+            stack.enter_context(lock)
+        yield
+
+
 class ReprMixin:
-    """Миксин для вывода информации о создании объекта"""
+    """Миксин, сообщающий о создании объекта через события ядра (см. src.events)"""
+
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        print(f"{self.__class__.__name__}{self!r}")
+        events.emit("product_created", product=self)
 
     def __repr__(self):
         return f"('{self.name}', '{self.description}', {self._price}, {self.quantity})"
@@ -21,6 +91,8 @@ class ReprMixin:
 class BaseProduct(ABC):
     """Абстрактный класс для всех продуктов"""
 
+    __slots__ = ()
+
     @abstractmethod
     def __str__(self):
         pass
@@ -34,15 +106,131 @@ class BaseProduct(ABC):
 class Product(ReprMixin, BaseProduct):
     """Класс для представления продукта"""
 
+    # Политика снижения цены; можно заменить для класса целиком (см. src.pricing)
+    price_policy: PriceChangePolicy = RejectDecreasePolicy()
+
+    # Слоты вместо __dict__: на миллионах товаров экономит память.
+    # _watchers - кортеж наблюдателей (категории и т.п.), получающих _product_changed(product, field, old, new);
+    # кортеж неизменяем, поэтому один и тот же может разделяться многими товарами
+    # _rendered - кэш str(self), сбрасывается при изменении любого публичного поля
+    __slots__ = ("name", "description", "_price", "quantity", "_watchers", "_rendered")
+
+    # Публичные поля в порядке аргументов конструктора
+    fields = ("name", "description", "price", "quantity")
+
     def __init__(self, name: str, description: str, price: float, quantity: int, *args, **kwargs):
         if quantity == 0:
             raise ZeroQuantityError("Товар с нулевым количеством не может быть добавлен")
-        self.name = name
-        self.description = description
-        self._price = price
-        self.quantity = quantity
+        _set_watchers(self, None)
+        _set_rendered(self, None)
+        _set_name(self, name)
+        _set_description(self, description)
+        _set_price(self, price)
+        _set_quantity(self, quantity)
         super().__init__(*args, **kwargs)
 
+    def __setattr__(self, name, value):
+        """
+        Сбрасывает кэш строки и сообщает наблюдателям об изменении публичных полей (цену - set_price).
+        Служебные поля (с "_") пишутся напрямую; конструкторы обходят метод целиком через дескрипторы слотов.
+        """
+
+        if name[0] == "_" or name == "price":
+            super().__setattr__(name, value)
+            return
+
+        if self._rendered is not None:
+            self._rendered = None
+        if self._watchers is None:
+            super().__setattr__(name, value)
+            return
+
+        # Чтение, запись и уведомление - под замком товара: иначе два потока сообщат одну и ту же разницу
+        with product_lock(self):
+            old_value = getattr(self, name, None)
+            super().__setattr__(name, value)
+            if value != old_value:
+                self._notify(name, old_value, value)
+
+    def __getstate__(self) -> Dict[str, object]:
+        """Состояние для copy и pickle: только поля товара, без наблюдателей и кэша строки"""
+
+        return dict(zip(type(self).fields, self._values()))
+
+    def _values(self) -> tuple:
+        """Значения полей в порядке fields; цена - как хранится. Первые четыре - поля Product"""
+
+        return tuple(getattr(self, "_price" if field == "price" else field) for field in type(self).fields)
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        # Слоты пишутся в обход __setattr__: у пустого объекта еще нет _watchers и _rendered
+        _set_watchers(self, None)
+        _set_rendered(self, None)
+        for field, value in state.items():
+            object.__setattr__(self, "_price" if field == "price" else field, value)
+
+    def _notify(self, field: str, old_value, new_value) -> None:
+        for watcher in self._watchers:
+            watcher._product_changed(self, field, old_value, new_value)
+        if events.has_handlers():
+            events.emit(
+                "product_changed", product=self.name, item=self, field=field, old_value=old_value, new_value=new_value
+            )
+
+    def _notify_many(self, changes: List[tuple]) -> None:
+        """
+        Сообщает о нескольких изменениях [(поле, было, стало)] одним шагом.
+        Наблюдатель с методом _product_changes получает их разом (категория применяет их под одним замком),
+        остальные - по одному через _product_changed.
+        """
+
+        for watcher in self._watchers or ():
+            apply_changes = getattr(watcher, "_product_changes", None)
+            if apply_changes is not None:
+                apply_changes(self, changes)
+            else:
+                for field, old_value, new_value in changes:
+                    watcher._product_changed(self, field, old_value, new_value)
+        if events.has_handlers():
+            for field, old_value, new_value in changes:
+                events.emit(
+                    "product_changed",
+                    product=self.name,
+                    item=self,
+                    field=field,
+                    old_value=old_value,
+                    new_value=new_value,
+                )
+
+    def _watch(self, watcher) -> None:
+        """Подписывает наблюдателя на изменения товара"""
+
+        with _watchers_lock:
+            if self._watchers is None:
+                _set_watchers(self, (watcher,))
+            elif watcher not in self._watchers:
+                _set_watchers(self, self._watchers + (watcher,))
+
+    def _unwatch(self, watcher) -> None:
+        with _watchers_lock:
+            if self._watchers and watcher in self._watchers:
+                _set_watchers(self, tuple(other for other in self._watchers if other is not watcher) or None)
+
+    def render(self) -> str:
+        """Возвращает str(self) из кэша; строка пересобирается только после изменения товара"""
+
+        rendered = self._rendered
+        if rendered is None:
+            if metrics.enabled:
+                started = perf_counter()
+                rendered = self._rendered = str(self)
+                metrics.observe("render", perf_counter() - started)
+            else:
+                rendered = self._rendered = str(self)
+        elif metrics.enabled:
+            metrics.increment("render_cache_hits")
+        return rendered
+
     def __str__(self):
         """Строковое представление для пользователя: Название, Цена и Остаток"""
 
@@ -57,7 +245,8 @@ class Product(ReprMixin, BaseProduct):
         if type(self) is not type(other):
             raise TypeError("Можно складывать только товары из одинаковых классов")
 
-        return (self._price * self.quantity) + (other.price * other.quantity)
+        total = to_kopecks(self._price) * self.quantity + to_kopecks(other.price) * other.quantity
+        return to_amount(total, self._price, other.price)
 
     @property
     def price(self):
@@ -65,39 +254,120 @@ class Product(ReprMixin, BaseProduct):
 
     @price.setter
     def price(self, new_price):
-        if new_price <= 0:
-            print("Цена не должна быть нулевая или отрицательная")
-        elif new_price < self._price:
-            confirm = input(f"Цена снижается с {self._price} до {new_price}. Подтвердите (y/n): ")
-            if confirm.lower() == "y":
+        self.set_price(new_price)
+
+    def set_price(self, new_price: float, policy: PriceChangePolicy = None) -> bool:
+        """Меняет цену; снижение проходит через политику. Возвращает True, если цена изменена"""
+
+        started = perf_counter() if metrics.enabled else None
+        try:
+            if new_price <= 0:
+                events.emit("price_rejected", product=self.name, price=new_price, reason="non_positive")
+                return False
+
+            with product_lock(self):
+                old_price = self._price
+                if new_price < old_price and not (policy or self.price_policy).approve(self, old_price, new_price):
+                    events.emit("price_rejected", product=self.name, price=new_price, reason="policy")
+                    return False
+
                 self._price = new_price
-        else:
-            self._price = new_price
+                if new_price != old_price:
+                    self._rendered = None
+                    if self._watchers is not None:
+                        self._notify("price", old_price, new_price)
+                    events.emit("price_changed", product=self.name, old_price=old_price, new_price=new_price)
+            return True
+        finally:
+            if started is not None:
+                metrics.observe("set_price", perf_counter() - started)
+
+    def merge(self, quantity: int, price: float, description: str) -> None:
+        """Объединяет дубликат с товаром: суммирует остаток, при более высокой цене обновляет цену и описание"""
+
+        # Поля пишутся напрямую и объявляются одним уведомлением: срез категории (snapshot)
+        # не может попасть между новым остатком и новой ценой
+        with product_lock(self):
+            old_price = self._price
+            changes = [("quantity", self.quantity, self.quantity + quantity)]
+            _set_quantity(self, self.quantity + quantity)
+            if price > old_price:
+                _set_price(self, price)
+                changes.append(("price", old_price, price))
+                if description != self.description:
+                    changes.append(("description", self.description, description))
+                    _set_description(self, description)
+            _set_rendered(self, None)
+            if self._watchers is not None:
+                self._notify_many(changes)
+            if price > old_price:
+                events.emit("price_changed", product=self.name, old_price=old_price, new_price=price)
+
+    @classmethod
+    def _restore_many(cls, columns: Dict[str, List], count: int) -> List["Product"]:
+        """
+        Быстро восстанавливает count товаров из колонок {поле: значения} без конструктора:
+        без проверок, событий и уведомлений. Только для заранее проверенных данных (снимки, пайплайны).
+        """
+
+        # map с дескрипторами слотов работает на уровне C, без байт-кода на каждое присваивание
+        products = list(map(object.__new__, repeat(cls, count)))
+        for slot in ("_watchers", "_rendered"):
+            deque(map(getattr(Product, slot).__set__, products, repeat(None)), maxlen=0)
+        for field in cls.fields:
+            storage = "_price" if field == "price" else field
+            deque(map(getattr(cls, storage).__set__, products, columns[field]), maxlen=0)
+        return products
 
     @classmethod
     def new_product(cls, product_data: Dict, existing_products: List = None):
-        """Создает новый продукт или обновляет существующий"""
+        """
+        Создает новый продукт или обновляет существующий.
+        existing_products может быть списком товаров или категорией (поиск по индексу за O(1)).
+        """
 
+        started = perf_counter() if metrics.enabled else None
         name = product_data["name"]
-        description = product_data["description"]
-        price = product_data["price"]
-        quantity = product_data["quantity"]
 
+        product = None
         if existing_products:
-            for product in existing_products:
-                if product.name.lower() == name.lower():
-                    product.quantity += quantity
-                    if price > product.price:
-                        product.price = price
-                        product.description = description
-                    return product
+            product = _find_existing(name, existing_products)
+            if product:
+                product.merge(product_data["quantity"], product_data["price"], product_data["description"])
+
+        if not product:
+            product = cls(**product_data)
+
+        if started is not None:
+            metrics.observe("new_product", perf_counter() - started)
+        return product
+
 
-        return cls(**product_data)
+# Дескрипторы слотов: конструкторы пишут поля напрямую, в обход __setattr__ -
+# у нового товара нет ни кэша строки, ни наблюдателей
+_set_name, _set_description, _set_price, _set_quantity, _set_watchers, _set_rendered = (
+    getattr(Product, slot).__set__ for slot in Product.__slots__
+)
+
+
+def _find_existing(name: str, existing_products):
+    """Ищет товар с тем же ключом среди существующих"""
+
+    find_product = getattr(existing_products, "find_product", None)
+    if find_product is not None:
+        return find_product(name)
+
+    key = product_key(name)
+    return next((product for product in existing_products if product_key(product.name) == key), None)
 
 
 class Smartphone(Product):
     """Класс для смартфонов - наследуется от Product"""
 
+    __slots__ = ("efficiency", "model", "memory", "color")
+
+    fields = Product.fields + ("efficiency", "model", "memory", "color")
+
     def __init__(
         self,
         name: str,
@@ -111,10 +381,10 @@ class Smartphone(Product):
     ):
         super().__init__(name, description, price, quantity)
 
-        self.efficiency = efficiency
-        self.model = model
-        self.memory = memory
-        self.color = color
+        _set_efficiency(self, efficiency)
+        _set_model(self, model)
+        _set_memory(self, memory)
+        _set_smartphone_color(self, color)
 
     def __str__(self):
         """Строковое представление смартфона"""
@@ -126,9 +396,18 @@ class Smartphone(Product):
         )
 
 
+_set_efficiency, _set_model, _set_memory, _set_smartphone_color = (
+    getattr(Smartphone, slot).__set__ for slot in Smartphone.__slots__
+)
+
+
 class LawnGrass(Product):
     """Класс для газонной травы - наследуется от Product"""
 
+    __slots__ = ("country", "germination_period", "color")
+
+    fields = Product.fields + ("country", "germination_period", "color")
+
     def __init__(
         self,
         name: str,
@@ -141,9 +420,9 @@ class LawnGrass(Product):
     ):
         super().__init__(name, description, price, quantity)
 
-        self.country = country
-        self.germination_period = germination_period
-        self.color = color
+        _set_country(self, country)
+        _set_germination_period(self, germination_period)
+        _set_grass_color(self, color)
 
     def __str__(self):
         """Строковое представление для газонной травы"""
@@ -153,3 +432,8 @@ class LawnGrass(Product):
             f"Страна: {self.country}, Прорастание: {self.germination_period}. "
             f"Остаток: {self.quantity} шт."
         )
+
+
+_set_country, _set_germination_period, _set_grass_color = (
+    getattr(LawnGrass, slot).__set__ for slot in LawnGrass.__slots__
+)
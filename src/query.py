@@ -0,0 +1,129 @@
+import heapq
+import operator
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+# Суффиксы условий where: memory__gte=256, price__lt=1000, color__in=("черный", "белый")
+OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda value, options: value in options,
+    "contains": lambda value, part: part in value,
+}
+
+
+def _condition(lookup: str, expected) -> Callable:
+    field, _, suffix = lookup.partition("__")
+    compare = OPERATORS.get(suffix or "eq")
+    if compare is None:
+        raise ValueError(f"Неизвестное условие: {lookup}")
+
+    def check(product) -> bool:
+        value = getattr(product, field, _MISSING)
+        # Товар без такого поля (например, трава при фильтре по памяти) не подходит
+        return value is not _MISSING and compare(value, expected)
+
+    return check
+
+
+class Query:
+    """
+    Ленивый запрос по товарам: where/order_by/limit собираются в цепочку
+    и выполняются только при обходе. Без order_by результаты идут потоком
+    и обход останавливается, как только набран limit.
+    order_by с последующим limit выбирает первые n через кучу, не сортируя все.
+    """
+
+    def __init__(self, source: Iterable, steps: Tuple = ()):
+        self._source = source
+        self._steps = steps
+
+    def _with(self, step) -> "Query":
+        return Query(self._source, self._steps + (step,))
+
+    def where(self, predicate: Callable = None, **conditions) -> "Query":
+        """Оставляет товары, для которых predicate(product) истинно и выполнены все условия"""
+
+        checks = [_condition(lookup, expected) for lookup, expected in conditions.items()]
+        if predicate is not None:
+            checks.insert(0, predicate)
+        if not checks:
+            return self
+        if len(checks) == 1:
+            return self._with(("where", checks[0]))
+        return self._with(("where", lambda product: all(check(product) for check in checks)))
+
+    filter = where
+
+    def order_by(self, *fields: str) -> "Query":
+        """Сортирует по полям; "-price" - по убыванию"""
+
+        if not fields:
+            raise ValueError("Нужно указать хотя бы одно поле сортировки")
+        return self._with(("order_by", fields))
+
+    def limit(self, count: int, offset: int = 0) -> "Query":
+        if count < 0 or offset < 0:
+            raise ValueError("limit и offset не могут быть отрицательными")
+        return self._with(("limit", (offset, count)))
+
+    def __iter__(self) -> Iterator:
+        items = iter(self._source)
+        steps = self._steps
+        position = 0
+        while position < len(steps):
+            kind, argument = steps[position]
+            if kind == "where":
+                items = filter(argument, items)
+            elif kind == "limit":
+                offset, count = argument
+                items = islice(items, offset, offset + count)
+            else:
+                following = steps[position + 1] if position + 1 < len(steps) else None
+                if following is not None and following[0] == "limit":
+                    offset, count = following[1]
+                    items = iter(_top(items, argument, offset + count)[offset:])
+                    position += 1
+                else:
+                    items = iter(_sorted(items, argument))
+            position += 1
+        return items
+
+    def first(self) -> Optional[object]:
+        """Первый подходящий товар или None"""
+
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_list(self) -> List:
+        return list(self)
+
+    def render(self) -> List[str]:
+        """Строки найденных товаров (из кэша отрисовки)"""
+
+        return [product.render() for product in self]
+
+
+def _sorted(items: Iterable, fields: Tuple[str, ...]) -> List:
+    # Стабильная сортировка по полям с конца: так смешиваются возрастание и убывание
+    result = list(items)
+    for field in reversed(fields):
+        descending = field.startswith("-")
+        result.sort(key=operator.attrgetter(field.lstrip("-")), reverse=descending)
+    return result
+
+
+def _top(items: Iterable, fields: Tuple[str, ...], count: int) -> List:
+    if len(fields) > 1 or not count:
+        return _sorted(items, fields)[:count]
+    field = fields[0]
+    select = heapq.nlargest if field.startswith("-") else heapq.nsmallest
+    return select(count, items, key=operator.attrgetter(field.lstrip("-")))
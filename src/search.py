@@ -0,0 +1,151 @@
+import heapq
+import re
+from bisect import bisect_left
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+TEXT_FIELDS = ("name", "description")
+
+# Атрибуты наследников Product, по которым строятся точные индексы
+ATTRIBUTE_FIELDS = ("memory", "color", "model", "country", "germination_period")
+
+# Если под самый узкий фильтр попадает больше 1/DENSE_RATIO товаров, результат с limit
+# быстрее набрать обходом индекса по порядку добавления, чем пересечением множеств
+DENSE_RATIO = 4
+
+
+def tokenize(text) -> Set[str]:
+    """Разбивает текст на слова в нижнем регистре"""
+
+    return set(TOKEN_PATTERN.findall(str(text).lower())) if text else set()
+
+
+def _attribute_key(value):
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+class SearchIndex:
+    """
+    Полнотекстовый индекс по названию и описанию товаров плюс точные индексы атрибутов.
+    Словарь слов для префиксного поиска хранится отсортированным и пересобирается
+    лениво, только если с прошлого запроса появились новые слова.
+    """
+
+    def __init__(self, products: Iterable = ()):
+        self._postings: Dict[str, Set] = {}
+        self._attributes: Dict[str, Dict[object, Set]] = {field: {} for field in ATTRIBUTE_FIELDS}
+        self._order: Dict = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        for product in products:
+            self.add(product)
+
+    def __len__(self):
+        return len(self._order)
+
+    def add(self, product) -> None:
+        """Добавляет товар в индекс"""
+
+        if product in self._order:
+            return
+        self._order[product] = len(self._order)
+        for field in TEXT_FIELDS:
+            self._add_tokens(product, tokenize(getattr(product, field, "")))
+        for field in ATTRIBUTE_FIELDS:
+            value = getattr(product, field, None)
+            if value is not None:
+                self._attributes[field].setdefault(_attribute_key(value), set()).add(product)
+
+    def update(self, product, field: str, old_value, new_value) -> None:
+        """Переиндексирует поле товара после изменения"""
+
+        if product not in self._order:
+            return
+        if field in TEXT_FIELDS:
+            other_tokens = set()
+            for other_field in TEXT_FIELDS:
+                if other_field != field:
+                    other_tokens |= tokenize(getattr(product, other_field, ""))
+            self._remove_tokens(product, tokenize(old_value) - other_tokens)
+            self._add_tokens(product, tokenize(new_value))
+        elif field in ATTRIBUTE_FIELDS:
+            index = self._attributes[field]
+            if old_value is not None:
+                products = index.get(_attribute_key(old_value))
+                if products is not None:
+                    products.discard(product)
+                    if not products:
+                        del index[_attribute_key(old_value)]
+            if new_value is not None:
+                index.setdefault(_attribute_key(new_value), set()).add(product)
+
+    def _add_tokens(self, product, tokens: Set[str]) -> None:
+        for token in tokens:
+            products = self._postings.get(token)
+            if products is None:
+                products = self._postings[token] = set()
+                self._vocabulary_dirty = True
+            products.add(product)
+
+    def _remove_tokens(self, product, tokens: Set[str]) -> None:
+        for token in tokens:
+            products = self._postings.get(token)
+            if products is not None:
+                products.discard(product)
+                if not products:
+                    del self._postings[token]
+                    self._vocabulary_dirty = True
+
+    def _prefix_matches(self, prefix: str) -> Set:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+
+        start = end = bisect_left(self._vocabulary, prefix)
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(prefix):
+            end += 1
+        if end - start == 1:
+            # Единственное слово - его множество отдается без копии, search его не изменяет
+            return self._postings[self._vocabulary[start]]
+        return set().union(*(self._postings[word] for word in self._vocabulary[start:end]))
+
+    def search(self, query: str = "", prefix: bool = False, limit: Optional[int] = None, **filters) -> List:
+        """
+        Ищет товары, в названии или описании которых есть все слова запроса.
+        prefix=True сопоставляет последнее слово как начало слова (поиск по мере набора).
+        filters - точные значения атрибутов, например memory=256, color="черный".
+        Результат упорядочен по времени добавления товара в индекс.
+        """
+
+        for field in filters:
+            if field not in self._attributes:
+                raise ValueError(f"Нет индекса по атрибуту: {field}")
+
+        words = TOKEN_PATTERN.findall(query.lower())
+        candidate_sets = []
+        for position, word in enumerate(words):
+            if prefix and position == len(words) - 1:
+                candidate_sets.append(self._prefix_matches(word))
+            else:
+                candidate_sets.append(self._postings.get(word, set()))
+        for field, value in filters.items():
+            candidate_sets.append(self._attributes[field].get(_attribute_key(value), set()))
+
+        if not candidate_sets:
+            return list(self._order) if limit is None else list(islice(self._order, max(limit, 0)))
+
+        candidate_sets.sort(key=len)
+        if limit is not None and len(candidate_sets[0]) * DENSE_RATIO > len(self._order):
+            matches = (product for product in self._order if all(product in found for found in candidate_sets))
+            return list(islice(matches, max(limit, 0)))
+
+        results = set(candidate_sets[0])
+        for candidates in candidate_sets[1:]:
+            if not results:
+                break
+            results &= candidates
+        if limit is None:
+            return sorted(results, key=self._order.__getitem__)
+        return heapq.nsmallest(limit, results, key=self._order.__getitem__)
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.category import Category, Order
+from src.orders import BatchResult, OrderEngine, OrderRequest
+from src.product import Product
+
+
+class CatalogService:
+    """
+    Асинхронный фасад над категориями и заказами для бота или веб-сервиса.
+    Изменяющие вызовы (add_product, place_order) ставятся в очередь и выполняются пачками
+    одной фоновой задачей: тысячи одновременных клиентов не дерутся за данные,
+    а цикл событий отдает управление между пачками. Чтения отвечают сразу из O(1) итогов и индексов.
+
+    Использование:
+        async with CatalogService([category]) as service:
+            await service.add_product("Смартфоны", product)
+    """
+
+    def __init__(
+        self,
+        categories: Iterable[Category] = (),
+        batch_size: int = 256,
+        order_engine: Optional[OrderEngine] = None,
+    ):
+        self.categories: Dict[str, Category] = {category.name: category for category in categories}
+        self.batch_size = batch_size
+        self.order_engine = order_engine or OrderEngine()
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "CatalogService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Дожидается выполнения поставленных запросов и останавливает фоновую задачу"""
+
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def add_category(self, category: Category) -> None:
+        self.categories[category.name] = category
+
+    def _category(self, name: str) -> Category:
+        category = self.categories.get(name)
+        if category is None:
+            raise KeyError(f"Категория не найдена: {name}")
+        return category
+
+    async def _submit(self, call: Callable):
+        if self._worker is None:
+            raise RuntimeError("Сервис не запущен: используйте async with или start()")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((call, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            for call, future in batch:
+                if future.cancelled():
+                    continue
+                try:
+                    future.set_result(call())
+                except Exception as error:
+                    future.set_exception(error)
+            self.batches += 1
+            for _ in batch:
+                self._queue.task_done()
+            await asyncio.sleep(0)
+
+    async def add_product(self, category_name: str, product: Product) -> None:
+        """Добавляет товар в категорию (с обычным слиянием дубликатов)"""
+
+        category = self._category(category_name)
+        await self._submit(lambda: category.add_product(product))
+
+    async def place_order(
+        self, category_name: str, product_name: str, quantity: int, order_name: str = "Заказ"
+    ) -> Optional[Order]:
+        """Резервирует товар и создает заказ. Возвращает None, если остатка не хватило"""
+
+        category = self._category(category_name)
+
+        def place() -> Optional[Order]:
+            product = category.find_product(product_name)
+            if product is None:
+                raise KeyError(f"Товар не найден: {product_name}")
+            result = BatchResult()
+            self.order_engine.place(OrderRequest(order_name, product, quantity), result)
+            return result.orders[0] if result.orders else None
+
+        return await self._submit(place)
+
+    async def get_category_summary(self, category_name: str) -> Dict:
+        """Сводка по категории за O(1)"""
+
+        category = self._category(category_name)
+        return {
+            "name": category.name,
+            "description": category.description,
+            "products": len(category),
+            "total_quantity": category.total_quantity,
+            "total_value": category.total_value,
+            "average_price": category.get_average_price(),
+        }
+
+    async def search(
+        self, category_name: str, query: str = "", prefix: bool = False, limit: int = 20, **filters
+    ) -> List[str]:
+        """Поиск по категории; возвращает строки товаров"""
+
+        category = self._category(category_name)
+        return [product.render() for product in category.search(query, prefix=prefix, limit=limit, **filters)]
@@ -0,0 +1,135 @@
+import gc
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterable, List
+
+from src.category import Category
+from src.product import LawnGrass, Product, Smartphone, get_name_normalizer, product_key
+
+# Формат 03: заголовок, CRC32 нагрузки и нагрузка в JSON (UTF-8). В отличие от pickle и marshal
+# формат не зависит от версии Python, а чтение не исполняет код и не доверяет структуре данных
+MAGIC = b"CCSNAP03"
+CHECKSUM = struct.Struct("<I")
+
+SNAPSHOT_CLASSES = {cls.__name__: cls for cls in (Product, Smartphone, LawnGrass)}
+
+
+def _normalizer_tag() -> str:
+    """Имя правила нормализации: ключи из снимка годятся, только если правило не поменялось"""
+
+    normalizer = get_name_normalizer()
+    return f"{normalizer.__module__}.{normalizer.__qualname__}"
+
+
+def _dump_category(category: Category) -> Dict:
+    """Раскладывает товары категории по колонкам отдельно для каждого класса"""
+
+    class_names: List[str] = []
+    class_codes: Dict[type, int] = {}
+    codes: List[int] = []
+    keys: List[str] = []
+    columns: List[Dict[str, List]] = []
+
+    for product in category._product_list():
+        keys.append(product_key(product.name))
+        product_class = type(product)
+        code = class_codes.get(product_class)
+        if code is None:
+            if SNAPSHOT_CLASSES.get(product_class.__name__) is not product_class:
+                raise ValueError(f"Класс {product_class.__name__} не поддерживается снимком")
+            code = class_codes[product_class] = len(class_names)
+            class_names.append(product_class.__name__)
+            columns.append({field: [] for field in product_class.fields})
+        codes.append(code)
+        for field, column in columns[code].items():
+            column.append(product.price if field == "price" else getattr(product, field))
+
+    return {
+        "name": category.name,
+        "description": category.description,
+        "classes": class_names,
+        "codes": codes,
+        "keys": keys,
+        "columns": columns,
+    }
+
+
+def _load_category(data: Dict, reuse_keys: bool) -> Category:
+    codes = data["codes"]
+    classes = [SNAPSHOT_CLASSES[class_name] for class_name in data["classes"]]
+    counts = [codes.count(code) for code in range(len(classes))]
+    # Коды вне диапазона не попадут ни в один счетчик, короткая колонка оставила бы товар без поля
+    if len(data["columns"]) != len(classes) or len(data["keys"]) != len(codes) or sum(counts) != len(codes):
+        raise ValueError("Снимок каталога поврежден")
+
+    groups = []
+    for cls, columns, count in zip(classes, data["columns"], counts):
+        if any(len(columns[field]) != count for field in cls.fields):
+            raise ValueError("Снимок каталога поврежден")
+        groups.append(iter(cls._restore_many(columns, count)))
+
+    products = [next(groups[code]) for code in codes]
+    return Category._restore(data["name"], data["description"], products, data["keys"] if reuse_keys else None)
+
+
+def save_snapshot(path, categories: Iterable[Category]) -> None:
+    """
+    Сохраняет категории в компактный бинарный снимок: заголовок и колонки значений по классам товаров.
+    Счетчики category_count и product_count сохраняются вместе с данными.
+    Файл пишется во временный и подменяется атомарно.
+    """
+
+    payload = {
+        "category_count": Category.category_count,
+        "product_count": Category.product_count,
+        "normalizer": _normalizer_tag(),
+        "categories": [_dump_category(category) for category in categories],
+    }
+    try:
+        data = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    except (TypeError, ValueError):
+        raise ValueError("Поля товаров в снимке могут быть только строками, конечными числами или None") from None
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(CHECKSUM.pack(zlib.crc32(data)))
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path, restore_counters: bool = True) -> List[Category]:
+    """
+    Загружает категории из снимка. Контрольная сумма и структура нагрузки проверяются до сборки товаров;
+    товары собираются без конструкторов и проверок (данные проверялись при создании снимка).
+    """
+
+    with open(path, "rb") as file:
+        header = file.read(len(MAGIC) + CHECKSUM.size)
+        data = file.read()
+    if header[: len(MAGIC)] != MAGIC:
+        raise ValueError("Файл не является снимком каталога")
+    if len(header) != len(MAGIC) + CHECKSUM.size or CHECKSUM.unpack_from(header, len(MAGIC))[0] != zlib.crc32(data):
+        raise ValueError("Снимок каталога поврежден")
+
+    # Сборщик мусора на время загрузки отключается: циклов здесь нет,
+    # а его проходы по миллионам новых объектов занимают больше времени, чем сама загрузка
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        payload = json.loads(data)
+        reuse_keys = payload["normalizer"] == _normalizer_tag()
+        categories = [_load_category(category, reuse_keys) for category in payload["categories"]]
+        category_count, product_count = int(payload["category_count"]), int(payload["product_count"])
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError, StopIteration):
+        raise ValueError("Снимок каталога поврежден") from None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if restore_counters:
+        Category.category_count = category_count
+        Category.product_count = product_count
+    return categories
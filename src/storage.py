@@ -0,0 +1,388 @@
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.category import Category, Order
+from src.money import to_kopecks
+from src.product import LawnGrass, Product, Smartphone, product_key
+
+STORAGE_CLASSES = {cls.__name__: cls for cls in (Product, Smartphone, LawnGrass)}
+
+# Все поля всех классов товаров: у таблицы по колонке на поле, лишние у класса остаются NULL
+FIELDS: Tuple[str, ...] = tuple(
+    dict.fromkeys(field for product_class in STORAGE_CLASSES.values() for field in product_class.fields)
+)
+
+# У колонки price нет объявленного типа: SQLite хранит значение как есть, и целая цена 100
+# возвращается int, а не 100.0 (строки товаров после загрузки не меняются)
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    key TEXT NOT NULL,
+    type TEXT NOT NULL,
+    price_kopecks INTEGER NOT NULL,
+    {", ".join(FIELDS)},
+    UNIQUE (category_id, key)
+);
+CREATE INDEX IF NOT EXISTS products_name ON products (name);
+CREATE INDEX IF NOT EXISTS products_price ON products (category_id, price_kopecks);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_kopecks INTEGER NOT NULL
+);
+"""
+
+UPSERT_PRODUCT = (
+    f"INSERT INTO products (category_id, key, type, price_kopecks, {', '.join(FIELDS)}) "
+    f"VALUES ({', '.join('?' * (len(FIELDS) + 4))}) "
+    f"ON CONFLICT (category_id, key) DO UPDATE SET type = excluded.type, price_kopecks = excluded.price_kopecks, "
+    + ", ".join(f"{field} = excluded.{field}" for field in FIELDS)
+)
+
+SELECT_PRODUCTS = f"SELECT type, key, {', '.join(FIELDS)} FROM products"
+
+
+class ConnectionPool:
+    """
+    Пул соединений SQLite для потоков одного процесса. Соединения создаются по требованию
+    (не больше size), база работает в режиме WAL: читатели не ждут писателя.
+    sqlite3 кэширует подготовленные запросы в каждом соединении, поэтому постоянные
+    тексты запросов компилируются один раз на соединение.
+    """
+
+    def __init__(self, path, size: int = 4, timeout: float = 30.0):
+        self.path = str(path)
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        # Большой кэш страниц: вставки в индексы по названию и цене реже идут на диск
+        connection.execute("PRAGMA cache_size = -65536")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Выдает соединение из пула на время блока with"""
+
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                connection = self._connect()
+                with self._lock:
+                    self._all.append(connection)
+            else:
+                connection = self._idle.get(timeout=self.timeout)
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._all:
+                connection.close()
+            self._all.clear()
+            self._created = 0
+            self._idle = queue.LifoQueue()
+
+
+class CatalogStore:
+    """
+    Хранилище категорий, товаров и заказов в SQLite.
+    Записи идут пачками в одной транзакции, поиск товара по названию идет через кэш
+    в памяти процесса (LRU): повторные обращения не трогают диск.
+    Кэш знает только о записях через этот объект; после записи из другого процесса вызовите invalidate().
+    """
+
+    def __init__(self, path, pool_size: int = 4, cache_size: int = 100_000, batch_size: int = 10_000):
+        self.pool = ConnectionPool(path, pool_size)
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._cache: "OrderedDict[Tuple[str, str], Product]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        with self.pool.connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def __enter__(self) -> "CatalogStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _category_id(self, connection: sqlite3.Connection, category: Category) -> int:
+        connection.execute(
+            "INSERT INTO categories (name, description) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET description = excluded.description",
+            (category.name, category.description),
+        )
+        return connection.execute("SELECT id FROM categories WHERE name = ?", (category.name,)).fetchone()[0]
+
+    def save_category(self, category: Category) -> int:
+        """Записывает категорию со всеми товарами (вставка или обновление). Возвращает число товаров"""
+
+        return self.save_products(category, category._product_list())
+
+    def save_products(self, category: Category, products: Iterable[Product], removed_keys: Iterable[str] = ()) -> int:
+        """
+        Записывает товары категории пачками по batch_size в одной транзакции.
+        removed_keys - ключи товаров, которых в категории больше нет (после переименования):
+        их строки удаляются в той же транзакции до записи товаров.
+        """
+
+        products = list(products)
+        removed_keys = list(removed_keys)
+        for product in products:
+            if STORAGE_CLASSES.get(type(product).__name__) is not type(product):
+                raise ValueError(f"Класс {type(product).__name__} не поддерживается хранилищем")
+
+        with self.pool.connection() as connection:
+            with connection:
+                category_id = self._category_id(connection, category)
+                if removed_keys:
+                    connection.executemany(
+                        "DELETE FROM products WHERE category_id = ? AND key = ?",
+                        ((category_id, key) for key in removed_keys),
+                    )
+                for start in range(0, len(products), self.batch_size):
+                    batch = products[start : start + self.batch_size]
+                    connection.executemany(UPSERT_PRODUCT, (_product_row(category_id, product) for product in batch))
+
+        with self._cache_lock:
+            if self._cache:
+                for key in removed_keys:
+                    self._cache.pop((category.name, key), None)
+                for product in products:
+                    cache_key = (category.name, product_key(product.name))
+                    if cache_key in self._cache:
+                        self._cache[cache_key] = product
+        return len(products)
+
+    def save_orders(self, orders: Iterable[Order]) -> int:
+        """Записывает заказы одной транзакцией. Возвращает число заказов"""
+
+        rows = [
+            (
+                order.name,
+                order.description,
+                product_key(order.product.name),
+                order.product.name,
+                order.quantity,
+                order.total_kopecks,
+            )
+            for order in orders
+        ]
+        with self.pool.connection() as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO orders (name, description, product_key, product_name, quantity, total_kopecks) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def orders(self, product_name: str = None) -> List[Tuple]:
+        """Записи заказов (name, description, product_name, quantity, total_kopecks), опционально по товару"""
+
+        query = "SELECT name, description, product_name, quantity, total_kopecks FROM orders"
+        parameters: tuple = ()
+        if product_name is not None:
+            query += " WHERE product_key = ?"
+            parameters = (product_key(product_name),)
+        with self.pool.connection() as connection:
+            return connection.execute(query + " ORDER BY id", parameters).fetchall()
+
+    def category_names(self) -> List[str]:
+        with self.pool.connection() as connection:
+            return [name for (name,) in connection.execute("SELECT name FROM categories ORDER BY id")]
+
+    def load_category(self, name: str) -> Category:
+        """
+        Поднимает категорию из базы в порядке добавления товаров.
+        Товары собираются без конструкторов и проверок, как из снимка; счетчики классов не меняются.
+        """
+
+        with self.pool.connection() as connection:
+            row = connection.execute("SELECT id, description FROM categories WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                raise KeyError(f"Категория не найдена: {name}")
+            category_id, description = row
+            rows = connection.execute(
+                SELECT_PRODUCTS + " WHERE category_id = ? ORDER BY id", (category_id,)
+            ).fetchall()
+
+        keys = [row[1] for row in rows]
+        return Category._restore(name, description, _restore_products(rows), keys)
+
+    def find_product(self, category_name: str, name: str) -> Optional[Product]:
+        """Товар категории по названию: сначала кэш, при промахе - запрос по индексу"""
+
+        cache_key = (category_name, product_key(name))
+        with self._cache_lock:
+            product = self._cache.get(cache_key)
+            if product is not None:
+                self._cache.move_to_end(cache_key)
+                return product
+
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                SELECT_PRODUCTS + " WHERE category_id = (SELECT id FROM categories WHERE name = ?) AND key = ?",
+                cache_key,
+            ).fetchone()
+        if row is None:
+            return None
+
+        (product,) = _restore_products([row])
+        with self._cache_lock:
+            product = self._cache.setdefault(cache_key, product)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return product
+
+    def products_by_price(
+        self, category_name: str, low: float = None, high: float = None, limit: int = None
+    ) -> List[Product]:
+        """Товары категории в диапазоне цен [low, high] по возрастанию цены, через индекс по цене"""
+
+        query = SELECT_PRODUCTS + " WHERE category_id = (SELECT id FROM categories WHERE name = ?)"
+        parameters: list = [category_name]
+        if low is not None:
+            query += " AND price_kopecks >= ?"
+            parameters.append(to_kopecks(low))
+        if high is not None:
+            query += " AND price_kopecks <= ?"
+            parameters.append(to_kopecks(high))
+        query += " ORDER BY price_kopecks, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        with self.pool.connection() as connection:
+            return _restore_products(connection.execute(query, parameters).fetchall())
+
+    def invalidate(self) -> None:
+        """Очищает кэш чтения"""
+
+        with self._cache_lock:
+            self._cache.clear()
+
+    def mirror(self, category: Category) -> "CategoryMirror":
+        """Сохраняет категорию и начинает отслеживать ее изменения (см. CategoryMirror)"""
+
+        return CategoryMirror(self, category)
+
+
+class CategoryMirror:
+    """
+    Зеркало категории в хранилище: запоминает измененные, новые и переименованные товары
+    и записывает их одной транзакцией в flush().
+    Новые товары и старые ключи переименованных узнает как слушатель категории
+    (любой путь вставки, включая массовый), изменения - как наблюдатель товаров.
+    """
+
+    def __init__(self, store: CatalogStore, category: Category):
+        self.store = store
+        self.category = category
+        self._dirty: Dict[Product, None] = {}
+        self._removed: Dict[str, None] = {}
+        self._lock = threading.Lock()
+        # Сначала подписка, потом запись: изменение между ними попадет в _dirty и не потеряется
+        self._attached = False
+        category._listen(self)
+        self._attached = True
+        store.save_category(category)
+
+    def _category_changed(self, category: Category, added_keys, removed_keys) -> None:
+        """Вызывается категорией под ее замком; первый вызов (все текущие ключи) только подписывает на товары"""
+
+        if removed_keys:
+            with self._lock:
+                self._removed.update(dict.fromkeys(removed_keys))
+        for key in added_keys:
+            product = category._product_by_key(key)
+            if product is None:
+                continue
+            product._watch(self)
+            if self._attached:
+                with self._lock:
+                    self._dirty[product] = None
+
+    def _product_changed(self, product: Product, field: str, old_value, new_value) -> None:
+        with self._lock:
+            self._dirty[product] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty) + len(self._removed)
+
+    def flush(self) -> int:
+        """Записывает накопленные изменения. Возвращает число записанных товаров"""
+
+        with self._lock:
+            products = list(self._dirty)
+            removed_keys = list(self._removed)
+            self._dirty.clear()
+            self._removed.clear()
+        # Старые ключи удаляются раньше записи: ключ, который снова занят, запишется заново
+        if products or removed_keys:
+            self.store.save_products(self.category, products, removed_keys)
+        return len(products)
+
+    def close(self) -> None:
+        """Записывает остаток изменений и перестает отслеживать категорию"""
+
+        self.category._unlisten(self)
+        self.flush()
+        for product in self.category._product_list():
+            product._unwatch(self)
+
+
+def _product_row(category_id: int, product: Product) -> tuple:
+    price = product.price
+    return (category_id, product_key(product.name), type(product).__name__, to_kopecks(price)) + tuple(
+        price if field == "price" else getattr(product, field, None) for field in FIELDS
+    )
+
+
+def _restore_products(rows: List[tuple]) -> List[Product]:
+    """Собирает товары из строк SELECT_PRODUCTS по колонкам своих классов"""
+
+    positions = {field: position for position, field in enumerate(FIELDS, start=2)}
+    groups: Dict[str, List[tuple]] = {}
+    for row in rows:
+        groups.setdefault(row[0], []).append(row)
+
+    built = {}
+    for class_name, class_rows in groups.items():
+        product_class = STORAGE_CLASSES[class_name]
+        columns = {field: [row[positions[field]] for row in class_rows] for field in product_class.fields}
+        built[class_name] = iter(product_class._restore_many(columns, len(class_rows)))
+    return [next(built[row[0]]) for row in rows]
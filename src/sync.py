@@ -0,0 +1,84 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable
+
+from src.category import Category
+from src.loader import TYPE_FIELD, build_product, iter_records
+from src.pricing import PriceChangePolicy
+from src.product import product_lock
+
+
+@dataclass
+class SyncReport:
+    """Счетчики изменений после синхронизации с фидом"""
+
+    inserted: int = 0
+    quantity_changed: int = 0
+    price_changed: int = 0
+    price_rejected: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.quantity_changed + self.price_changed
+
+
+def sync_record(category: Category, record: Dict, report: SyncReport, type_field: str = TYPE_FIELD, policy=None):
+    """Применяет к категории одну запись полного фида"""
+
+    existing = category.find_product(record["name"])
+    if existing is None:
+        if not record["quantity"]:
+            # Новый товар без остатка добавить нельзя (ZeroQuantityError) - ждем поставки
+            report.skipped += 1
+            return
+        category.add_product(build_product(record, type_field))
+        report.inserted += 1
+        return
+
+    quantity = record["quantity"]
+    price = record["price"]
+    if existing.quantity == quantity and existing.price == price:
+        report.unchanged += 1
+        return
+
+    with product_lock(existing):
+        if existing.quantity != quantity:
+            existing.quantity = quantity
+            report.quantity_changed += 1
+
+        if existing.price != price:
+            raised = price > existing.price
+            if existing.set_price(price, policy):
+                report.price_changed += 1
+                if raised:
+                    existing.description = record["description"]
+            else:
+                report.price_rejected += 1
+
+
+def sync_feed(
+    category: Category,
+    source,
+    type_field: str = TYPE_FIELD,
+    policy: PriceChangePolicy = None,
+) -> SyncReport:
+    """
+    Инкрементально синхронизирует категорию с полной выгрузкой поставщика.
+    Запись сравнивается с текущим товаром по ключу названия: новые товары добавляются через add_product,
+    у существующих остаток заменяется значением из фида, цена меняется через политику цен
+    (повышение цены обновляет и описание, как при слиянии дубликатов). Совпадающие записи
+    стоят один поиск по индексу и два сравнения: объекты для них не создаются.
+    source - путь к файлу (.jsonl, .json, .xlsx) или поток записей.
+    """
+
+    records: Iterable[Dict] = iter_records(source) if isinstance(source, (str, Path)) else source
+    report = SyncReport()
+    started = time.perf_counter()
+    for record in records:
+        sync_record(category, record, report, type_field, policy)
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,104 @@
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from src.money import average_kopecks, from_kopecks
+from src.product import Product, product_key, product_lock
+from src.query import Query
+
+
+class CategoryView:
+    """
+    Неизменяемый срез категории на момент Category.snapshot().
+    Создается за O(1): запоминает длину списка товаров (товары в категорию только добавляются),
+    итоги и номер версии, а список и товары делит с категорией.
+    Когда товар меняется после среза, категория записывает в срез прежнее значение поля.
+    Слияние (merge) категория применяет одним шагом под своим замком, а срез читает товар под замком товара,
+    поэтому слияние в срезе видно либо целиком, либо никак.
+    Строки неизмененных товаров берутся из общего кэша отрисовки; объекты при обходе отдаются копиями,
+    чтобы последующие изменения категории их не затрагивали.
+    """
+
+    def __init__(self, category, products: List[Product], total_quantity: int, total_kopecks: int, version: int):
+        self.name = category.name
+        self.description = category.description
+        self.version = version
+        self.total_quantity = total_quantity
+        self.total_kopecks = total_kopecks
+        self._products = products
+        self._length = len(products)
+        self._old_values: Dict[Product, Dict[str, object]] = {}
+        self._copies: Dict[Product, Product] = {}
+
+    def _record(self, product: Product, field: str, old_value) -> None:
+        """Вызывается категорией под ее замком: запоминает значение поля до первого изменения после среза"""
+
+        fields = self._old_values.get(product)
+        if fields is None:
+            self._old_values[product] = {field: old_value}
+        elif field not in fields:
+            fields[field] = old_value
+
+    def _version_of(self, product: Product) -> Product:
+        """Копия товара в состоянии на момент среза; копии измененных товаров запоминаются"""
+
+        with product_lock(product):
+            fields = self._old_values.get(product)
+            if fields is None:
+                return _copy(product, {})
+            copy = self._copies.get(product)
+            if copy is None:
+                copy = self._copies[product] = _copy(product, fields)
+            return copy
+
+    def __iter__(self) -> Iterator[Product]:
+        """Товары в состоянии на момент среза (копии, не связанные с категорией)"""
+
+        return map(self._version_of, islice(self._products, self._length))
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return f"{self.name}, количество продуктов: {self.total_quantity} шт."
+
+    @property
+    def products(self) -> List[str]:
+        """Строки о товарах на момент среза"""
+
+        old_values = self._old_values
+        rendered = []
+        for product in islice(self._products, self._length):
+            with product_lock(product):
+                if product not in old_values:
+                    rendered.append(product.render())
+                    continue
+            rendered.append(self._version_of(product).render())
+        return rendered
+
+    def find_product(self, name: str) -> Optional[Product]:
+        """Товар среза по названию (O(n): индекс категории мог измениться после среза)"""
+
+        key = product_key(name)
+        return next((product for product in self if product_key(product.name) == key), None)
+
+    def query(self) -> Query:
+        return Query(self)
+
+    @property
+    def total_value(self) -> float:
+        return from_kopecks(self.total_kopecks)
+
+    @property
+    def average_price(self) -> float:
+        if not self.total_quantity:
+            return 0.0
+        return from_kopecks(self.total_kopecks) / self.total_quantity
+
+    def get_average_price(self) -> str:
+        return f"{from_kopecks(average_kopecks(self.total_kopecks, self.total_quantity))} руб."
+
+
+def _copy(product: Product, old_values: Dict[str, object]) -> Product:
+    # Поля, которых нет в old_values, не менялись со времени среза: их текущее значение и есть прежнее
+    columns = {field: [old_values.get(field, getattr(product, field))] for field in type(product).fields}
+    return type(product)._restore_many(columns, 1)[0]
@@ -1,5 +1,6 @@
 import pytest
 
+from src import events
 from src.category import Category
 from src.product import LawnGrass, Product, Smartphone
 
@@ -31,6 +32,14 @@ def reset_category_counterse():
     Category.product_count = 0
 
 
+@pytest.fixture()
+def print_events():
+    """Включает прежний вывод сообщений ядра в stdout на время теста"""
+    handler = events.subscribe(events.PrintHandler())
+    yield handler
+    events.unsubscribe(handler)
+
+
 @pytest.fixture()
 def sample_smartphone():
     return Smartphone(
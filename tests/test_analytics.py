@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from src.category import Category
+from src.product import Product, product_lock
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+
+@pytest.fixture()
+def mixed_category(sample_products, sample_smartphones, sample_lawns):
+    return Category("Смешанная", "Описание", sample_products + sample_smartphones + sample_lawns)
+
+
+def test_total_value(mixed_category):
+    expected = 100 * 5 + 200 * 3 + 30000 * 3 + 40000 * 2 + 1000 * 10 + 1200 * 8
+    assert mixed_category.analytics.total_value() == pytest.approx(expected)
+    assert mixed_category.analytics.total_value() == pytest.approx(mixed_category.total_value)
+
+
+def test_weighted_average_price(mixed_category):
+    assert mixed_category.analytics.weighted_average_price() == pytest.approx(mixed_category.average_price)
+
+
+def test_empty_category():
+    analytics = Category("Пустая", "Описание").analytics
+    assert analytics.total_value() == 0.0
+    assert analytics.weighted_average_price() == 0.0
+
+
+def test_analytics_follow_changes(mixed_category, sample_products):
+    analytics = mixed_category.analytics
+    analytics.total_value()
+
+    sample_products[0].quantity = 1
+    mixed_category.add_product(Product("Новый", "Описание", 500.0, 2))
+    assert analytics.total_value() == pytest.approx(mixed_category.total_value)
+
+
+def test_price_histogram(mixed_category):
+    counts, edges = mixed_category.analytics.price_histogram(bins=[0, 1000, 50000])
+    assert counts.tolist() == [2, 4]
+
+    weighted, _ = mixed_category.analytics.price_histogram(bins=[0, 1000, 50000], weighted=True)
+    assert weighted.tolist() == [8, 23]
+
+
+def test_breakdown_by_type(mixed_category):
+    frame = mixed_category.analytics.breakdown_by_type()
+    assert list(frame.index) == ["Product", "Smartphone", "LawnGrass"]
+    assert frame.loc["Smartphone", "products"] == 2
+    assert frame.loc["Smartphone", "quantity"] == 5
+    assert frame.loc["LawnGrass", "total_value"] == pytest.approx(19600)
+    assert frame.loc["Product", "average_price"] == pytest.approx(1100 / 8)
+
+
+def test_to_frame(mixed_category):
+    frame = mixed_category.analytics.to_frame()
+    assert len(frame) == 6
+    assert frame["type"].tolist()[2] == "Smartphone"
+
+
+def test_analytics_concurrent_changes():
+    category = Category("Категория", "Описание", [Product(f"Товар {i}", "Описание", 100 + i, 1) for i in range(50)])
+    analytics = category.analytics
+    products = category._product_list()
+
+    def writer(offset):
+        for step in range(2000):
+            product = products[(offset + step) % len(products)]
+            with product_lock(product):
+                product.quantity += 1
+
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        analytics.total_kopecks()
+    for thread in threads:
+        thread.join()
+
+    # Ни одна отметка об изменении не потерялась между обходом и очисткой
+    assert analytics.total_kopecks() == category.total_kopecks
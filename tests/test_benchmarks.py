@@ -0,0 +1,22 @@
+from benchmarks import suite
+
+
+def test_suite_is_deterministic():
+    assert suite.make_specs(50) == suite.make_specs(50)
+    assert suite.make_specs(50) != suite.make_specs(50, seed=1)
+
+
+def test_suite_run_and_compare():
+    report = suite.run([200])
+    metrics = report["results"]["200"]
+    assert {"construction", "add_product", "new_product", "get_average_price", "products", "order", "memory"} <= set(
+        metrics
+    )
+    assert metrics["memory"]["peak_bytes"] > 0
+
+    rows = suite.compare(report, report)
+    assert rows and not any(row["regression"] for row in rows)
+
+    slower = {"results": {"200": {"order": dict(metrics["order"], seconds=metrics["order"]["seconds"] / 2)}}}
+    (row,) = suite.compare(report, slower, threshold=0.5)
+    assert row["regression"]
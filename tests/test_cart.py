@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from src.category import BaseContainer, Cart, Category
+from src.pricing import AcceptAllPolicy
+from src.product import Product, ZeroQuantityError
+
+
+@pytest.fixture()
+def cart(sample_products):
+    cart = Cart("Корзина", "Тестовая корзина")
+    cart.add(sample_products[0], 2)
+    cart.add(sample_products[1])
+    return cart
+
+
+def test_cart_total(cart):
+    assert isinstance(cart, BaseContainer)
+    assert len(cart) == 2
+    assert cart.total_price == 100 * 2 + 200
+
+
+def test_cart_add_existing_line(cart, sample_products):
+    cart.add(sample_products[0], 3)
+    assert len(cart) == 2
+    assert cart.quantity_of(sample_products[0]) == 5
+    assert cart.total_price == 100 * 5 + 200
+
+
+def test_cart_update_and_remove(cart, sample_products):
+    cart.update(sample_products[1], 4)
+    assert cart.total_price == 100 * 2 + 200 * 4
+
+    cart.remove(sample_products[0])
+    assert sample_products[0] not in cart
+    assert cart.total_price == 200 * 4
+
+    cart.clear()
+    assert len(cart) == 0
+    assert cart.total_price == 0
+
+
+def test_cart_follows_price_changes(cart, sample_products, sample_category):
+    sample_products[0].price = 150
+    assert cart.total_price == 150 * 2 + 200
+
+    sample_category.reprice({"Товар 1": 50, "Товар 2": 100}, AcceptAllPolicy())
+    assert cart.total_price == 50 * 2 + 100
+
+
+def test_cart_removed_line_ignores_price_changes(cart, sample_products):
+    cart.remove(sample_products[0])
+    sample_products[0].price = 1000
+    assert cart.total_price == 200
+
+
+def test_cart_validation(cart, sample_products):
+    with pytest.raises(ZeroQuantityError):
+        cart.add(sample_products[0], 0)
+    with pytest.raises(ValueError):
+        cart.add("не товар")
+    with pytest.raises(ValueError):
+        cart.update(sample_products[0], -1)
+
+
+def test_cart_str(cart):
+    assert str(cart) == "Корзина: Корзина, Позиций: 2, Итого: 400.0 руб."
+
+
+class SlowWatcher:
+    """Наблюдатель с медленным сравнением: растягивает окно между чтением и записью кортежа наблюдателей"""
+
+    def _product_changed(self, product, field, old_value, new_value):
+        pass
+
+    def __eq__(self, other):
+        time.sleep(0.01)
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+def test_concurrent_subscriptions_are_not_lost():
+    product = Product("Товар", "Описание", 100, 1)
+    product._watch(SlowWatcher())
+    category = Category("Категория", "Описание")
+    carts = [Cart(f"Корзина {i}") for i in range(3)]
+
+    threads = [threading.Thread(target=cart.add, args=(product,)) for cart in carts]
+    threads.append(threading.Thread(target=category.add_product, args=(product,)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(carts + [category]) <= set(product._watchers)
+    assert len(product._watchers) == 5
+
+
+def test_cart_sees_price_change_during_add():
+    product = Product("Товар", "Описание", 100, 1)
+    product._watch(SlowWatcher())
+    cart = Cart("Корзина")
+
+    adding = threading.Thread(target=cart.add, args=(product, 2))
+    adding.start()
+    time.sleep(0.005)
+    product.set_price(150, AcceptAllPolicy())
+    adding.join()
+
+    assert cart.total_price == 300
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from src.catalog import Catalog
+from src.category import Category
+from src.product import Product
+
+
+@pytest.fixture()
+def catalog():
+    return Catalog(
+        [
+            Category("Фрукты", "", [Product("Яблоко", "", 10.0, 5), Product("Груша", "", 20.0, 1)]),
+            Category("Акции", "", [Product("яблоко ", "", 8.0, 2)]),
+        ]
+    )
+
+
+def test_catalog_lookup_and_index(catalog):
+    assert len(catalog) == 2
+    assert "Фрукты" in catalog
+    assert catalog["Акции"].name == "Акции"
+    assert catalog.get("Нет такой") is None
+    with pytest.raises(KeyError, match="Категория не найдена"):
+        catalog["Нет такой"]
+    with pytest.raises(ValueError, match="уже есть"):
+        catalog.add_category(Category("Фрукты", ""))
+
+    assert [category.name for category in catalog.categories_with("ЯБЛОКО")] == ["Фрукты", "Акции"]
+    assert [product.price for product in catalog.find_products("яблоко")] == [10.0, 8.0]
+    assert catalog.categories_with("Слива") == []
+    assert catalog.positions == 3
+    assert catalog.distinct_products == 2
+
+
+def test_catalog_aggregates_are_incremental(catalog):
+    assert catalog.total_quantity == 8
+    assert catalog.total_kopecks == 8600
+
+    fruits = catalog["Фрукты"]
+    fruits.add_product(Product("Слива", "", 5.0, 4))
+    fruits.add_product(Product("груша", "", 30.0, 1))
+    fruits.find_product("Яблоко").quantity = 1
+    assert catalog.total_quantity == 1 + 2 + 4 + 2
+    assert catalog.total_kopecks == fruits.total_kopecks + catalog["Акции"].total_kopecks
+    assert catalog.categories_with("слива") == [fruits]
+    assert catalog.get_average_price() == f"{round(catalog.total_value / catalog.total_quantity, 2)} руб."
+
+    fruits.find_product("Слива").name = "Персик"
+    assert catalog.categories_with("слива") == []
+    assert catalog.categories_with("персик") == [fruits]
+
+
+def test_catalog_remove_category(catalog):
+    removed = catalog.remove_category("Фрукты")
+    assert catalog.total_quantity == 2
+    assert catalog.total_kopecks == 1600
+    assert catalog.positions == 1
+    assert [category.name for category in catalog.categories_with("груша")] == []
+
+    removed.add_product(Product("Слива", "", 5.0, 4))
+    assert catalog.total_quantity == 2
+    with pytest.raises(KeyError):
+        catalog.remove_category("Фрукты")
+
+
+def test_catalog_concurrent_updates(catalog):
+    fruits = catalog["Фрукты"]
+
+    def worker(number):
+        for i in range(200):
+            fruits.add_product(Product(f"Товар {number}-{i}", "", 1.0, 1))
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert catalog.total_quantity == fruits.total_quantity + catalog["Акции"].total_quantity
+    assert catalog.positions == len(fruits) + len(catalog["Акции"])
+
+
+def test_catalog_scales_to_many_categories():
+    catalog = Catalog()
+    started = time.perf_counter()
+    for i in range(10_000):
+        catalog.add_category(Category(f"Категория {i}", "", [Product(f"Товар {i % 100}", "", 1.0, 1)]))
+    assert time.perf_counter() - started < 10
+
+    assert catalog["Категория 9999"].name == "Категория 9999"
+    assert len(catalog.categories_with("Товар 5")) == 100
+    assert catalog.total_quantity == 10_000
@@ -0,0 +1,66 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.category import Category
+from src.product import Product
+
+THREADS = 8
+PRODUCTS_PER_THREAD = 2000
+NAMES = 50
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Частое переключение потоков, чтобы гонки проявлялись на коротком тесте"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def ingest(category, thread_id):
+    for i in range(PRODUCTS_PER_THREAD):
+        category.add_product(Product(f"Товар {i % NAMES}", f"Поставщик {thread_id}", 100.0 + i % 7, 1 + i % 3))
+
+
+def expected_quantity():
+    return THREADS * sum(1 + i % 3 for i in range(PRODUCTS_PER_THREAD))
+
+
+def test_parallel_ingest_loses_no_quantity():
+    """Стресс-тест: потоки одновременно добавляют дубликаты в одну категорию"""
+    category = Category("Общая", "Описание")
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(lambda thread_id: ingest(category, thread_id), range(THREADS)))
+
+    assert len(category) == NAMES
+    assert Category.product_count == NAMES
+    assert category.total_quantity == expected_quantity()
+    assert sum(category.find_product(f"Товар {i}").quantity for i in range(NAMES)) == expected_quantity()
+    assert category.total_value == sum(
+        category.find_product(f"Товар {i}").price * category.find_product(f"Товар {i}").quantity for i in range(NAMES)
+    )
+
+
+def test_parallel_category_counter():
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(lambda i: Category(f"Категория {i}", "Описание"), range(1000)))
+    assert Category.category_count == 1000
+
+
+def test_parallel_assignments_keep_totals():
+    """Присваивания без внешнего замка могут терять приращения, но итоги категории совпадают с товарами"""
+    category = Category("Общая", "Описание", [Product(f"Товар {i}", "Описание", 100.0 + i, 1) for i in range(5)])
+    products = category._product_list()
+
+    def assign(thread_id):
+        for i in range(PRODUCTS_PER_THREAD):
+            products[(thread_id + i) % len(products)].quantity += 1
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(assign, range(4)))
+
+    assert category.total_quantity == sum(product.quantity for product in products)
+    assert category.total_kopecks == sum(round(product.price * 100) * product.quantity for product in products)
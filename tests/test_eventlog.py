@@ -0,0 +1,228 @@
+import json
+import threading
+import time
+import zlib
+
+import pytest
+
+from src import events
+from src.category import Category, Order
+from src.eventlog import FRAME_HEADER, MAGIC, RECORD_LENGTH, EventLog, recover, replay
+from src.pricing import AcceptAllPolicy
+from src.product import LawnGrass, Product, Smartphone
+
+
+def state(categories):
+    return {category.name: (category.products, category.total_kopecks) for category in categories}
+
+
+@pytest.fixture()
+def log_path(tmp_path):
+    return tmp_path / "catalog.log"
+
+
+def test_eventlog_replay_matches_live_state(log_path):
+    with EventLog(log_path, group_size=4) as log:
+        category = Category(
+            "Смешанная",
+            "Описание",
+            [
+                Product("Товар", "Описание", 100, 5),
+                Smartphone("Телефон", "Описание", 30000.5, 2, 4.5, "X", 128, "Черный"),
+            ],
+        )
+        category.add_product(LawnGrass("Трава", "Описание", 500.0, 10, "Россия", "7 дней", "Зеленый"))
+        category.add_product(Product("товар", "Новое описание", 150, 3))
+        category.find_product("Телефон").set_price(25000.25, AcceptAllPolicy())
+        category.find_product("Трава").quantity = 4
+        category.find_product("Трава").name = "Газон"
+        category.find_product("Газон").quantity = 6
+        Order("Заказ", "Описание", category.find_product("Товар"), 2)
+        log.flush()
+
+        categories, report = replay(log_path)
+
+    assert state(categories) == state([category])
+    assert categories[0].find_product("товар").description == "Новое описание"
+    assert categories[0].find_product("Трава") is None
+    assert report.orders == 1
+    assert not report.truncated
+
+
+def test_eventlog_group_commit(log_path):
+    # Без flush записи ждут группы в памяти; close дописывает остаток одним кадром
+    log = EventLog(log_path, group_size=1000, interval=60)
+    category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+    for quantity in range(6, 106):
+        category.find_product("Товар").quantity = quantity
+    log.close()
+
+    categories, report = replay(log_path)
+    assert report.frames == 1
+    assert report.records == 103
+    assert categories[0].find_product("Товар").quantity == 105
+
+
+def test_eventlog_checkpoint_and_recover(tmp_path, log_path):
+    snapshot_path = tmp_path / "catalog.snapshot"
+    category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+    with EventLog(log_path) as log:
+        log.checkpoint(snapshot_path, [category])
+        category.add_product(Product("Товар", "Описание", 120, 1))
+        category.add_product(Product("Другой", "Описание", 10, 1))
+
+    categories, report = recover(snapshot_path, log_path)
+    assert state(categories) == state([category])
+    assert report.records > 0
+
+
+def test_eventlog_checkpoint_with_concurrent_writer(tmp_path, log_path):
+    snapshot_path = tmp_path / "catalog.snapshot"
+    category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+    stop = threading.Event()
+
+    def writer():
+        step = 0
+        while not stop.is_set():
+            step += 1
+            category.add_product(Product(f"Товар {step % 50}", "Описание", 100 + step % 7, 1))
+            category.add_product(Product(f"Новый {step}", "Описание", 10, 1))
+            category.find_product("Товар").quantity += 1
+
+    log = EventLog(log_path, interval=0.001)
+    writing = threading.Thread(target=writer, daemon=True)
+    # Контрольные точки - в отдельном потоке: взаимная блокировка станет падением теста, а не зависанием
+    checkpoints = threading.Thread(
+        target=lambda: [log.checkpoint(snapshot_path, [category]) for _ in range(20)], daemon=True
+    )
+    writing.start()
+    checkpoints.start()
+    checkpoints.join(timeout=30)
+    stop.set()
+    writing.join(timeout=30)
+    assert not checkpoints.is_alive() and not writing.is_alive()
+    log.close()
+
+    # Каждое изменение попало ровно в одно место: либо в снимок, либо в новый журнал
+    categories, _ = recover(snapshot_path, log_path)
+    assert state(categories) == state([category])
+
+
+def test_eventlog_insert_logs_counted_values(log_path):
+    category = Category("Категория", "Описание", [Product("Другой", "Описание", 10, 1)])
+    writers = []
+
+    def change_during_insert(event, fields):
+        # Обработчик подписан раньше журнала: изменение остатка успевает записаться в товар,
+        # а его уведомление ждет замка категории, пока журнал пишет вставку
+        if event == "product_inserted":
+            writer = threading.Thread(target=setattr, args=(fields["item"], "quantity", 8))
+            writer.start()
+            writers.append(writer)
+            time.sleep(0.05)
+
+    events.subscribe(change_during_insert)
+    try:
+        with EventLog(log_path):
+            category.add_product(Product("Товар", "Описание", 100, 5))
+            writers[0].join()
+    finally:
+        events.unsubscribe(change_during_insert)
+
+    categories, _ = replay(log_path)
+    assert categories[0].find_product("Товар").quantity == 8
+    assert category.total_quantity == 9
+
+
+def test_eventlog_rejects_unsupported_values(log_path):
+    with EventLog(log_path):
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+        with pytest.raises(ValueError, match="только строками"):
+            category.find_product("Товар").description = object()
+        with pytest.raises(ValueError, match="только строками"):
+            category.find_product("Товар").description = b"bytes"
+
+
+def write_frame(path, *records):
+    encoded = [record.encode() for record in records]
+    payload = b"".join(RECORD_LENGTH.pack(len(data)) + data for data in encoded)
+    with open(path, "ab") as file:
+        file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload), 0, 0))
+        file.write(payload)
+
+
+def test_eventlog_records_are_json(log_path):
+    log_path.write_bytes(MAGIC)
+    # Запись в формате журнала, собранная без src.eventlog: формат не зависит от версии Python
+    records = [["category", "Категория", "Описание"], ["insert", "Категория", "Product", ["Товар", "", 100, 5]]]
+    write_frame(log_path, *map(json.dumps, records))
+
+    categories, report = replay(log_path)
+    assert report.records == 2
+    assert categories[0].find_product("Товар").price == 100
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        "not json",
+        '["field", 0, "_watchers", null]',
+        '["insert", "Категория", "Product", ["Товар"]]',
+        '["insert", "Категория", "Unknown", []]',
+        '["define", 0, "Нет такой", "товар"]',
+    ],
+)
+def test_eventlog_rejects_damaged_records(log_path, record):
+    log_path.write_bytes(MAGIC)
+    write_frame(
+        log_path,
+        '["category", "Категория", "Описание"]',
+        '["insert", "Категория", "Product", ["Товар", "", 100, 5]]',
+        '["define", 0, "Категория", "товар"]',
+        record,
+    )
+    with pytest.raises(ValueError, match="поврежден"):
+        replay(log_path)
+
+
+def test_eventlog_truncates_torn_tail(log_path):
+    with EventLog(log_path) as log:
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+        log.flush()
+        category.find_product("Товар").quantity = 8
+
+    with open(log_path, "ab") as file:
+        file.write(b"\x10\x00\x00\x00torn frame")
+
+    categories, report = replay(log_path)
+    assert report.truncated
+    assert categories[0].find_product("Товар").quantity == 8
+
+    # Открытый заново журнал отрезает хвост и пишет дальше
+    with EventLog(log_path):
+        category.find_product("Товар").quantity = 9
+    categories, report = replay(log_path)
+    assert not report.truncated
+    assert categories[0].find_product("Товар").quantity == 9
+
+
+def test_eventlog_reopen_continues_product_ids(log_path):
+    with EventLog(log_path):
+        category = Category("Категория", "Описание", [Product("Первый", "Описание", 100, 5)])
+        category.find_product("Первый").quantity = 6
+
+    with EventLog(log_path):
+        category.add_product(Product("Второй", "Описание", 10, 1))
+        category.find_product("Второй").price = 20
+        category.find_product("Первый").price = 150
+
+    categories, _ = replay(log_path)
+    assert state(categories) == state([category])
+
+
+def test_eventlog_rejects_foreign_file(log_path):
+    log_path.write_bytes(b"not a log")
+    with pytest.raises(ValueError, match="не является журналом"):
+        EventLog(log_path)
+    with pytest.raises(ValueError, match="не является журналом"):
+        replay(log_path)
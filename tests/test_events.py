@@ -0,0 +1,69 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from src import events
+from src.category import Category
+from src.product import Product
+
+
+@pytest.fixture()
+def recorded_events():
+    records = []
+    handler = events.subscribe(lambda event, fields: records.append((event, fields)))
+    yield records
+    events.unsubscribe(handler)
+
+
+def test_emit_without_handlers():
+    assert not events.has_handlers()
+    events.emit("product_added", product="Товар")
+
+
+def test_events_on_add_product(recorded_events):
+    product = Product("Товар", "Описание", 100.0, 5)
+    Category("Тест", "Описание", [product])
+    names = [event for event, _ in recorded_events]
+    assert names == ["product_created", "product_inserted", "product_added", "product_add_finished"]
+    assert recorded_events[2][1] == {"category": "Тест", "product": "Товар"}
+
+
+def test_batched_log_handler(caplog):
+    handler = events.BatchedLogHandler(batch_size=2)
+    events.subscribe(handler)
+    try:
+        with caplog.at_level(logging.INFO, logger="codecommerce.events"):
+            Product("Товар 1", "Описание", 100.0, 5)
+            assert caplog.records == []
+            Product("Товар 2", "Описание", 200.0, 3)
+            assert len(caplog.records) == 1
+
+            Product("Товар 3", "Описание", 300.0, 1)
+            handler.flush()
+    finally:
+        events.unsubscribe(handler)
+
+    lines = [line for record in caplog.records for line in record.getMessage().splitlines()]
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == {"event": "product_created", "product": "Товар 1, 100.0 руб. Остаток: 5 шт."}
+
+
+def test_batched_log_handler_threads(caplog):
+    handler = events.subscribe(events.BatchedLogHandler(batch_size=7))
+    with caplog.at_level(logging.INFO, logger="codecommerce.events"):
+        threads = [
+            threading.Thread(target=lambda: [events.emit("order_created", order="Заказ") for _ in range(500)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # close пишет остаток: ни одно событие не теряется ни между потоками, ни при завершении
+        handler.close()
+
+    assert not events.has_handlers()
+    lines = [line for record in caplog.records for line in record.getMessage().splitlines()]
+    assert len(lines) == 2000
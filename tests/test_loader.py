@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from src.category import Category
+from src.loader import build_product, iter_batches, iter_json_array, iter_jsonl, load_catalog
+from src.product import LawnGrass, Product, Smartphone, ZeroQuantityError
+
+RECORDS = [
+    {"name": "Товар 1", "description": "Описание 1", "price": 100.0, "quantity": 5},
+    {
+        "type": "smartphone",
+        "name": "Смартфон 1",
+        "description": "Описание",
+        "price": 30000.0,
+        "quantity": 3,
+        "efficiency": 4.0,
+        "model": "Model A",
+        "memory": 64,
+        "color": "Синий",
+    },
+    {
+        "type": "lawn_grass",
+        "name": "Трава 1",
+        "description": "Описание",
+        "price": 1000.0,
+        "quantity": 10,
+        "country": "Россия",
+        "germination_period": "10 дней",
+        "color": "Зеленый",
+    },
+    {"name": "товар 1", "description": "Новое описание", "price": 150.0, "quantity": 2},
+]
+
+
+@pytest.fixture()
+def jsonl_file(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text("\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS), encoding="utf-8")
+    return path
+
+
+@pytest.fixture()
+def json_file(tmp_path):
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(RECORDS, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def test_iter_jsonl(jsonl_file):
+    assert list(iter_jsonl(jsonl_file)) == RECORDS
+
+
+def test_iter_json_array_small_chunks(json_file):
+    """Тест потокового чтения массива кусками меньше одной записи"""
+    assert list(iter_json_array(json_file, chunk_size=7)) == RECORDS
+
+
+def test_iter_json_array_waits_for_whole_value(tmp_path):
+    path = tmp_path / "feed.json"
+    path.write_text('[{"quantity": 1234}, {"quantity": 5678}]', encoding="utf-8")
+    for chunk_size in range(1, 8):
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == [{"quantity": 1234}, {"quantity": 5678}]
+
+
+def test_iter_json_array_rejects_scalars(tmp_path):
+    path = tmp_path / "feed.json"
+    path.write_text("[1234, 5678]", encoding="utf-8")
+    with pytest.raises(ValueError, match="должен быть объектом, а не int"):
+        list(iter_json_array(path, chunk_size=2))
+
+
+def test_iter_json_array_not_array(tmp_path):
+    path = tmp_path / "feed.json"
+    path.write_text('{"name": "Товар"}', encoding="utf-8")
+    with pytest.raises(ValueError, match="JSON-массив"):
+        list(iter_json_array(path))
+
+
+def test_build_product_types():
+    assert type(build_product(RECORDS[0])) is Product
+    assert isinstance(build_product(RECORDS[1]), Smartphone)
+    assert isinstance(build_product(RECORDS[2]), LawnGrass)
+
+
+def test_build_product_unknown_type():
+    with pytest.raises(ValueError, match="Неизвестный тип товара"):
+        build_product({**RECORDS[0], "type": "tractor"})
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_load_catalog_jsonl(jsonl_file):
+    category = Category("Каталог", "Описание")
+    batches = []
+    stats = load_catalog(jsonl_file, category, batch_size=2, on_batch=lambda s: batches.append(s.rows))
+
+    assert stats.rows == 4
+    assert stats.batches == 2
+    assert batches == [2, 4]
+    assert len(category) == 3
+    assert category.find_product("Товар 1").quantity == 7
+    assert stats.rows_per_second > 0
+
+
+def test_load_catalog_json(json_file):
+    category = Category("Каталог", "Описание")
+    stats = load_catalog(json_file, category)
+    assert stats.rows == 4
+    assert len(category) == 3
+
+
+def test_load_catalog_skip_invalid():
+    category = Category("Каталог", "Описание")
+    records = [RECORDS[0], {**RECORDS[0], "name": "Пустой", "quantity": 0}]
+
+    with pytest.raises(ZeroQuantityError):
+        load_catalog(iter(records), category)
+
+    stats = load_catalog(iter(records), Category("Каталог", "Описание"), skip_invalid=True)
+    assert stats.rows == 1
+    assert stats.skipped == 1
+
+
+def test_load_catalog_xlsx(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "feed.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    columns = ["type", "name", "description", "price", "quantity", "efficiency", "model", "memory", "color"]
+    worksheet.append(columns)
+    worksheet.append([None, "Товар 1", "Описание", 100.0, 5, None, None, None, None])
+    worksheet.append(["smartphone", "Смартфон 1", "Описание", 30000.0, 3, 4.0, "Model A", 64, "Синий"])
+    workbook.save(path)
+
+    category = Category("Каталог", "Описание")
+    stats = load_catalog(path, category)
+    assert stats.rows == 2
+    assert isinstance(category.find_product("Смартфон 1"), Smartphone)
@@ -0,0 +1,59 @@
+import pytest
+
+from src import metrics
+from src.category import Category, Order
+from src.product import Product
+
+
+@pytest.fixture()
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_metrics_disabled_by_default():
+    metrics.reset()
+    category = Category("Тест", "Описание", [Product("Товар", "Описание", 100.0, 5)])
+    category.products
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_metrics_hot_paths(enabled_metrics):
+    category = Category("Тест", "Описание", [Product("Товар", "Описание", 100.0, 5)])
+    category.add_product(Product("товар", "Описание", 90.0, 1))
+    Product.new_product({"name": "Новый", "description": "Описание", "price": 10.0, "quantity": 1}, category)
+    product = category.find_product("Товар")
+    product.price = 150.0
+    product.price = -1
+    Order("Заказ", "Описание", product, 2)
+    category.products
+    category.products
+
+    data = metrics.snapshot()
+    histograms = data["histograms"]
+    assert histograms["add_product_insert"]["count"] == 1
+    assert histograms["add_product_merge"]["count"] == 1
+    assert histograms["new_product"]["count"] == 1
+    assert histograms["set_price"]["count"] == 2
+    assert histograms["order"]["count"] == 1
+    assert histograms["render"]["count"] == 1
+    assert histograms["category_products"]["count"] == 2
+    assert data["counters"] == {"render_cache_hits": 1}
+
+    buckets = histograms["set_price"]["buckets"]
+    assert list(buckets.values()) == sorted(buckets.values())
+    assert buckets[float("inf")] == 2
+
+
+def test_metrics_prometheus(enabled_metrics):
+    metrics.observe("render", 3e-6)
+    metrics.increment("render_cache_hits", 2)
+    text = metrics.to_prometheus()
+    assert "# TYPE codecommerce_render_cache_hits_total counter\ncodecommerce_render_cache_hits_total 2\n" in text
+    assert 'codecommerce_operation_seconds_bucket{operation="render",le="2.5e-06"} 0' in text
+    assert 'codecommerce_operation_seconds_bucket{operation="render",le="5e-06"} 1' in text
+    assert 'codecommerce_operation_seconds_bucket{operation="render",le="+Inf"} 1' in text
+    assert 'codecommerce_operation_seconds_count{operation="render"} 1' in text
@@ -0,0 +1,67 @@
+import pytest
+
+from src.category import Cart, Category, Order
+from src.money import average_kopecks, from_kopecks, to_amount, to_kopecks, total_kopecks
+from src.product import Product
+
+
+def test_to_kopecks_rounds_float_error():
+    assert to_kopecks(19.99) == 1999
+    assert to_kopecks(0.1) == 10
+    assert to_kopecks(100) == 10000
+    assert list(map(to_kopecks, [1.1, 2.2])) == [110, 220]
+    assert total_kopecks([0.1, 0.2], [3, 1]) == 50
+
+
+def test_to_amount_keeps_old_types():
+    assert to_amount(40000, 100) == 400
+    assert isinstance(to_amount(40000, 100), int)
+    assert to_amount(40000, 100.0) == 400.0
+    assert isinstance(to_amount(40000, 100.0), float)
+    assert to_amount(40050, 100) == 400.5
+    assert from_kopecks(30) == 0.3
+
+
+def test_average_kopecks_rounds_half_up():
+    assert average_kopecks(1001, 2) == 501
+    assert average_kopecks(1000, 3) == 333
+    assert average_kopecks(0, 0) == 0
+
+
+def test_category_totals_are_exact():
+    products = [Product(f"Товар {i}", "Описание", 0.1, 1) for i in range(10)]
+    category = Category("Копейки", "Описание", products)
+    assert category.total_kopecks == 100
+    assert category.total_value == 1.0
+    assert sum(product.price * product.quantity for product in products) != 1.0
+
+    products[0].price = 0.2
+    products[1].quantity = 3
+    assert category.total_kopecks == 130
+    assert category.get_average_price() == "0.11 руб."
+
+
+def test_order_product_and_cart_totals():
+    product = Product("Товар", "Описание", 0.1, 10)
+    order = Order("Заказ", "Описание", product, 3)
+    assert order.total_kopecks == 30
+    assert order.total_price == 0.3
+    assert "Итого: 0.3 руб." in str(order)
+
+    assert Product("А", "О", 0.1, 1) + Product("Б", "О", 0.2, 1) == 0.3
+    assert Product("А", "О", 100, 2) + Product("Б", "О", 50, 1) == 250
+
+    cart = Cart("Корзина")
+    cart.add(product, 3)
+    assert cart.total_price == 0.3
+    assert str(cart) == "Корзина: Корзина, Позиций: 1, Итого: 0.3 руб."
+
+
+def test_analytics_totals_are_exact():
+    pytest.importorskip("numpy")
+    pytest.importorskip("pandas")
+    category = Category("Копейки", "Описание", [Product(f"Товар {i}", "Описание", 0.1, 1) for i in range(10)])
+    analytics = category.analytics
+    assert analytics.total_kopecks() == 100
+    assert analytics.total_value() == 1.0
+    assert analytics.breakdown_by_type().loc["Product", "total_value"] == 1.0
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.category import Category, Order
+from src.orders import OrderEngine, OrderRequest
+from src.product import Product
+
+
+def test_process_reserves_stock(sample_category):
+    product = sample_category.find_product("Товар 1")
+    result = OrderEngine().process([OrderRequest("Заказ 1", product, 2), OrderRequest("Заказ 2", product, 3)])
+
+    assert [order.quantity for order in result.orders] == [2, 3]
+    assert isinstance(result.orders[0], Order)
+    assert result.orders[0].total_price == 200
+    assert product.quantity == 0
+    assert sample_category.total_quantity == 3
+
+
+def test_process_rejects_when_out_of_stock(sample_product):
+    result = OrderEngine().process(
+        [OrderRequest("Заказ 1", sample_product, 8), OrderRequest("Заказ 2", sample_product, 5)]
+    )
+    assert len(result.orders) == 1
+    assert result.rejected[0].name == "Заказ 2"
+    assert sample_product.quantity == 2
+
+
+def test_process_partial_fill(sample_product):
+    result = OrderEngine(allow_partial=True).process(
+        [OrderRequest("Заказ 1", sample_product, 8), OrderRequest("Заказ 2", sample_product, 5)]
+    )
+    assert [order.quantity for order in result.orders] == [8, 2]
+    assert result.partial == 1
+    assert sample_product.quantity == 0
+
+
+def test_process_rejects_invalid_quantity(sample_product):
+    result = OrderEngine().process([OrderRequest("Заказ", sample_product, 0)])
+    assert result.orders == []
+    assert len(result.rejected) == 1
+
+
+def test_parallel_batches_do_not_oversell():
+    product = Product("Товар", "Описание", 100.0, 1000)
+    category = Category("Тест", "Описание", [product])
+    engine = OrderEngine()
+    batches = [[OrderRequest(f"Заказ {b}-{i}", product, 3) for i in range(100)] for b in range(8)]
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(engine.process, batches))
+
+    sold = sum(order.quantity for result in results for order in result.orders)
+    assert sold == 999
+    assert product.quantity == 1
+    assert category.total_quantity == 1
+    assert results[0].orders_per_second > 0
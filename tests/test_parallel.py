@@ -0,0 +1,93 @@
+import pytest
+
+from src.category import Category
+from src.loader import load_catalog
+from src.parallel import ingest_parallel, validate_chunk
+from src.product import LawnGrass, Smartphone, ZeroQuantityError
+
+
+def make_feed(count):
+    records = []
+    for i in range(count):
+        if i % 5 == 0:
+            records.append(
+                {
+                    "type": "smartphone",
+                    "name": f"Смартфон {i % 40}",
+                    "description": f"Партия {i}",
+                    "price": 1000.0 + i % 13,
+                    "quantity": 1 + i % 4,
+                    "efficiency": 4.0,
+                    "model": "Model",
+                    "memory": 128,
+                    "color": "Черный",
+                }
+            )
+        elif i % 5 == 1:
+            records.append(
+                {
+                    "type": "lawn_grass",
+                    "name": f"Трава {i % 30}",
+                    "description": f"Партия {i}",
+                    "price": 100.0 + i % 11,
+                    "quantity": 2,
+                    "country": "Россия",
+                    "germination_period": "7 дней",
+                    "color": "Зеленый",
+                }
+            )
+        else:
+            records.append(
+                {"name": f"ТОВАР {i % 70}", "description": f"Партия {i}", "price": 10.0 + i % 7, "quantity": 1}
+            )
+    return records
+
+
+def snapshot_of(category):
+    return [(type(product), product.render(), product.description) for product in category._product_list()]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_matches_sequential(workers):
+    feed = make_feed(600)
+    sequential = Category("Последовательно", "Описание")
+    load_catalog(iter(feed), sequential)
+    sequential_count = Category.product_count
+
+    Category.product_count = 0
+    parallel = Category("Параллельно", "Описание")
+    report = ingest_parallel(iter(feed), parallel, workers=workers, chunk_size=37)
+
+    assert snapshot_of(parallel) == snapshot_of(sequential)
+    assert parallel.total_quantity == sequential.total_quantity
+    assert parallel.total_value == pytest.approx(sequential.total_value)
+    assert Category.product_count == sequential_count
+    assert report.rows == 600
+    assert report.inserted == len(parallel)
+    assert report.inserted + report.merged == 600
+    assert isinstance(parallel.find_product("Смартфон 5"), Smartphone)
+    assert isinstance(parallel.find_product("Трава 1"), LawnGrass)
+
+
+def test_parallel_merges_into_existing_products(sample_category):
+    feed = [{"name": "Товар 1", "description": "Новое", "price": 150.0, "quantity": 2}]
+    report = ingest_parallel(feed, sample_category, workers=1)
+    assert report.merged == 1
+    assert sample_category.find_product("Товар 1").quantity == 7
+    assert sample_category.find_product("Товар 1").description == "Новое"
+
+
+def test_validate_chunk_errors():
+    rows, errors = validate_chunk([{"name": "Товар", "description": "", "price": 1.0, "quantity": 0}])
+    assert rows == []
+    assert isinstance(errors[0][1], ZeroQuantityError)
+
+
+def test_parallel_invalid_rows():
+    feed = make_feed(10) + [{"name": "Пустой", "description": "", "price": 1.0, "quantity": 0}]
+    with pytest.raises(ZeroQuantityError):
+        ingest_parallel(feed, Category("Тест", "Описание"), workers=1)
+
+    report = ingest_parallel(feed, Category("Тест", "Описание"), workers=1, skip_invalid=True)
+    assert report.skipped == 1
+    assert report.rows == 10
@@ -0,0 +1,59 @@
+import pytest
+
+from src.category import Category
+from src.price_index import PriceIndex
+from src.pricing import AcceptAllPolicy
+from src.product import Product
+
+
+@pytest.fixture()
+def priced_category():
+    prices = [500, 100, 300, 200, 300, 400]
+    return Category(
+        "Тест", "Описание", [Product(f"Товар {i}", "Описание", price, 1) for i, price in enumerate(prices)]
+    )
+
+
+def names(products):
+    return [product.name for product in products]
+
+
+def test_price_range(priced_category):
+    assert names(priced_category.products_by_price(200, 400)) == ["Товар 3", "Товар 2", "Товар 4", "Товар 5"]
+    assert names(priced_category.products_by_price(high=200)) == ["Товар 1", "Товар 3"]
+    assert names(priced_category.products_by_price(450)) == ["Товар 0"]
+    assert priced_category.products_by_price(600, 700) == []
+
+
+def test_price_range_limit_and_order(priced_category):
+    assert names(priced_category.products_by_price(200, 400, limit=2)) == ["Товар 3", "Товар 2"]
+    assert names(priced_category.products_by_price(200, 400, limit=2, descending=True)) == ["Товар 5", "Товар 4"]
+
+
+def test_top_n(priced_category):
+    assert names(priced_category.cheapest(2)) == ["Товар 1", "Товар 3"]
+    assert names(priced_category.most_expensive(2)) == ["Товар 0", "Товар 5"]
+    assert len(priced_category.most_expensive(100)) == 6
+    assert priced_category.cheapest(0) == []
+
+
+def test_price_index_follows_changes(priced_category):
+    priced_category.cheapest(1)
+
+    priced_category.find_product("Товар 0").set_price(50, AcceptAllPolicy())
+    assert names(priced_category.cheapest(1)) == ["Товар 0"]
+
+    priced_category.add_product(Product("Товар 1", "Описание", 1000, 1))
+    assert names(priced_category.most_expensive(1)) == ["Товар 1"]
+
+    priced_category.reprice({"Товар 1": 250}, AcceptAllPolicy())
+    assert names(priced_category.products_by_price(250, 250)) == ["Товар 1"]
+
+    priced_category.add_product(Product("Товар 6", "Описание", 1, 1))
+    assert names(priced_category.cheapest(1)) == ["Товар 6"]
+    assert len(priced_category.price_index) == 7
+
+
+def test_price_index_standalone(sample_products):
+    index = PriceIndex(sample_products)
+    assert index.most_expensive(1) == [sample_products[1]]
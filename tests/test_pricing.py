@@ -0,0 +1,80 @@
+import pytest
+
+from src.category import Category
+from src.pricing import AcceptAllPolicy, CallbackPolicy, InteractivePolicy, RejectDecreasePolicy, ThresholdPolicy
+from src.product import Product
+
+
+@pytest.fixture()
+def restore_price_policy():
+    policy = Product.price_policy
+    yield
+    Product.price_policy = policy
+
+
+def test_price_increase(sample_product):
+    sample_product.price = 1500.0
+    assert sample_product.price == 1500.0
+
+
+def test_price_non_positive(sample_product, capsys, print_events):
+    sample_product.price = -10
+    assert sample_product.price == 1000.0
+    assert "Цена не должна быть нулевая или отрицательная" in capsys.readouterr().out
+
+
+def test_price_decrease_rejected_by_default(sample_product, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda *args: pytest.fail("input() не должен вызываться"))
+    sample_product.price = 900.0
+    assert sample_product.price == 1000.0
+
+
+def test_class_price_policy(sample_product, restore_price_policy):
+    Product.price_policy = AcceptAllPolicy()
+    sample_product.price = 900.0
+    assert sample_product.price == 900.0
+
+
+@pytest.mark.parametrize("new_price, expected", [(900.0, True), (899.0, False)])
+def test_threshold_policy(sample_product, new_price, expected):
+    assert sample_product.set_price(new_price, ThresholdPolicy(10)) is expected
+
+
+def test_threshold_policy_range():
+    with pytest.raises(ValueError):
+        ThresholdPolicy(150)
+
+
+def test_callback_policy(sample_product):
+    calls = []
+    policy = CallbackPolicy(lambda product, old, new: calls.append((product, old, new)) or True)
+    assert sample_product.set_price(500.0, policy)
+    assert calls == [(sample_product, 1000.0, 500.0)]
+
+
+def test_interactive_policy(sample_product, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda *args: "y")
+    sample_product.set_price(500.0, InteractivePolicy())
+    assert sample_product.price == 500.0
+
+
+def test_category_reprice(sample_category):
+    report = sample_category.reprice({"Товар 1": 90, "товар 2": 250, "Нет такого": 10}, AcceptAllPolicy())
+    assert report.applied == 2
+    assert report.rejected == 0
+    assert report.missing == ["Нет такого"]
+    assert sample_category.find_product("Товар 1").price == 90
+    assert sample_category.find_product("Товар 2").price == 250
+
+
+def test_category_reprice_rejects_decrease(sample_category):
+    report = sample_category.reprice({"Товар 1": 90, "Товар 2": 250}, RejectDecreasePolicy())
+    assert report.applied == 1
+    assert report.rejected == 1
+    assert sample_category.find_product("Товар 1").price == 100
+
+
+def test_category_reprice_many():
+    category = Category("Тест", "Описание", [Product(f"Товар {i}", "Описание", 100.0, 1) for i in range(1000)])
+    report = category.reprice({f"Товар {i}": 50.0 for i in range(1000)}, AcceptAllPolicy())
+    assert report.applied == 1000
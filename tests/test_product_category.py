@@ -1,7 +1,10 @@
+import copy
+import pickle
+
 import pytest
 
 from src.category import BaseContainer, Category, Order
-from src.product import BaseProduct, Product, ZeroQuantityError
+from src.product import BaseProduct, Product, ZeroQuantityError, default_name_normalizer, set_name_normalizer
 
 
 def test_product_initialization(sample_product):
@@ -300,7 +303,7 @@ def test_base_product_abstract():
         BaseProduct("Test", "Desc", 100, 10)
 
 
-def test_repr_mixin(capsys):
+def test_repr_mixin(capsys, print_events):
     """Тест миксина для вывода информации"""
     product = Product("Test", "Desc", 100, 5)
     captured = capsys.readouterr()
@@ -357,7 +360,7 @@ def test_category_average_price_with_products():
     assert category.get_average_price() == "160.0 руб."
 
 
-def test_category_add_zero_quantity_product(capsys):
+def test_category_add_zero_quantity_product(capsys, print_events):
     """Тест добавления товара с нулевым количеством в категорию"""
     category = Category("Тест", "Описание")
     zero_product = Product("Нулевой товар", "Описание", 100.0, 1)
@@ -389,7 +392,7 @@ def test_order_zero_quantity():
         Order("Заказ", "Описание", product, 0)
 
 
-def test_successful_product_addition(capsys):
+def test_successful_product_addition(capsys, print_events):
     """Тест успешного добавления товара"""
     category = Category("Тест", "Описание")
     product = Product("Товар", "Описание", 100.0, 5)
@@ -400,3 +403,120 @@ def test_successful_product_addition(capsys):
     assert "Товар успешно добавлен" in captured.out
     assert "Обработка добавления товара завершена" in captured.out
     assert len(category.products) == 1
+
+
+def test_add_duplicate_product_ignores_case(sample_category):
+    """Тест слияния дубликата с названием в другом регистре"""
+    sample_category.add_product(Product("  товар 1 ", "Новое описание", 150, 2))
+    assert len(sample_category) == 2
+    assert sample_category.find_product("Товар 1").quantity == 7
+    assert sample_category.find_product("Товар 1").description == "Новое описание"
+
+
+def test_find_product_missing(sample_category):
+    assert sample_category.find_product("Нет такого") is None
+
+
+def test_new_product_with_category(sample_category):
+    """Тест поиска дубликата по индексу категории"""
+    product_data = {"name": "ТОВАР 2", "description": "Описание", "price": 100.0, "quantity": 2}
+    product = Product.new_product(product_data, sample_category)
+    assert product is sample_category.find_product("Товар 2")
+    assert product.quantity == 5
+    assert product.price == 200
+
+
+def test_set_name_normalizer(sample_products):
+    """Тест замены правила нормализации названий"""
+    set_name_normalizer(str)
+    try:
+        product_data = {"name": "товар 1", "description": "Описание", "price": 100.0, "quantity": 2}
+        product = Product.new_product(product_data, sample_products)
+        assert product not in sample_products
+    finally:
+        set_name_normalizer(default_name_normalizer)
+
+
+def test_silent_by_default(capsys):
+    """Тест что без обработчиков ядро ничего не печатает"""
+    category = Category("Тест", "Описание", [Product("Товар", "Описание", 100.0, 5)])
+    Order("Заказ", "Описание", category.find_product("Товар"), 1)
+    assert capsys.readouterr().out == ""
+
+
+def test_category_totals(sample_category):
+    """Тест итогов категории: 100*5 + 200*3"""
+    assert sample_category.total_quantity == 8
+    assert sample_category.total_value == 1100
+    assert sample_category.average_price == 1100 / 8
+
+
+def test_category_totals_follow_changes(sample_category, sample_products):
+    """Тест что итоги обновляются при слиянии, изменении остатка и цены"""
+    sample_category.add_product(Product("Товар 1", "Описание", 150, 2))
+    assert sample_category.total_quantity == 10
+    assert sample_category.total_value == 150 * 7 + 200 * 3
+
+    sample_products[1].quantity = 1
+    sample_products[1].price = 300
+    assert sample_category.total_quantity == 8
+    assert sample_category.total_value == 150 * 7 + 300
+    assert str(sample_category) == "Тестовая категория, количество продуктов: 8 шт."
+    assert sample_category.get_average_price() == f"{round((150 * 7 + 300) / 8, 2)} руб."
+
+
+def test_category_index_follows_rename(sample_category, sample_products):
+    sample_products[0].name = "Переименованный"
+    assert sample_category.find_product("Товар 1") is None
+    assert sample_category.find_product("переименованный") is sample_products[0]
+
+
+def test_products_use_slots(sample_product, sample_smartphone, sample_lawn_grass):
+    """Тест что товары хранятся в слотах, без __dict__"""
+    for product in (sample_product, sample_smartphone, sample_lawn_grass):
+        assert not hasattr(product, "__dict__")
+
+
+@pytest.mark.parametrize("clone", [copy.copy, copy.deepcopy, lambda product: pickle.loads(pickle.dumps(product))])
+def test_products_copy_and_pickle(clone, sample_category, sample_product, sample_smartphone, sample_lawn_grass):
+    sample_category.add_product(sample_smartphone)
+    sample_smartphone.render()
+    for product in (sample_product, sample_smartphone, sample_lawn_grass):
+        cloned = clone(product)
+        assert type(cloned) is type(product)
+        assert str(cloned) == str(product)
+        for field in product.fields:
+            assert getattr(cloned, field) == getattr(product, field)
+        # Копия не наследует наблюдателей: категория не следит за ней
+        assert cloned._watchers is None
+
+    total = sample_category.total_quantity
+    clone(sample_smartphone).quantity += 10
+    assert sample_category.total_quantity == total
+
+
+def test_render_cache_invalidation(sample_smartphone):
+    """Тест что кэш строки сбрасывается при изменении полей, включая поля наследника"""
+    assert sample_smartphone.render() is sample_smartphone.render()
+
+    sample_smartphone.quantity = 7
+    assert "Остаток: 7 шт." in sample_smartphone.render()
+    sample_smartphone.price = 60000.0
+    assert "60000.0 руб." in sample_smartphone.render()
+    sample_smartphone.memory = 256
+    assert "256GB" in sample_smartphone.render()
+    assert sample_smartphone.render() == str(sample_smartphone)
+
+
+def test_products_page(sample_category):
+    sample_category.add_product(Product("Товар 3", "Описание 3", 300, 1))
+    assert sample_category.products_page(1, 1) == [sample_category.products[1]]
+    assert sample_category.products_page(2, 10) == [sample_category.products[2]]
+    assert sample_category.products_page(5, 10) == []
+
+    with pytest.raises(ValueError):
+        sample_category.products_page(-1, 10)
+
+
+def test_iter_products(sample_category):
+    assert list(sample_category.iter_products()) == sample_category.products
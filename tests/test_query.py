@@ -0,0 +1,64 @@
+import pytest
+
+from src.category import Category
+from src.product import LawnGrass, Product, Smartphone
+from src.query import Query
+
+
+@pytest.fixture()
+def shop():
+    return Category(
+        "Магазин",
+        "",
+        [
+            Smartphone("Телефон A", "", 30000.0, 2, 4.5, "A", 128, "Черный"),
+            Smartphone("Телефон B", "", 50000.0, 1, 4.8, "B", 256, "Белый"),
+            LawnGrass("Трава", "", 500.0, 10, "Россия", "7 дней", "Зеленый"),
+            Smartphone("Телефон C", "", 40000.0, 3, 4.7, "C", 512, "Черный"),
+            Product("Чехол", "", 500.0, 7),
+        ],
+    )
+
+
+def names(products):
+    return [product.name for product in products]
+
+
+def test_category_iteration_yields_products(shop):
+    assert names(shop) == ["Телефон A", "Телефон B", "Трава", "Телефон C", "Чехол"]
+    assert all(product._rendered is None for product in shop)
+    assert names(shop.filter(lambda product: product.quantity > 2)) == ["Трава", "Телефон C", "Чехол"]
+
+
+def test_where_conditions(shop):
+    assert names(shop.where(memory__gte=256)) == ["Телефон B", "Телефон C"]
+    assert names(shop.where(color="Черный", price__lt=35000)) == ["Телефон A"]
+    assert names(shop.where(lambda product: isinstance(product, Smartphone), color__in=("Белый",))) == ["Телефон B"]
+    assert names(shop.where(name__contains="Тр")) == ["Трава"]
+    assert shop.where(memory__ne=128).count() == 2
+    with pytest.raises(ValueError, match="Неизвестное условие"):
+        shop.where(memory__between=1)
+
+
+def test_order_by_and_limit(shop):
+    assert names(shop.order_by("price").limit(2)) == ["Трава", "Чехол"]
+    assert names(shop.order_by("-price").limit(2, offset=1)) == ["Телефон C", "Телефон A"]
+    assert names(shop.order_by("price", "-quantity")) == ["Трава", "Чехол", "Телефон A", "Телефон C", "Телефон B"]
+    assert shop.where(memory__gte=256).order_by("-price").first().name == "Телефон B"
+    assert shop.query().where(memory__gte=1024).first() is None
+    assert shop.limit(1).render() == ["Телефон A (A), 30000.0 руб. Память: 128GB, Цвет: Черный Остаток: 2 шт. "]
+    with pytest.raises(ValueError):
+        shop.limit(-1)
+
+
+def test_query_stops_early():
+    seen = []
+
+    def source():
+        for i in range(1_000_000):
+            seen.append(i)
+            yield Smartphone(f"Телефон {i}", "", 100.0, 1, 4.0, "M", 128 if i % 2 else 256, "Черный")
+
+    result = Query(source()).where(memory__gte=256).limit(20).to_list()
+    assert len(result) == 20
+    assert len(seen) == 39
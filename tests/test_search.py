@@ -0,0 +1,87 @@
+import pytest
+
+from src.category import Category
+from src.product import Product, Smartphone
+from src.search import SearchIndex, tokenize
+
+
+@pytest.fixture()
+def catalog(sample_products, sample_smartphones, sample_lawns):
+    return Category("Каталог", "Описание", sample_products + sample_smartphones + sample_lawns)
+
+
+def names(products):
+    return [product.name for product in products]
+
+
+def test_tokenize():
+    assert tokenize("Samsung Galaxy, 256GB!") == {"samsung", "galaxy", "256gb"}
+    assert tokenize(None) == set()
+
+
+def test_search_words(catalog):
+    assert names(catalog.search("смартфон")) == ["Смартфон 1", "Смартфон 2"]
+    assert names(catalog.search("описание 2")) == ["Товар 2", "Смартфон 2", "Трава 2"]
+    assert catalog.search("нет такого") == []
+
+
+def test_search_prefix(catalog):
+    assert names(catalog.search("смарт", prefix=True)) == ["Смартфон 1", "Смартфон 2"]
+    assert catalog.search("смарт") == []
+
+
+def test_search_filters(catalog):
+    assert names(catalog.search(memory=128)) == ["Смартфон 2"]
+    assert names(catalog.search(color="синий")) == ["Смартфон 1"]
+    assert names(catalog.search("трава", country="Германия")) == ["Трава 2"]
+    assert names(catalog.search(germination_period="10 дней")) == ["Трава 1"]
+
+    with pytest.raises(ValueError, match="Нет индекса по атрибуту"):
+        catalog.search(weight=1)
+
+
+def test_search_limit(catalog):
+    assert len(catalog.search(limit=3)) == 3
+
+
+def test_search_limit_keeps_order():
+    # Плотный запрос (почти все товары) идет обходом по порядку, редкий - через nsmallest
+    products = [Product(f"Товар {number}", f"Описание {number % 7}", 100, 1) for number in range(200)]
+    index = SearchIndex(products)
+    for query, options in (("товар", {}), ("описание 3", {}), ("опис", {"prefix": True}), ("", {})):
+        found = index.search(query, **options)
+        for limit in (0, 1, 5, 500):
+            assert index.search(query, limit=limit, **options) == found[:limit]
+    assert index.search("товар", limit=-1) == []
+    assert len(index.search("товар")) == 200
+
+
+def test_search_follows_add_and_merge(catalog):
+    catalog.search("товар")
+
+    catalog.add_product(Smartphone("Смартфон 3", "Флагман", 90000, 1, 5.0, "Model C", 256, "Белый"))
+    assert names(catalog.search("флагман", memory=256)) == ["Смартфон 3"]
+
+    catalog.add_product(Product("Товар 1", "Новинка", 500, 1))
+    assert names(catalog.search("новинка")) == ["Товар 1"]
+    assert "Товар 1" not in names(catalog.search("описание"))
+
+
+def test_search_follows_attribute_change(catalog, sample_smartphones):
+    catalog.search(memory=64)
+    sample_smartphones[0].memory = 512
+    assert catalog.search(memory=64) == []
+    assert names(catalog.search(memory=512)) == ["Смартфон 1"]
+
+
+def test_search_follows_rename(catalog, sample_products):
+    catalog.search("товар")
+    sample_products[0].name = "Переименованный 1"
+    assert names(catalog.search("товар")) == ["Товар 2"]
+    assert names(catalog.search("переим", prefix=True)) == ["Переименованный 1"]
+
+
+def test_search_index_standalone(sample_products):
+    index = SearchIndex(sample_products)
+    assert len(index) == 2
+    assert index.search("1") == [sample_products[0]]
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.category import Category
+from src.product import Product
+from src.service import CatalogService
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_service_add_and_summary(sample_category):
+    async def scenario():
+        async with CatalogService([sample_category]) as service:
+            await service.add_product("Тестовая категория", Product("Товар 3", "Описание", 300.0, 2))
+            return await service.get_category_summary("Тестовая категория")
+
+    summary = run(scenario())
+    assert summary["products"] == 3
+    assert summary["total_quantity"] == 10
+    assert summary["average_price"] == "170.0 руб."
+
+
+def test_service_place_order(sample_category):
+    async def scenario():
+        async with CatalogService([sample_category]) as service:
+            first = await service.place_order("Тестовая категория", "товар 1", 4)
+            second = await service.place_order("Тестовая категория", "Товар 1", 4)
+            return first, second
+
+    first, second = run(scenario())
+    assert first.quantity == 4
+    assert first.total_price == 400
+    assert second is None
+    assert sample_category.find_product("Товар 1").quantity == 1
+
+
+def test_service_errors(sample_category):
+    async def scenario():
+        async with CatalogService([sample_category]) as service:
+            with pytest.raises(KeyError, match="Категория не найдена"):
+                await service.get_category_summary("Нет такой")
+            with pytest.raises(KeyError, match="Товар не найден"):
+                await service.place_order("Тестовая категория", "Нет такого", 1)
+            with pytest.raises(ValueError):
+                await service.add_product("Тестовая категория", "не товар")
+
+    run(scenario())
+
+    with pytest.raises(RuntimeError, match="Сервис не запущен"):
+        run(CatalogService([sample_category]).add_product("Тестовая категория", Product("Т", "О", 1.0, 1)))
+
+
+def test_service_search(sample_category):
+    async def scenario():
+        async with CatalogService([sample_category]) as service:
+            return await service.search("Тестовая категория", "тов", prefix=True, limit=1)
+
+    assert run(scenario()) == ["Товар 1, 100 руб. Остаток: 5 шт."]
+
+
+def test_service_many_concurrent_clients():
+    """Нагрузочный тест: тысячи клиентов в одном цикле событий через локальный клиент"""
+    category = Category("Склад", "Описание", [Product(f"Товар {i}", "Описание", 10.0, 1000) for i in range(10)])
+    clients = 3000
+
+    async def client(service, number):
+        await service.add_product("Склад", Product(f"Товар {number % 10}", "Описание", 10.0, 1))
+        order = await service.place_order("Склад", f"Товар {number % 10}", 2, f"Заказ {number}")
+        summary = await service.get_category_summary("Склад")
+        return order, summary
+
+    async def scenario():
+        async with CatalogService([category], batch_size=128) as service:
+            results = await asyncio.gather(*(client(service, number) for number in range(clients)))
+            return results, service.batches
+
+    results, batches = run(scenario())
+    sold = sum(order.quantity for order, _ in results if order is not None)
+    assert sold == 2 * clients
+    assert category.total_quantity == 10 * 1000 + clients - sold
+    assert batches < 2 * clients
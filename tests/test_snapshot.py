@@ -0,0 +1,149 @@
+import json
+import pickle
+import zlib
+
+import pytest
+
+from src.category import Category
+from src.product import LawnGrass, Product, Smartphone, default_name_normalizer, set_name_normalizer
+from src.snapshot import CHECKSUM, MAGIC, load_snapshot, save_snapshot
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path):
+    return tmp_path / "catalog.snap"
+
+
+def test_snapshot_roundtrip(snapshot_path, sample_products, sample_smartphones, sample_lawns):
+    mixed = Category("Смешанная", "Разные товары", [sample_smartphones[0], sample_lawns[0]] + sample_products)
+    phones = Category("Смартфоны", "Описание", [sample_smartphones[1]])
+    save_snapshot(snapshot_path, [mixed, phones])
+
+    Category.category_count = 0
+    Category.product_count = 0
+    loaded_mixed, loaded_phones = load_snapshot(snapshot_path)
+
+    assert Category.category_count == 2
+    assert Category.product_count == 5
+    assert loaded_mixed.name == "Смешанная"
+    assert loaded_mixed.description == "Разные товары"
+    assert loaded_mixed.products == mixed.products
+    assert loaded_phones.products == phones.products
+    assert str(loaded_mixed) == str(mixed)
+    assert loaded_mixed.get_average_price() == mixed.get_average_price()
+
+    phone = loaded_mixed.find_product("Смартфон 1")
+    assert isinstance(phone, Smartphone)
+    assert (phone.efficiency, phone.model, phone.memory, phone.color) == (4.0, "Model A", 64, "Синий")
+    grass = loaded_mixed.find_product("Трава 1")
+    assert isinstance(grass, LawnGrass)
+    assert (grass.country, grass.germination_period) == ("Россия", "10 дней")
+    assert phone is not sample_smartphones[0]
+
+
+def test_loaded_category_is_live(snapshot_path, sample_category):
+    save_snapshot(snapshot_path, [sample_category])
+    (category,) = load_snapshot(snapshot_path, restore_counters=False)
+
+    category.add_product(Product("Товар 1", "Описание", 150, 5))
+    category.find_product("Товар 2").quantity = 1
+    assert category.total_quantity == 11
+    assert category.find_product("Товар 1").render() == "Товар 1, 150 руб. Остаток: 10 шт."
+    assert category.search("товар", prefix=True)
+
+
+def test_load_snapshot_without_counters(snapshot_path, sample_category):
+    save_snapshot(snapshot_path, [sample_category])
+    Category.product_count = 42
+    load_snapshot(snapshot_path, restore_counters=False)
+    assert Category.product_count == 42
+
+
+def test_load_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError, match="не является снимком"):
+        load_snapshot(path)
+
+
+def test_load_snapshot_does_not_unpickle(tmp_path):
+    class Payload:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('выполнен код из снимка')",))
+
+    path = tmp_path / "evil.snap"
+    path.write_bytes(MAGIC + pickle.dumps(Payload()))
+    with pytest.raises(ValueError, match="поврежден"):
+        load_snapshot(path)
+
+
+def write_payload(path, payload):
+    data = json.dumps(payload).encode()
+    path.write_bytes(MAGIC + CHECKSUM.pack(zlib.crc32(data)) + data)
+
+
+def test_load_snapshot_detects_damage(snapshot_path, sample_category):
+    save_snapshot(snapshot_path, [sample_category])
+    data = bytearray(snapshot_path.read_bytes())
+    data[-20] ^= 0x01
+    snapshot_path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="поврежден"):
+        load_snapshot(snapshot_path)
+
+    snapshot_path.write_bytes(MAGIC + b"\x00")
+    with pytest.raises(ValueError, match="поврежден"):
+        load_snapshot(snapshot_path)
+
+
+def test_load_snapshot_checks_structure(snapshot_path, sample_category):
+    save_snapshot(snapshot_path, [sample_category])
+    payload = json.loads(snapshot_path.read_bytes()[len(MAGIC) + CHECKSUM.size :])
+    # Нагрузка - обычный JSON: ее можно прочитать любой версией Python или другим инструментом
+    assert payload["categories"][0]["keys"] == ["товар 1", "товар 2"]
+
+    broken = []
+    for damage in (
+        lambda data: data["columns"][0]["price"].pop(),
+        lambda data: data["codes"].__setitem__(0, 7),
+        lambda data: data["keys"].pop(),
+        lambda data: data["classes"].__setitem__(0, "Unknown"),
+        lambda data: data.pop("columns"),
+    ):
+        category = json.loads(json.dumps(payload["categories"][0]))
+        damage(category)
+        broken.append(dict(payload, categories=[category]))
+    broken += [[], dict(payload, categories=None), dict(payload, product_count="много")]
+
+    for damaged in broken:
+        write_payload(snapshot_path, damaged)
+        with pytest.raises(ValueError, match="поврежден"):
+            load_snapshot(snapshot_path, restore_counters=False)
+
+
+def test_snapshot_rejects_unsupported_values(snapshot_path):
+    product = Product("Товар", "Описание", 1.0, 1)
+    product.description = object()
+    with pytest.raises(ValueError, match="только строками"):
+        save_snapshot(snapshot_path, [Category("Тест", "Описание", [product])])
+    product.description = b"bytes"
+    with pytest.raises(ValueError, match="только строками"):
+        save_snapshot(snapshot_path, [Category("Тест", "Описание", [product])])
+
+
+def test_snapshot_rejects_unknown_class(snapshot_path):
+    class Custom(Product):
+        __slots__ = ()
+
+    with pytest.raises(ValueError, match="не поддерживается"):
+        save_snapshot(snapshot_path, [Category("Тест", "Описание", [Custom("Товар", "Описание", 1.0, 1)])])
+
+
+def test_snapshot_rebuilds_keys_for_other_normalizer(snapshot_path, sample_category):
+    save_snapshot(snapshot_path, [sample_category])
+    set_name_normalizer(str)
+    try:
+        (category,) = load_snapshot(snapshot_path, restore_counters=False)
+        assert category.find_product("Товар 1") is not None
+        assert category.find_product("товар 1") is None
+    finally:
+        set_name_normalizer(default_name_normalizer)
@@ -0,0 +1,153 @@
+import threading
+
+import pytest
+
+from src.category import Category, Order
+from src.parallel import IngestReport, merge_rows
+from src.product import LawnGrass, Product, Smartphone, default_name_normalizer, set_name_normalizer
+from src.storage import CatalogStore
+
+
+@pytest.fixture()
+def store(tmp_path):
+    with CatalogStore(tmp_path / "catalog.db", cache_size=2) as store:
+        yield store
+
+
+@pytest.fixture()
+def mixed_category():
+    return Category(
+        "Смешанная",
+        "Описание",
+        [
+            Product("Товар", "Описание", 100, 5),
+            Smartphone("Телефон", "Описание", 30000.5, 2, 4.5, "X", 128, "Черный"),
+            LawnGrass("Трава", "Описание", 500.0, 10, "Россия", "7 дней", "Зеленый"),
+        ],
+    )
+
+
+def test_storage_roundtrip(store, mixed_category):
+    assert store.save_category(mixed_category) == 3
+    assert store.category_names() == ["Смешанная"]
+
+    loaded = store.load_category("Смешанная")
+    assert loaded.products == mixed_category.products
+    assert loaded.total_kopecks == mixed_category.total_kopecks
+    assert [type(product) for product in loaded._product_list()] == [Product, Smartphone, LawnGrass]
+    assert loaded.find_product("телефон").memory == 128
+
+    with pytest.raises(KeyError, match="Категория не найдена"):
+        store.load_category("Нет такой")
+
+
+def test_storage_upsert_and_price_query(store, mixed_category):
+    store.save_category(mixed_category)
+    mixed_category.find_product("Товар").quantity = 7
+    store.save_category(mixed_category)
+
+    assert len(store.load_category("Смешанная")) == 3
+    assert store.find_product("Смешанная", " товар ").quantity == 7
+
+    assert [product.name for product in store.products_by_price("Смешанная", 100, 1000)] == ["Товар", "Трава"]
+    assert [product.name for product in store.products_by_price("Смешанная", low=1000)] == ["Телефон"]
+    assert [product.name for product in store.products_by_price("Смешанная", limit=1)] == ["Товар"]
+
+
+def test_storage_read_through_cache(store, mixed_category):
+    store.save_category(mixed_category)
+    first = store.find_product("Смешанная", "Трава")
+    assert store.find_product("Смешанная", "трава") is first
+    assert store.find_product("Смешанная", "Нет такого") is None
+
+    store.find_product("Смешанная", "Товар")
+    store.find_product("Смешанная", "Телефон")
+    assert store.find_product("Смешанная", "Трава") is not first
+
+    store.invalidate()
+    assert store.find_product("Смешанная", "Трава").country == "Россия"
+
+
+def test_storage_orders(store):
+    product = Product("Товар", "Описание", 0.1, 10)
+    orders = [Order(f"Заказ {i}", "", product, 3) for i in range(2)]
+    assert store.save_orders(orders) == 2
+    assert store.orders("товар") == [("Заказ 0", "", "Товар", 3, 30), ("Заказ 1", "", "Товар", 3, 30)]
+
+
+def test_storage_mirror(store, mixed_category):
+    mirror = store.mirror(mixed_category)
+    mixed_category.find_product("Товар").quantity = 1
+    mixed_category.add_product(Product("Новый", "Описание", 10.0, 1))
+    assert mirror.pending == 2
+    assert mirror.flush() == 2
+    mirror.close()
+
+    loaded = store.load_category("Смешанная")
+    assert loaded.find_product("Товар").quantity == 1
+    assert loaded.find_product("Новый") is not None
+    mixed_category.find_product("Товар").quantity = 2
+    assert mirror.pending == 0
+
+
+def test_storage_mirror_bulk_inserts(store, mixed_category):
+    mirror = store.mirror(mixed_category)
+    merge_rows(mixed_category, [("Product", ("Пачка", "Описание", 20.0, 3))], IngestReport())
+    mixed_category.add_product(Product("Поштучно", "Описание", 30.0, 1))
+    assert mirror.pending == 2
+    mirror.flush()
+
+    mixed_category.find_product("Пачка").quantity = 5
+    assert mirror.pending == 1
+    mirror.close()
+
+    loaded = store.load_category("Смешанная")
+    assert loaded.find_product("Пачка").quantity == 5
+    assert loaded.find_product("Поштучно") is not None
+
+
+def test_storage_mirror_rename(store, mixed_category):
+    mirror = store.mirror(mixed_category)
+    assert store.find_product("Смешанная", "Товар") is not None
+
+    mixed_category.find_product("Товар").name = "Переименованный"
+    assert mirror.pending == 2
+    mirror.flush()
+    assert store.find_product("Смешанная", "Товар") is None
+    assert store.find_product("Смешанная", "Переименованный").quantity == 5
+
+    # Имя ушло и вернулось до flush: старая строка удаляется, новая пишется заново
+    mixed_category.find_product("Телефон").name = "Смартфон"
+    mixed_category.find_product("Смартфон").name = "Телефон"
+    mirror.close()
+
+    loaded = store.load_category("Смешанная")
+    assert {product.name for product in loaded._product_list()} == {"Телефон", "Трава", "Переименованный"}
+
+
+def test_storage_mirror_uses_category_keys(store):
+    # Ключ не нормализуется повторно: правило не обязано быть идемпотентным
+    set_name_normalizer(lambda name: name.strip().lower() + "#")
+    try:
+        category = Category("Категория", "Описание", [Product("Товар", "Описание", 100, 5)])
+        mirror = store.mirror(category)
+        category.add_product(Product("Новый", "Описание", 10.0, 1))
+        category.find_product("Товар").quantity = 7
+        assert mirror.pending == 2
+        mirror.close()
+        assert store.find_product("Категория", "Новый").quantity == 1
+        assert store.find_product("Категория", "Товар").quantity == 7
+    finally:
+        set_name_normalizer(default_name_normalizer)
+
+
+def test_storage_pool_threads(store):
+    categories = [Category(f"Категория {i}", "", [Product(f"Товар {i}", "", 10.0, 1)]) for i in range(8)]
+    threads = [threading.Thread(target=store.save_category, args=(category,)) for category in categories]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(store.category_names()) == sorted(category.name for category in categories)
+    assert store.pool._created <= store.pool.size
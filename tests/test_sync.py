@@ -0,0 +1,62 @@
+import json
+
+from src.category import Category
+from src.pricing import AcceptAllPolicy
+from src.sync import sync_feed
+
+
+def feed(*rows):
+    return [
+        {"name": name, "description": "Из фида", "price": price, "quantity": quantity}
+        for name, price, quantity in rows
+    ]
+
+
+def test_sync_reports_changes(sample_category):
+    report = sync_feed(sample_category, feed(("Товар 1", 100, 5), ("Товар 2", 250, 3), ("Товар 3", 50, 4)))
+
+    assert report.unchanged == 1
+    assert report.price_changed == 1
+    assert report.quantity_changed == 0
+    assert report.inserted == 1
+    assert report.changed == 2
+    assert len(sample_category) == 3
+    assert sample_category.find_product("Товар 2").description == "Из фида"
+
+
+def test_sync_sets_absolute_quantity(sample_category):
+    """Повторная полная выгрузка не удваивает остатки"""
+    rows = feed(("Товар 1", 100, 7), ("Товар 2", 200, 3))
+    sync_feed(sample_category, rows)
+    report = sync_feed(sample_category, rows)
+
+    assert report.unchanged == 2
+    assert sample_category.find_product("Товар 1").quantity == 7
+    assert sample_category.total_quantity == 10
+
+
+def test_sync_price_decrease_uses_policy(sample_category):
+    report = sync_feed(sample_category, feed(("Товар 1", 90, 5)))
+    assert report.price_rejected == 1
+    assert sample_category.find_product("Товар 1").price == 100
+
+    report = sync_feed(sample_category, feed(("Товар 1", 90, 5)), policy=AcceptAllPolicy())
+    assert report.price_changed == 1
+    assert sample_category.find_product("Товар 1").price == 90
+    assert sample_category.find_product("Товар 1").description == "Описание 1"
+
+
+def test_sync_from_file(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text("\n".join(json.dumps(row, ensure_ascii=False) for row in feed(("Товар", 10, 1))), encoding="utf-8")
+    category = Category("Тест", "Описание")
+    assert sync_feed(category, path).inserted == 1
+    assert sync_feed(category, str(path)).unchanged == 1
+
+
+def test_sync_skips_new_rows_without_stock(sample_category):
+    report = sync_feed(sample_category, feed(("Товар 3", 50, 0), ("Товар 1", 100, 0)))
+    assert report.skipped == 1
+    assert report.quantity_changed == 1
+    assert sample_category.find_product("Товар 3") is None
+    assert sample_category.find_product("Товар 1").quantity == 0
@@ -0,0 +1,111 @@
+import gc
+import threading
+
+from src.category import Category
+from src.pricing import AcceptAllPolicy
+from src.product import Product, Smartphone
+
+
+def test_snapshot_is_point_in_time():
+    phone = Smartphone("Телефон", "Старое", 100.0, 2, 4.5, "A", 128, "Черный")
+    category = Category("Тест", "Описание", [phone, Product("Чехол", "", 10.0, 5)])
+    view = category.snapshot()
+    version = category.version
+
+    category.add_product(Smartphone("телефон", "Новое", 150.0, 3, 4.5, "A", 128, "Черный"))
+    category.add_product(Product("Новый", "", 1.0, 1))
+    phone.set_price(50.0, AcceptAllPolicy())
+    phone.name = "Переименован"
+
+    assert category.version > version == view.version
+    assert len(view) == 2
+    assert str(view) == "Тест, количество продуктов: 7 шт."
+    assert view.get_average_price() == "35.71 руб."
+    assert view.products == [
+        "Телефон (A), 100.0 руб. Память: 128GB, Цвет: Черный Остаток: 2 шт. ",
+        "Чехол, 10.0 руб. Остаток: 5 шт.",
+    ]
+    old_phone = view.find_product("телефон")
+    assert old_phone is not phone
+    assert (old_phone.description, old_phone.memory) == ("Старое", 128)
+    case = view.find_product("Чехол")
+    assert case is not category.find_product("Чехол")
+    assert case.render() == category.find_product("Чехол").render()
+    assert view.query().where(price__gte=50).first() is old_phone
+
+    assert str(category) == "Тест, количество продуктов: 11 шт."
+
+
+def test_snapshot_views_are_released():
+    product = Product("Товар", "", 10.0, 1)
+    category = Category("Тест", "", [product])
+    view = category.snapshot()
+    del view
+    gc.collect()
+    product.quantity = 5
+    assert category.snapshot().total_quantity == 5
+
+
+def test_snapshot_consistent_during_import():
+    category = Category("Импорт", "", [Product(f"Товар {i}", "", 100.0, 1) for i in range(50)])
+    stop = threading.Event()
+
+    def writer():
+        price = 100.0
+        while not stop.is_set():
+            price += 1
+            for i in range(50):
+                category.add_product(Product(f"Товар {i}", "", price, 1))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(200):
+            view = category.snapshot()
+            products = list(view)
+            assert sum(product.quantity for product in products) == view.total_quantity
+            assert sum(round(product.price * 100) * product.quantity for product in products) == view.total_kopecks
+    finally:
+        stop.set()
+        thread.join()
+
+
+class SnapshotOnQuantity:
+    """Наблюдатель, снимающий срез категории прямо из уведомления об остатке"""
+
+    def __init__(self, category):
+        self.category = category
+        self.views = []
+
+    def _product_changed(self, product, field, old_value, new_value):
+        if field == "quantity":
+            self.views.append(self.category.snapshot())
+
+
+def test_snapshot_never_splits_merge():
+    product = Product("A", "Старое", 100, 10)
+    category = Category("Тест", "Описание", [product])
+    # Наблюдатель после категории: категория уже применила слияние целиком
+    after = SnapshotOnQuantity(category)
+    product._watch(after)
+
+    category.add_product(Product("a", "Новое", 200, 5))
+
+    view = after.views[0]
+    assert view.products == ["A, 200 руб. Остаток: 15 шт."]
+    assert view.get_average_price() == "200.0 руб."
+    assert view.total_kopecks == category.total_kopecks
+
+    # Наблюдатель до категории: срез снят до слияния и остается прежним
+    product = Product("B", "Старое", 100, 10)
+    before = SnapshotOnQuantity(None)
+    product._watch(before)
+    category = before.category = Category("Тест", "Описание", [product])
+
+    category.add_product(Product("b", "Новое", 200, 5))
+
+    view = before.views[0]
+    assert view.products == ["B, 100 руб. Остаток: 10 шт."]
+    assert view.get_average_price() == "100.0 руб."
+    assert [item.description for item in view] == ["Старое"]
+    assert category.products == ["B, 200 руб. Остаток: 15 шт."]